@@ -1,5 +1,26 @@
 import os
 import sys
 
+import pytest
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    """Create the athlete search index, which --nomigrations skips."""
+    from event.search import ensure_index
+
+    with django_db_blocker.unblock():
+        ensure_index()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Start every test with an empty cache (ids are reused across tests)."""
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
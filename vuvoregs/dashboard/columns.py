@@ -0,0 +1,40 @@
+"""Dynamic option columns of the registration list.
+
+An athlete's ``selected_options`` is keyed by the names of its package's
+options, so an event's columns are the option names of its packages. They
+are read from the (small) option table and cached per event until a
+package or an option of the event changes (see ``dashboard.signals``).
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from event.models import PackageOption
+
+# Seconds the columns are kept; changes invalidate them sooner.
+OPTION_KEYS_TIMEOUT = 24 * 3600
+
+
+def option_keys_cache_key(event_id):
+    """Return the cache key holding an event's option columns."""
+    return f'dashboard:option_keys:{event_id}'
+
+
+def event_option_keys(event_id):
+    """Return the sorted option names of an event's packages."""
+    key = option_keys_cache_key(event_id)
+    keys = cache.get(key)
+    if keys is None:
+        keys = sorted(set(
+            PackageOption.objects.filter(package__event_id=event_id)
+            .values_list('name', flat=True)
+        ))
+        cache.set(key, keys, OPTION_KEYS_TIMEOUT)
+    return keys
+
+
+def invalidate_option_keys(event_id):
+    """Forget an event's columns now and again after commit."""
+    key = option_keys_cache_key(event_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,105 @@
+"""Keyset (cursor) pagination for the dashboard lists.
+
+OFFSET pagination reads and throws away every row before the page, and
+needs a COUNT of the whole result for its page links. A keyset page starts
+right after (or before) the last row seen, so every page costs the same:
+the links carry an opaque cursor holding the sort key of that row.
+"""
+
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
+import operator
+
+from django.db.models import Q
+
+
+def encode_cursor(created_at, pk):
+    """Return the cursor of a row sorted by (creation time, id)."""
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (creation time, id) of a cursor, or None if it is invalid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split('|')
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows, with the cursors of its neighbours."""
+
+    object_list: list = field(default_factory=list)
+    next_cursor: str | None = None
+    previous_cursor: str | None = None
+
+    def __iter__(self):
+        """Iterate over the rows of the page."""
+        return iter(self.object_list)
+
+    def __len__(self):
+        """Return the number of rows on the page."""
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        """Return True if older rows follow."""
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        """Return True if newer rows come before."""
+        return self.previous_cursor is not None
+
+
+def keyset_page(queryset, per_page, after=None, before=None,
+                created_field='registration__created_at'):
+    """Return the page after (or before) a cursor, newest rows first.
+
+    Rows are sorted by ``created_field`` then id, both descending. An
+    invalid cursor gives the first page.
+    """
+    created = operator.attrgetter(created_field.replace('__', '.'))
+    descending = queryset.order_by(f'-{created_field}', '-pk')
+
+    def cursor(row):
+        return encode_cursor(created(row), row.pk)
+
+    key = decode_cursor(before) if before else None
+    if key:
+        # Rows newer than the cursor, nearest first, then put back in order
+        created_at, pk = key
+        rows = list(
+            queryset.filter(
+                Q(**{f'{created_field}__gt': created_at})
+                | Q(**{created_field: created_at, 'pk__gt': pk})
+            ).order_by(created_field, 'pk')[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        return KeysetPage(
+            rows,
+            next_cursor=cursor(rows[-1]) if rows else None,
+            previous_cursor=cursor(rows[0]) if has_previous else None,
+        )
+
+    key = decode_cursor(after) if after else None
+    if key:
+        created_at, pk = key
+        descending = descending.filter(
+            Q(**{f'{created_field}__lt': created_at})
+            | Q(**{created_field: created_at, 'pk__lt': pk})
+        )
+    rows = list(descending[:per_page + 1])
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    return KeysetPage(
+        rows,
+        next_cursor=cursor(rows[-1]) if has_next else None,
+        previous_cursor=cursor(rows[0]) if key and rows else None,
+    )
@@ -0,0 +1,26 @@
+"""Signal handlers for the dashboard application."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from event.models import PackageOption, RacePackage
+
+from .columns import invalidate_option_keys
+
+
+@receiver(post_save, sender=RacePackage)
+@receiver(post_delete, sender=RacePackage)
+def package_changed(sender, instance, **kwargs):
+    """Invalidate the option columns of the package's event."""
+    invalidate_option_keys(instance.event_id)
+
+
+@receiver(post_save, sender=PackageOption)
+@receiver(post_delete, sender=PackageOption)
+def package_option_changed(sender, instance, **kwargs):
+    """Invalidate the option columns of the option's event."""
+    event_ids = RacePackage.objects.filter(pk=instance.package_id).values_list(
+        'event_id', flat=True
+    )
+    for event_id in event_ids:
+        invalidate_option_keys(event_id)
@@ -9,4 +9,5 @@ urlpatterns = [
     path('registrations/', views.registration_list, name='registrations'),
     path('event/<int:event_id>/', views.event_dashboard, name='event_dashboard'),
     path('event/<int:event_id>/chart-data/', views.event_chart_data, name='event_chart_data'),
+    path('perf/', views.perf_dashboard, name='perf'),
 ]
@@ -1,14 +1,20 @@
 import json
+from urllib.parse import urlencode
 
 from django.contrib.admin.views.decorators import staff_member_required
-from django.core.paginator import Paginator
-from django.db.models import Count, Q
-from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
-from django.utils.timezone import now, timedelta
+from django.utils.timezone import localdate, timedelta
 
-from event.models import Athlete, Event, Registration
+from event.models import Athlete, DailyRegistrationStats, Event
+from event.perf import sample_rate, view_stats
+from event.rollups import chart_series
+from event.search import search_athletes
+
+from .columns import event_option_keys
+from .pagination import KeysetPage, keyset_page
 
 
 @staff_member_required
@@ -18,21 +24,43 @@ def dashboard_home(request):
     else:
         events = Event.objects.filter(organizer=request.user)
 
-    registrations = Registration.objects.filter(event__in=events)
-    today = now().date()
+    today = localdate()
     seven_days_ago = today - timedelta(days=7)
 
-    # Summary stats
-    context = {
-        'total_regs': registrations.count(),
-        'today_regs': registrations.filter(created_at__date=today).count(),
-        'last_7_days_regs': registrations.filter(created_at__date__gte=seven_days_ago).count(),
-        'upcoming_events': events.filter(date__gte=today).order_by('date')
-    }
+    # Summary stats, from the daily rollups
+    context = DailyRegistrationStats.objects.filter(event__in=events).aggregate(
+        total_regs=Coalesce(Sum('registrations'), 0),
+        today_regs=Coalesce(Sum('registrations', filter=Q(day=today)), 0),
+        last_7_days_regs=Coalesce(
+            Sum('registrations', filter=Q(day__gte=seven_days_ago)), 0
+        ),
+    )
+    context['upcoming_events'] = (
+        events.filter(date__gte=today)
+        .annotate(registration_count=Coalesce(Sum('daily_stats__registrations'), 0))
+        .order_by('date')
+    )
 
     return render(request, 'dashboard/home.html', context)
 
 
+def _daily_stats(event):
+    """Return the event's rollup rows as (day, race_id, regs, paid regs, athletes)."""
+    return list(
+        event.daily_stats.values_list(
+            'day', 'race_id', 'registrations', 'paid_registrations', 'athletes'
+        )
+    )
+
+
+def _athletes_per_day(rows, race_id):
+    return [
+        (day, athletes)
+        for day, row_race_id, _regs, _paid, athletes in rows
+        if not race_id or str(row_race_id) == race_id
+    ]
+
+
 @staff_member_required
 def event_dashboard(request, event_id):
     if request.user.is_staff:
@@ -44,42 +72,16 @@ def event_dashboard(request, event_id):
     interval = request.GET.get('interval', 'daily')  # daily, weekly, monthly
     cumulative = request.GET.get('cumulative') == 'on'
 
-    # Choose aggregation function
-    if interval == 'weekly':
-        trunc_fn = TruncWeek
-    elif interval == 'monthly':
-        trunc_fn = TruncMonth
-    else:
-        trunc_fn = TruncDate
-
-    athlete_qs = Athlete.objects.filter(registration__event=event)
-
-    if race_id:
-        athlete_qs = athlete_qs.filter(race__id=race_id)
+    rows = _daily_stats(event)
+    athletes = _athletes_per_day(rows, race_id)
 
-    registrations = event.registrations.all()
-    total_regs = registrations.count()
-    paid_regs = registrations.filter(payment_status='paid').count()
+    total_regs = sum(row[2] for row in rows)
+    paid_regs = sum(row[3] for row in rows)
     unpaid_regs = total_regs - paid_regs
-    total_athletes = athlete_qs.count()
+    total_athletes = sum(count for _day, count in athletes)
 
     # Chart data
-    chart_qs = (
-        athlete_qs
-        .annotate(date_group=trunc_fn('registration__created_at'))
-        .values('date_group')
-        .annotate(count=Count('id'))
-        .order_by('date_group')
-    )
-
-    labels = []
-    counts = []
-    running_total = 0
-    for entry in chart_qs:
-        date_label = entry['date_group'].strftime('%Y-%m-%d')
-        labels.append(date_label)
-        running_total += entry['count']
-        counts.append(running_total if cumulative else entry['count'])
+    labels, counts = chart_series(athletes, interval, cumulative)
 
     context = {
         'event': event,
@@ -98,6 +100,10 @@ def event_dashboard(request, event_id):
     return render(request, 'dashboard/event_dashboard.html', context)
 
 
+PER_PAGE_CHOICES = [10, 25, 50, 100]
+MAX_PER_PAGE = 100
+
+
 @staff_member_required
 def registration_list(request):
     # Get events for admin or specific organizer
@@ -108,37 +114,32 @@ def registration_list(request):
 
     # Query params
     selected_event_id = request.GET.get('event')
-    per_page = int(request.GET.get('per_page', 25))
-    page_number = request.GET.get('page', 1)
+    per_page = request.GET.get('per_page', '25')
+    per_page = min(int(per_page), MAX_PER_PAGE) if per_page.isdigit() else 25
+    per_page = max(per_page, 1)
     search_query = request.GET.get('search', '').strip()
     race_id = request.GET.get('race')
     package_id = request.GET.get('package')
 
     # Init data
-    registrations = Registration.objects.none()
-    athletes = Athlete.objects.none()
+    athletes = KeysetPage()
     option_keys = []
-    paginator = None
     selected_event = None
     races = []
     packages = []
+    total_regs = total_athletes = 0
 
     if selected_event_id:
         try:
             selected_event = events.get(id=selected_event_id)
-            registrations = selected_event.registrations.select_related().all()
 
             athletes_qs = Athlete.objects.filter(
                 registration__event=selected_event
             ).select_related('registration', 'race', 'package')
 
-            # Apply search
+            # Apply search (word prefixes of the normalized names and email)
             if search_query:
-                athletes_qs = athletes_qs.filter(
-                    Q(first_name__icontains=search_query) |
-                    Q(last_name__icontains=search_query) |
-                    Q(email__icontains=search_query)
-                )
+                athletes_qs = search_athletes(athletes_qs, search_query)
 
             # Apply race/package filters
             if race_id:
@@ -147,16 +148,27 @@ def registration_list(request):
             if package_id:
                 athletes_qs = athletes_qs.filter(package__id=package_id)
 
-            # Extract option keys for dynamic columns
-            option_key_set = set()
-            for athlete in athletes_qs:
-                if isinstance(athlete.selected_options, dict):
-                    option_key_set.update(athlete.selected_options.keys())
-            option_keys = sorted(option_key_set)
-
-            # Paginate
-            paginator = Paginator(athletes_qs, per_page)
-            athletes = paginator.get_page(page_number)
+            # Option columns come from the event's packages, not the rows
+            option_keys = event_option_keys(selected_event.id)
+
+            # Paginate by cursor: no OFFSET, no COUNT of the filtered rows
+            athletes = keyset_page(
+                athletes_qs,
+                per_page,
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+
+            # Totals from the daily rollups (per race). Searches and package
+            # filters are not rolled up, so their athletes are counted.
+            rows = _daily_stats(selected_event)
+            total_regs = sum(row[2] for row in rows)
+            if search_query or package_id:
+                total_athletes = athletes_qs.count()
+            else:
+                total_athletes = sum(
+                    count for _day, count in _athletes_per_day(rows, race_id)
+                )
 
             # Get races & packages for filter dropdowns
             races = selected_event.races.all()
@@ -165,15 +177,24 @@ def registration_list(request):
         except Event.DoesNotExist:
             selected_event = None
 
+    filters = {
+        'event': selected_event_id or '',
+        'race': race_id or '',
+        'package': package_id or '',
+        'per_page': per_page,
+        'search': search_query,
+    }
+
     context = {
         'events': events,
         'selected_event_id': selected_event_id,
         'selected_event': selected_event,
-        'registrations': registrations,
         'athletes': athletes,
-        'paginator': paginator,
+        'total_regs': total_regs,
+        'total_athletes': total_athletes,
+        'filter_query': urlencode(filters),
         'per_page': per_page,
-        'per_page_choices': [10, 25, 50, 100],
+        'per_page_choices': PER_PAGE_CHOICES,
         'search_query': search_query,
         'option_keys': option_keys,
         'race_id': race_id,
@@ -191,30 +212,20 @@ def event_chart_data(request, event_id):
     interval = request.GET.get('interval', 'daily')
     cumulative = request.GET.get('cumulative') == 'true'
 
-    # Aggregation function
-    trunc_fn = TruncDate if interval == 'daily' else TruncWeek if interval == 'weekly' else TruncMonth
-
-    athletes = Athlete.objects.filter(registration__event=event)
-    if race_id:
-        athletes = athletes.filter(race__id=race_id)
-
-    chart_qs = (
-        athletes
-        .annotate(date_group=trunc_fn('registration__created_at'))
-        .values('date_group')
-        .annotate(count=Count('id'))
-        .order_by('date_group')
-    )
-
-    labels = []
-    counts = []
-    total = 0
-    for entry in chart_qs:
-        labels.append(entry['date_group'].strftime('%Y-%m-%d'))
-        total += entry['count']
-        counts.append(total if cumulative else entry['count'])
+    athletes = _athletes_per_day(_daily_stats(event), race_id)
+    labels, counts = chart_series(athletes, interval, cumulative)
 
     return JsonResponse({
         'labels': labels,
         'counts': counts
-    })
\ No newline at end of file
+    })
+
+
+@staff_member_required
+def perf_dashboard(request):
+    # Recent samples of PerfMiddleware, slowest views (p95) first
+    context = {
+        'stats': view_stats(),
+        'sample_rate': sample_rate(),
+    }
+    return render(request, 'dashboard/perf.html', context)
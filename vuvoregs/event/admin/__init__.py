@@ -1,4 +1,5 @@
 from .athlete_admin import *
+from .capacity_admin import *
 from .event_admin import *
 from .package_admin import *
 from .payment_admin import *
@@ -1,26 +1,35 @@
 """This module contains admin views for handling athlete data.
 
-It includes functionalities for importing bib numbers and exporting athlete data
-for specific events in CSV format.
+It includes functionalities for importing bib numbers and team
+registrations (see ``event.imports``) and exporting athlete data for
+specific events in CSV or XLSX format (see ``event.exports``). The views
+are served outside the admin site, so each one requires a staff user.
 """
 
-import csv
-from io import TextIOWrapper
-
 from django.contrib import messages
-from django.http import HttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import redirect, render
 
+from event.exports import export_athletes, option_names
 from event.forms import (
     BibNumberImportForm,
     ExportEventAthletesForm,
+    TeamExcelUploadForm,
 )
+from event.imports import import_bibs, import_team
 from event.models import Athlete
 
+# Rejected import rows listed one by one; the rest are only counted.
+MAX_REPORTED_ERRORS = 20
+
 
+@staff_member_required
 def import_bibs_view(request):
     """Handle the import of bib numbers for athletes.
 
+    A preview (dry run) renders the changes and rejected rows of the file;
+    an import saves the valid rows and reports the rejected ones.
+
     Parameters
     ----------
     request : HttpRequest
@@ -29,38 +38,35 @@ def import_bibs_view(request):
     Returns,
     -------
     HttpResponse
-        A rendered HTML form or a redirect to the admin index after processing.
+        A rendered HTML form (with the preview) or a redirect to the admin
+        index after processing.
     """
     form = BibNumberImportForm()
-    success, failed = 0, 0
+    result = None
     if request.method == "POST":
         form = BibNumberImportForm(request.POST, request.FILES)
         if form.is_valid():
-            file = form.cleaned_data["csv_file"]
-            reader = csv.DictReader(
-                TextIOWrapper(file, encoding="utf-8"), delimiter=";"
+            result = import_bibs(
+                form.cleaned_data["csv_file"], dry_run=form.cleaned_data["dry_run"]
             )
-            for row in reader:
-                athlete_id = row.get("id")
-                bib = row.get("bib_number")
-                try:
-                    athlete = Athlete.objects.get(id=athlete_id)
-                    athlete.bib_number = bib
-                    athlete.save()
-                    success += 1
-                except Athlete.DoesNotExist:
-                    failed += 1
-            messages.success(request, f"{success} bib numbers updated.")
-            if failed:
-                messages.warning(
-                    request, f"{failed} rows failed (no matching Athlete ID)."
-                )
-            return redirect("admin:index")
+            if not result.dry_run:
+                messages.success(request, f"{len(result.changes)} bib numbers updated.")
+                for error in result.errors[:MAX_REPORTED_ERRORS]:
+                    messages.warning(request, f"Line {error.line}: {error.message}")
+                if len(result.errors) > MAX_REPORTED_ERRORS:
+                    messages.warning(
+                        request,
+                        f"{len(result.errors)} rows failed in total.",
+                    )
+                return redirect("admin:index")
     return render(
-        request, "admin/import_bibs.html", {"form": form, "title": "Import Bib Numbers"}
+        request,
+        "admin/import_bibs.html",
+        {"form": form, "result": result, "title": "Import Bib Numbers"},
     )
 
 
+@staff_member_required
 def export_athletes_view(request):
     """Handle the export of athletes for a specific event.
 
@@ -72,46 +78,68 @@ def export_athletes_view(request):
     Returns,
     -------
     HttpResponse
-        A CSV file response containing athlete data or a rendered HTML form.
+        A streamed CSV or XLSX file of the athletes, or a rendered HTML form.
     """
     form = ExportEventAthletesForm()
     if request.method == "POST":
         form = ExportEventAthletesForm(request.POST)
         if form.is_valid():
             event = form.cleaned_data["event"]
-            athletes = Athlete.objects.filter(race__event=event).select_related(
-                "package", "race"
+            athletes = Athlete.objects.filter(race__event=event)
+            options = (
+                option_names(athletes) if form.cleaned_data["include_options"] else ()
             )
-            response = HttpResponse(content_type="text/csv; charset=utf-8")
-            response["Content-Disposition"] = (
-                f"attachment; filename=athletes_{event.name or event.id}.csv"
+            return export_athletes(
+                athletes,
+                filename=f"athletes_{event.name or event.id}",
+                fmt=form.cleaned_data["format"],
+                columns=form.cleaned_data["columns"],
+                options=options,
             )
-            response.write("\ufeff")  # UTF-8 BOM for Excel
-            writer = csv.writer(response, delimiter=";")
-            writer.writerow([
-                "id",
-                "first_name",
-                "last_name",
-                "dob",
-                "package",
-                "race",
-                "pickup_point",
-                "bib_number",
-            ])
-            for athlete in athletes:
-                writer.writerow([
-                    athlete.id,
-                    athlete.first_name,
-                    athlete.last_name,
-                    athlete.dob,
-                    athlete.package.name if athlete.package else "",
-                    athlete.race.name if athlete.race else "",
-                    athlete.pickup_point.name if athlete.pickup_point else "",
-                    athlete.bib_number or "",
-                ])
-            return response
     return render(
         request,
         "admin/export_athletes.html",
         {"form": form, "title": "Export Event Athletes"},
     )
+
+
+@staff_member_required
+def team_import_view(request):
+    """Handle the import of a team registration from an Excel sheet.
+
+    Parameters
+    ----------
+    request : HttpRequest
+        The HTTP request object containing form data and uploaded files.
+
+    Returns,
+    -------
+    HttpResponse
+        The form with the rejected rows, or a redirect to the new
+        registration in the admin.
+    """
+    form = TeamExcelUploadForm()
+    error_log = []
+    if request.method == "POST":
+        form = TeamExcelUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            result = import_team(
+                form.cleaned_data["excel_file"], form.cleaned_data["event"]
+            )
+            if result.registration:
+                messages.success(
+                    request, f"{len(result.athletes)} athletes registered."
+                )
+                return redirect(
+                    "admin:event_registration_change", result.registration.pk
+                )
+            error_log = [str(error) for error in result.errors]
+    return render(
+        request,
+        "admin/team_excel_upload.html",
+        {
+            "form": form,
+            "error_log": error_log,
+            "title": "Import Team Registration",
+        },
+    )
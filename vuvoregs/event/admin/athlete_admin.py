@@ -3,19 +3,22 @@
 This module provides:
 - AthleteAdminForm: A custom form for Athlete model.
 - AthleteTranslationOptions: Translation options for Athlete fields.
-- export_athletes_to_csv: A utility function to export Athlete data to CSV.
-- AthleteAdmin: Admin interface for Athlete model.
+- export_athletes_to_csv / export_athletes_to_xlsx: Admin actions streaming
+  the selected athletes as CSV or XLSX.
+- AthleteAdmin: Admin interface for Athlete model, listing athletes with
+  their race, package, pickup point and special price joined in.
 """
 
-import csv
-
 from django import forms
 from django.contrib import admin
-from django.http import HttpResponse
 from django_json_widget.widgets import JSONEditorWidget
 from modeltranslation.translator import TranslationOptions, register
 
+from event.exports import export_athletes, option_names
 from event.models.athlete import Athlete
+from event.search import search_athletes
+
+from .related import RelatedChoicesFilter, RelatedChoicesMixin
 
 
 class AthleteAdminForm(forms.ModelForm):
@@ -50,6 +53,19 @@ class AthleteTranslationOptions(TranslationOptions):
     fields = ("hometown",)
 
 
+ADMIN_EXPORT_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "package",
+    "race",
+    "pickup_point",
+    "bib_number",
+)
+
+
 def export_athletes_to_csv(modeladmin, request, queryset):
     """Export selected Athlete records to a CSV file.
 
@@ -64,40 +80,43 @@ def export_athletes_to_csv(modeladmin, request, queryset):
 
     Returns,
     -------
-    HttpResponse
-        A response containing the CSV file for download.
+    StreamingHttpResponse
+        A response streaming the CSV file for download.
     """
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = "attachment; filename=athletes_export.csv"
-    writer = csv.writer(response, delimiter=";")
-    writer.writerow([
-        "id",
-        "first_name",
-        "last_name",
-        "email",
-        "phone",
-        "package",
-        "race",
-        "pickup_point",
-        "bib_number",
-    ])
-    for athlete in queryset:
-        writer.writerow([
-            athlete.id,
-            athlete.first_name,
-            athlete.last_name,
-            athlete.email,
-            athlete.phone,
-            athlete.package.name if athlete.package else "",
-            athlete.race.name if athlete.race else "",
-            athlete.pickup_point.name if athlete.pickup_point else "",
-            athlete.bib_number or "",
-        ])
-    return response
+    return export_athletes(
+        queryset, filename="athletes_export", columns=ADMIN_EXPORT_COLUMNS
+    )
+
+
+@admin.action(description="Export selected athletes to Excel")
+def export_athletes_to_xlsx(modeladmin, request, queryset):
+    """Export selected Athlete records, with their package options, to XLSX.
+
+    Parameters
+    ----------
+    modeladmin : ModelAdmin
+        The admin interface for the Athlete model.
+    request : HttpRequest
+        The HTTP request object.
+    queryset : QuerySet
+        The queryset of selected Athlete objects.
+
+    Returns,
+    -------
+    FileResponse
+        A response streaming the XLSX file for download.
+    """
+    return export_athletes(
+        queryset,
+        filename="athletes_export",
+        fmt="xlsx",
+        columns=ADMIN_EXPORT_COLUMNS,
+        options=option_names(queryset),
+    )
 
 
 @admin.register(Athlete)
-class AthleteAdmin(admin.ModelAdmin):
+class AthleteAdmin(RelatedChoicesMixin, admin.ModelAdmin):
     """Admin interface for managing Athlete entities.
 
     This class customizes the admin interface for the Athlete model,
@@ -119,10 +138,30 @@ class AthleteAdmin(admin.ModelAdmin):
         "special_price",
         "formatted_selected_options",
     )
-    list_filter = ("race__event", "race", "package", "pickup_point")
-    search_fields = ("first_name", "last_name", "race__name", "email")
+    list_select_related = (
+        "registration",
+        "race__event",
+        "race__race_type",
+        "package__event",
+        "pickup_point__event",
+        "special_price__race",
+    )
+    list_filter = (
+        "race__event",
+        ("race", RelatedChoicesFilter),
+        ("package", RelatedChoicesFilter),
+        ("pickup_point", RelatedChoicesFilter),
+    )
+    # Filtered pages count the filtered rows only
+    show_full_result_count = False
+    raw_id_fields = ("registration",)
+    # Searched through the search index, see get_search_results()
+    search_fields = ("search_text",)
+    search_help_text = (
+        "Start of a name or email, in Greek or Latin letters, or part of a race name."
+    )
     readonly_fields = ["formatted_selected_options"]
-    actions = [export_athletes_to_csv]
+    actions = [export_athletes_to_csv, export_athletes_to_xlsx]
     fields = (
         "first_name",
         "last_name",
@@ -161,3 +200,10 @@ class AthleteAdmin(admin.ModelAdmin):
             return "⚠️ Invalid JSON"
 
     formatted_selected_options.short_description = "Package Options"
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search the athlete search index instead of icontains on each field.
+
+        Race names are not in the search document and are matched as typed.
+        """
+        return search_athletes(queryset, search_term, fields=("race__name",)), False
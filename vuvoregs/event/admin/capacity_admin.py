@@ -0,0 +1,44 @@
+"""Admin module for inspecting seat capacity in the event application.
+
+Counters and reservations are maintained by ``event.capacity``; the admin
+only lists them, so they cannot drift from the rows they summarize.
+"""
+
+from django.contrib import admin
+
+from event.models.capacity import CapacityCounter, SeatReservation
+
+
+@admin.register(CapacityCounter)
+class CapacityCounterAdmin(admin.ModelAdmin):
+    """Read-only listing of the event and race seat counters."""
+
+    list_display = ("event", "race", "reserved")
+    list_filter = ("event",)
+    list_select_related = ("event", "race__event", "race__race_type")
+    readonly_fields = ("event", "race", "reserved")
+
+    def has_add_permission(self, request):
+        """Counters are created on first reservation only."""
+        return False
+
+
+@admin.register(SeatReservation)
+class SeatReservationAdmin(admin.ModelAdmin):
+    """Read-only listing of seat holds per registration."""
+
+    list_display = ("registration", "race", "seats", "status", "expires_at")
+    list_filter = ("status", "race__event")
+    list_select_related = ("registration", "race__event", "race__race_type")
+    readonly_fields = (
+        "registration",
+        "race",
+        "seats",
+        "status",
+        "expires_at",
+        "created_at",
+    )
+
+    def has_add_permission(self, request):
+        """Reservations are created by the registration flow only."""
+        return False
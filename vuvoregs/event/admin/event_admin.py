@@ -47,4 +47,5 @@ class PickUpPointAdmin(admin.ModelAdmin):
 
     list_display = ("name", "event", "address", "working_hours")
     list_filter = ("event",)
+    list_select_related = ("event",)
     search_fields = ("name", "address", "event__name")
@@ -11,6 +11,8 @@ from modeltranslation.translator import TranslationOptions, register
 
 from event.models.package import PackageOption, RacePackage
 
+from .related import RelatedChoicesFilter
+
 
 class RacePackageOptionInline(admin.TabularInline):
     """Inline admin configuration for managing PackageOption models."""
@@ -41,7 +43,8 @@ class RacePackageAdmin(TranslationAdmin):
         "visible_until",
         "is_visible_now",
     )
-    list_filter = ("event", "race")
+    list_filter = ("event", ("race", RelatedChoicesFilter))
+    list_select_related = ("event", "race__event", "race__race_type")
     search_fields = ("name", "race__name", "race__event__name")
     ordering = ("event", "name")
     inlines = [RacePackageOptionInline]
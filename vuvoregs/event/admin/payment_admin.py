@@ -3,6 +3,7 @@
 This module provides:
 - Admin actions to simulate payment success, failure, and webhook events.
 - PaymentAdmin class for customizing the Django admin interface for Payment objects.
+- A read-only log of received webhook notifications.
 """
 
 import json
@@ -14,6 +15,8 @@ from django.test import RequestFactory
 from django.urls import reverse
 
 from event.models.payment import Payment
+from event.models.webhook import WebhookEvent
+from event.payments.transitions import FAILED, PAID, apply_transition
 from event.views import payment_webhook
 
 
@@ -30,19 +33,13 @@ def simulate_success(modeladmin, request, queryset):
     queryset : QuerySet
         The selected Payment objects to update.
     """
-    for payment in queryset:
-        payment.status = "confirmed"
-        payment.save()
-        if hasattr(payment, "registration"):
-            registration = payment.registration
-            registration.status = "completed"
-            registration.payment_status = "paid"
-            registration.save()
+    for payment_id in queryset.values_list("pk", flat=True):
+        apply_transition(PAID, payment_id=payment_id)
 
 
 @admin.action(description="Set payment status to 'failed'")
 def simulate_failure(modeladmin, request, queryset):
-    """Set the status of selected payments to 'rejected' and update  registrations.
+    """Set the status of selected payments to 'error' and update registrations.
 
     Parameters
     ----------
@@ -53,14 +50,8 @@ def simulate_failure(modeladmin, request, queryset):
     queryset : QuerySet
         The selected Payment objects to update.
     """
-    for payment in queryset:
-        payment.status = "rejected"
-        payment.save()
-        if hasattr(payment, "registration"):
-            registration = payment.registration
-            registration.status = "failed"
-            registration.payment_status = "failed"
-            registration.save()
+    for payment_id in queryset.values_list("pk", flat=True):
+        apply_transition(FAILED, payment_id=payment_id)
 
 
 @admin.action(description="🚀 Simulate Webhook for selected payments")
@@ -82,7 +73,13 @@ def simulate_webhook(modeladmin, request, queryset):
 
     factory = RequestFactory()
     for payment in queryset:
-        data = json.dumps({"payment_id": str(payment.id)})
+        data = json.dumps({
+            "EventTypeId": 1796,
+            "EventData": {
+                "TransactionId": payment.transaction_id or f"SIM-{payment.id}",
+                "OrderCode": payment.order_code,
+            },
+        })
         simulated_request = factory.post(
             reverse("payment_webhook"), data=data, content_type="application/json"
         )
@@ -116,3 +113,25 @@ class PaymentAdmin(admin.ModelAdmin):
     search_fields = ("billing_email", "id", "extra_data")
     readonly_fields = ("created", "modified", "captured_amount")
     actions = [simulate_success, simulate_failure, simulate_webhook]
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    """Read-only log of the webhook notifications received from Viva."""
+
+    list_display = (
+        "id",
+        "event_type_id",
+        "transaction_id",
+        "order_code",
+        "outcome",
+        "received_at",
+        "processed_at",
+    )
+    list_filter = ("event_type_id", "outcome")
+    search_fields = ("transaction_id", "order_code")
+    readonly_fields = [f.name for f in WebhookEvent._meta.fields]
+
+    def has_add_permission(self, request):
+        """Notifications are only created by the webhook endpoint."""
+        return False
@@ -47,6 +47,7 @@ class RaceAdmin(TranslationAdmin):
         "base_price_team",
     )
     list_filter = ("event", "race_type")
+    list_select_related = ("event", "race_type")
     search_fields = ("race_type__name", "event__name")
     ordering = ("event", "race_type")
     fields = (
@@ -2,18 +2,22 @@
 
 This module defines Django admin interfaces for the Registration and Athlete
 models, providing functionalities such as inline editing, filtering, and
-custom display fields.
+custom display fields. The changelist loads each page in one query: the
+event, payment and terms are joined and athletes are counted in SQL.
 """
 
 from django.contrib import admin
+from django.db.models import Count
 from django.urls import reverse
 from django.utils.html import format_html
 
 from event.models.athlete import Athlete
 from event.models.registration import Registration
 
+from .related import RelatedChoicesMixin
 
-class AthleteInline(admin.TabularInline):
+
+class AthleteInline(RelatedChoicesMixin, admin.TabularInline):
     """Inline admin interface for managing Athlete objects within a Registration.
 
     This class allows the display and editing of Athlete details directly
@@ -78,6 +82,9 @@ class RegistrationAdmin(admin.ModelAdmin):
         "payment_link",
     )
     list_filter = ("event", "status", "payment_status", "agrees_to_terms")
+    list_select_related = ("event", "payment", "agreed_to_terms")
+    # Filtered pages count the filtered rows only
+    show_full_result_count = False
     search_fields = ("id", "event__name")
     ordering = ("-created_at",)
     readonly_fields = (
@@ -90,6 +97,10 @@ class RegistrationAdmin(admin.ModelAdmin):
     )
     inlines = [AthleteInline]
 
+    def get_queryset(self, request):
+        """Count the athletes of each registration in the same query."""
+        return super().get_queryset(request).annotate(athlete_count=Count("athletes"))
+
     @admin.display(description="T&Cs Version")
     def get_terms_version(self, obj):
         """Retrieve the terms and conditions version agreed to by the registrant.
@@ -106,7 +117,7 @@ class RegistrationAdmin(admin.ModelAdmin):
         """
         return obj.agreed_to_terms.version if obj.agreed_to_terms else "—"
 
-    @admin.display(description="Athletes")
+    @admin.display(description="Athletes", ordering="athlete_count")
     def num_athletes(self, obj):
         """Retrieve the number of athletes associated with a registration.
 
@@ -120,7 +131,7 @@ class RegistrationAdmin(admin.ModelAdmin):
         int
             The number of athletes linked to the registration.
         """
-        return obj.athletes.count()
+        return obj.athlete_count
 
     @admin.display(description="Payment")
     def payment_link(self, obj):
@@ -142,3 +153,9 @@ class RegistrationAdmin(admin.ModelAdmin):
                 '<a href="{}">#{} – {}</a>', url, obj.payment.id, obj.payment.status
             )
         return "—"
+
+    def save_related(self, request, form, formsets, change):
+        """Save the athletes, then re-price the registration if it is unpaid."""
+        super().save_related(request, form, formsets, change)
+        if not form.instance.is_paid():
+            form.instance.update_total_amount()
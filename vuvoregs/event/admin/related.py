@@ -0,0 +1,58 @@
+"""Loading related objects for admin pages without a query per row.
+
+The ``__str__`` of races, packages, pickup points and special prices
+follows further relations (race type, event, race). Changelist filters
+and foreign key selects print every object of those models, so they are
+loaded here with those relations joined in:
+
+- RelatedChoicesFilter: a related-object list filter.
+- RelatedChoicesMixin: selects of a ModelAdmin or inline form.
+"""
+
+from django.contrib import admin
+
+from event.models.event import PickUpPoint
+from event.models.package import RacePackage, RaceSpecialPrice
+from event.models.race import Race
+
+# The relations each model's __str__ follows.
+STR_RELATED = {
+    Race: ("event", "race_type"),
+    RacePackage: ("event",),
+    PickUpPoint: ("event",),
+    RaceSpecialPrice: ("race",),
+}
+
+
+def choices_queryset(model, queryset=None):
+    """Return ``queryset`` (or all objects of ``model``) ready to be printed."""
+    if queryset is None:
+        queryset = model._default_manager.all()
+    return queryset.select_related(*STR_RELATED.get(model, ()))
+
+
+class RelatedChoicesFilter(admin.RelatedFieldListFilter):
+    """Related-object list filter loading its choices in one query."""
+
+    def field_choices(self, field, request, model_admin):
+        """Return ``(pk, label)`` choices of the related model."""
+        queryset = choices_queryset(field.related_model).complex_filter(
+            field.get_limit_choices_to()
+        )
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return [(obj.pk, str(obj)) for obj in queryset]
+
+
+class RelatedChoicesMixin:
+    """Load the foreign key selects of a form in one query each."""
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """Join the relations the related model's ``__str__`` follows."""
+        if db_field.related_model in STR_RELATED and "queryset" not in kwargs:
+            kwargs["queryset"] = choices_queryset(
+                db_field.related_model,
+                self.get_field_queryset(kwargs.get("using"), db_field, request),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
@@ -31,5 +31,6 @@ class TermsAndConditionsAdmin(TranslationAdmin):
     """
 
     list_display = ("event", "version", "created_at")
+    list_select_related = ("event",)
     search_fields = ("event__name", "version", "title")
     ordering = ("-created_at",)
@@ -0,0 +1,17 @@
+"""Latency and query-count benchmarks of the registration and payment flow.
+
+``python manage.py run_benchmarks`` seeds a throwaway test database at a
+few sizes, runs every scenario of ``scenarios.SCENARIOS`` through the test
+client (``create_payment`` talks to a local Viva stub), writes the results
+to JSON and fails if they regress against ``baseline.json``.
+"""
+
+from .runner import (  # noqa: F401
+    BASELINE_PATH,
+    Regression,
+    compare,
+    load,
+    run_suite,
+    save,
+)
+from .scenarios import SCENARIOS  # noqa: F401
@@ -0,0 +1,209 @@
+"""Run the scenarios, save the results and compare them with a baseline.
+
+For every size, the database is seeded with ``seed_event_data`` (fixed
+seed, so the same rows every time) and every scenario is run ``repeat``
+times with a cold cache, after one warm-up run. A result records the
+median and fastest latency and the most queries of a run::
+
+    {"meta": {...}, "results": {"<size>": {"<scenario>": {
+        "median_ms": 12.3, "min_ms": 11.8, "queries": 9}}}}
+
+A scenario regresses when it makes more queries than in the baseline.
+Latency depends on the machine, so it is only compared on request: then
+the fastest run may not grow by more than the tolerance (nor by more than
+``MIN_SLOWDOWN_MS``, so noise on very fast requests is ignored).
+"""
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from io import StringIO
+import json
+from pathlib import Path
+import platform
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from event.tests.payments.viva_stub import VivaStubServer
+from payments.core import PROVIDER_CACHE
+
+from .scenarios import SCENARIOS, Context, benchmark_user
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = (20, 200)
+SEED = 0
+# Latency increases smaller than this are never reported.
+MIN_SLOWDOWN_MS = 5.0
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A scenario that got slower or makes more queries than the baseline."""
+
+    size: str
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self):
+        """Return the regression as reported by the command."""
+        return (
+            f"[{self.size}] {self.scenario}: {self.metric} "
+            f"{self.baseline:g} -> {self.current:g}"
+        )
+
+
+def seed(size: int) -> None:
+    """Replace the data with a seeded database of ``size`` athletes per race."""
+    benchmark_user()
+    call_command(
+        "seed_event_data",
+        events=2,
+        athletes_per_race=size,
+        paid_ratio=0.7,
+        seed=SEED,
+        stdout=StringIO(),
+    )
+
+
+def _viva_stub_settings(server):
+    handler, config = settings.PAYMENT_VARIANTS["viva"]
+    return {
+        "PAYMENT_VARIANTS": {
+            **settings.PAYMENT_VARIANTS,
+            "viva": (
+                handler,
+                {
+                    **config,
+                    "accounts_url": server.url,
+                    "api_url": server.url,
+                    "checkout_url": f"{server.url}/web/checkout",
+                },
+            ),
+        },
+        "ASYNC_CHECKOUT": False,
+    }
+
+
+def measure(client, scenario, context, repeat: int) -> dict:
+    """Run a scenario ``repeat`` times and return its timings and queries.
+
+    One more run comes first to warm up templates and connections; it is
+    not counted.
+
+    Raises:
+        AssertionError: If a response does not have the expected status.
+    """
+    timings, queries = [], 0
+    for run in range(repeat + 1):
+        request = scenario.prepare(context, run)
+        cache.clear()
+        kwargs = {"content_type": request.content_type} if request.content_type else {}
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = getattr(client, request.method)(
+                request.path, request.data, **kwargs
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code not in request.expected_status:
+            raise AssertionError(
+                f"{scenario.name}: {request.method.upper()} {request.path} "
+                f"returned {response.status_code}"
+            )
+        if run:
+            timings.append(elapsed)
+            queries = max(queries, len(captured.captured_queries))
+    return {
+        "median_ms": round(statistics.median(timings), 2),
+        "min_ms": round(min(timings), 2),
+        "queries": queries,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat: int = 5, names=None, log=None) -> dict:
+    """Seed each size and measure every scenario (or those in ``names``)."""
+    scenarios = [s for s in SCENARIOS if names is None or s.name in names]
+    results = {}
+    server = VivaStubServer().start()
+    try:
+        # Request sampling (event.perf) would add its own work to the timings
+        with override_settings(PERF_SAMPLE_RATE=0, **_viva_stub_settings(server)):
+            PROVIDER_CACHE.pop("viva", None)  # Providers are built once per variant
+            for size in sizes:
+                seed(size)
+                context = Context.build()
+                client = Client()
+                client.force_login(context.user)
+                results[str(size)] = {}
+                for scenario in scenarios:
+                    result = measure(client, scenario, context, repeat)
+                    results[str(size)][scenario.name] = result
+                    if log:
+                        log(size, scenario.name, result)
+    finally:
+        PROVIDER_CACHE.pop("viva", None)
+        server.stop()
+
+    return {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 1.0, latency=False):
+    """Return the regressions of ``current`` against ``baseline``.
+
+    Args:
+        current: Results of ``run_suite``.
+        baseline: Stored results to compare with.
+        tolerance: Allowed relative growth of the fastest run's latency.
+        latency: Compare latencies too, not only query counts.
+    """
+    regressions = []
+    for size, scenarios in current["results"].items():
+        for name, result in scenarios.items():
+            expected = baseline.get("results", {}).get(size, {}).get(name)
+            if expected is None:
+                continue
+            if result["queries"] > expected["queries"]:
+                regressions.append(
+                    Regression(
+                        size, name, "queries", expected["queries"], result["queries"]
+                    )
+                )
+            slowdown = result["min_ms"] - expected["min_ms"]
+            if (
+                latency
+                and slowdown > MIN_SLOWDOWN_MS
+                and result["min_ms"] > expected["min_ms"] * (1 + tolerance)
+            ):
+                regressions.append(
+                    Regression(
+                        size, name, "min_ms", expected["min_ms"], result["min_ms"]
+                    )
+                )
+    return regressions
+
+
+def load(path) -> dict:
+    """Return the results stored at ``path``."""
+    return json.loads(Path(path).read_text())
+
+
+def save(results: dict, path) -> None:
+    """Write results to ``path`` as JSON."""
+    Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
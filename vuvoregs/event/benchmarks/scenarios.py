@@ -0,0 +1,262 @@
+"""The requests benchmarked on seeded data.
+
+A scenario builds one request at a time (``prepare``), outside the timed
+part, so each timed run starts from the same kind of state: a registration
+that has no payment yet, a payment that has not been settled, new bib
+numbers for every import.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from decimal import Decimal
+import json
+
+from cities_light.models import City, Country, Region
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import Count
+from django.urls import reverse
+
+from event.models import Athlete, Race, Registration
+
+# Athletes per POST of the registration form.
+REGISTRATION_SIZES = (1, 5, 20)
+# Rows per bib import.
+BIB_ROWS = 500
+
+
+def benchmark_user():
+    """Return the superuser requests are made as (the seeder's organizer)."""
+    User = get_user_model()
+    user = User.objects.filter(is_superuser=True).order_by("pk").first()
+    return user or User.objects.create_superuser("benchmark@example.com")
+
+
+@dataclass
+class Request:
+    """A request sent by the benchmark client."""
+
+    method: str
+    path: str
+    data: dict | str | None = None
+    content_type: str | None = None
+    expected_status: tuple[int, ...] = (200,)
+
+
+@dataclass
+class Scenario:
+    """A named request, rebuilt for every run by ``prepare(context, run)``."""
+
+    name: str
+    prepare: Callable[["Context", int], Request]
+
+
+@dataclass
+class Context:
+    """Seeded rows the scenarios pick their requests from."""
+
+    user: object
+    event: object
+    race: object
+    package: object
+    pickup_point: object
+    city: object
+    confirm_registration: object
+    unpaid: list = field(default_factory=list)
+
+    @classmethod
+    def build(cls):
+        """Pick the rows of the seeded database the scenarios use.
+
+        Raises:
+            RuntimeError: If the seeded data has no race the registration
+                form can be posted to without roles.
+        """
+        race = (
+            Race.objects.filter(race_type__roles__isnull=True, packages__isnull=False)
+            .select_related("event")
+            .order_by("pk")
+            .first()
+        )
+        if race is None:
+            raise RuntimeError("The seeded data has no race without roles.")
+        event = race.event
+
+        country = Country.objects.get_or_create(name="Greece", code2="GR")[0]
+        region = Region.objects.get_or_create(name="Attica", country=country)[0]
+        city = City.objects.get_or_create(
+            name="Athens", region=region, country=country
+        )[0]
+
+        confirm = (
+            Registration.objects.filter(event=event)
+            .annotate(size=Count("athletes"))
+            .order_by("-size", "pk")
+            .first()
+        )
+        unpaid = list(
+            Registration.objects.filter(
+                payment_status="not_paid", payment__isnull=False
+            )
+            .exclude(total_amount=Decimal("0.00"))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        return cls(
+            user=benchmark_user(),
+            event=event,
+            race=race,
+            package=race.packages.order_by("pk").first(),
+            pickup_point=event.pickup_points.order_by("pk").first(),
+            city=city,
+            confirm_registration=confirm,
+            unpaid=unpaid,
+        )
+
+    def unpaid_registration(self, run: int) -> Registration:
+        """Return a different unpaid registration for every run.
+
+        Raises:
+            RuntimeError: If the seeded data has too few unpaid registrations.
+        """
+        if run >= len(self.unpaid):
+            raise RuntimeError("Not enough unpaid registrations; seed more data.")
+        return Registration.objects.select_related("payment").get(pk=self.unpaid[run])
+
+
+def _get(name, *args):
+    return lambda context, run: Request("get", reverse(name, args=args))
+
+
+def _event_get(name):
+    return lambda context, run: Request("get", reverse(name, args=[context.event.pk]))
+
+
+def _registration_list(**params):
+    def prepare(context, run):
+        query = {"event": context.event.pk, "per_page": 100, **params}
+        return Request("get", reverse("dashboard:registrations"), query)
+
+    return prepare
+
+
+def _registration_get(context, run):
+    return Request("get", reverse("registration", args=[context.race.pk]))
+
+
+def _registration_post(athletes):
+    def prepare(context, run):
+        data = {
+            "athlete-TOTAL_FORMS": str(athletes),
+            "athlete-INITIAL_FORMS": "0",
+            "athlete-MIN_NUM_FORMS": "0",
+            "athlete-MAX_NUM_FORMS": "1000",
+        }
+        options = list(context.package.packageoption_set.order_by("pk"))
+        for number in range(athletes):
+            prefix = f"athlete-{number}"
+            data.update({
+                f"{prefix}-first_name": "Bench",
+                f"{prefix}-last_name": f"Runner {run}-{number}",
+                f"{prefix}-email": f"bench.{run}.{number}@example.com",
+                f"{prefix}-phone": "6900000000",
+                f"{prefix}-sex": "Female",
+                f"{prefix}-hometown": "Athens",
+                f"{prefix}-package": str(context.package.pk),
+                f"{prefix}-pickup_point": str(context.pickup_point.pk),
+            })
+            for option in options:
+                data[f"{prefix}-option-{option.pk}"] = option.options_json[0]
+                data[f"{prefix}-option-{option.pk}-name"] = option.name
+        return Request(
+            "post",
+            reverse("registration", args=[context.race.pk]),
+            data,
+            expected_status=(302,),
+        )
+
+    return prepare
+
+
+def _confirm_get(context, run):
+    return Request(
+        "get",
+        reverse("confirm_registration", args=[context.confirm_registration.pk]),
+    )
+
+
+def _create_payment(context, run):
+    registration = context.unpaid_registration(run)
+    # A registration reaches create_payment without a payment
+    Registration.objects.filter(pk=registration.pk).update(payment=None)
+    return Request(
+        "post",
+        reverse("create_payment", args=[registration.pk]),
+        {
+            "agrees_to_terms": "on",
+            "billing_first_name": "Bench",
+            "billing_last_name": "Runner",
+            "billing_address_1": "1 Street",
+            "billing_address_2": "",
+            "billing_postcode": "11111",
+            "billing_country": str(context.city.country_id),
+            "billing_region": str(context.city.region_id),
+            "billing_city": str(context.city.pk),
+            "billing_email": "bench@example.com",
+            "billing_phone": "6900000000",
+        },
+        expected_status=(302,),
+    )
+
+
+def _payment_webhook(context, run):
+    # Counted from the end, so runs never share a payment with create_payment
+    registration = context.unpaid_registration(len(context.unpaid) - run - 1)
+    payment = registration.payment
+    payload = {
+        "EventTypeId": 1796,
+        "EventData": {
+            "TransactionId": f"bench-{payment.pk}-{run}",
+            "OrderCode": payment.order_code,
+        },
+    }
+    return Request(
+        "post",
+        reverse("payment_webhook"),
+        json.dumps(payload),
+        content_type="application/json",
+    )
+
+
+def _import_bibs(context, run):
+    ids = Athlete.objects.order_by("pk").values_list("pk", flat=True)[:BIB_ROWS]
+    lines = ["id;bib_number"] + [f"{pk};{run + 1}{pk}" for pk in ids]
+    upload = SimpleUploadedFile(
+        "bibs.csv", "\n".join(lines).encode(), content_type="text/csv"
+    )
+    return Request(
+        "post",
+        reverse("event_admin:import-bibs"),
+        {"csv_file": upload},
+        expected_status=(302,),
+    )
+
+
+SCENARIOS = [
+    Scenario("event_list_partial", _get("event:htmx_event_list")),
+    Scenario("race_cards_partial", _event_get("event:htmx_race_cards")),
+    Scenario("registration_get", _registration_get),
+    *(
+        Scenario(f"registration_post_{size}", _registration_post(size))
+        for size in REGISTRATION_SIZES
+    ),
+    Scenario("confirm_registration", _confirm_get),
+    Scenario("create_payment", _create_payment),
+    Scenario("payment_webhook", _payment_webhook),
+    Scenario("import_bibs_view", _import_bibs),
+    Scenario("dashboard_home", _get("dashboard:home")),
+    Scenario("dashboard_registrations", _registration_list()),
+    Scenario("dashboard_registrations_search", _registration_list(search="ma")),
+    Scenario("dashboard_event", _event_get("dashboard:event_dashboard")),
+    Scenario("dashboard_chart_data", _event_get("dashboard:event_chart_data")),
+]
@@ -0,0 +1,129 @@
+"""Versioned caching of the public event and race pages.
+
+Rendered fragments are stored in the default cache under a key that
+includes the language and a version number. Versions live in the cache
+too: the listing (all event cards) has one, and every event has one for its
+race pages. Model signals and the capacity counters bump them, so every
+worker process sharing the cache stops serving stale output at once, while
+the short TTL bounds staleness from the clock (registration windows opening
+or closing, time-based prices starting).
+
+Works with any Django cache backend, including local-memory and file-based
+caches.
+"""
+
+from functools import wraps
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils import translation
+
+LISTING_VERSION_KEY = "pages:listing:version"
+
+
+def page_cache_timeout() -> int:
+    """Return the TTL, in seconds, of cached public pages."""
+    return getattr(settings, "PUBLIC_PAGE_CACHE_TIMEOUT", 60)
+
+
+def event_version_key(event_id) -> str:
+    """Return the cache key holding the page version of an event."""
+    return f"pages:event:{event_id}:version"
+
+
+def get_versions(keys) -> dict:
+    """Return ``{key: version}`` for version keys, creating missing ones.
+
+    A missing version (never set, or evicted) starts from the current time in
+    nanoseconds, so it can never collide with an entry stored before.
+    """
+    keys = list(keys)
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return found
+
+
+def bump_version(key) -> None:
+    """Invalidate everything stored under a version key, for all processes."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_version(key) -> None:
+    """Bump a version now and again after commit.
+
+    The first bump lets the current process see its own change; the second
+    stops other workers from keeping output rendered from pre-commit rows.
+    """
+    bump_version(key)
+    transaction.on_commit(lambda: bump_version(key))
+
+
+def invalidate_listing() -> None:
+    """Invalidate the cached event cards."""
+    invalidate_version(LISTING_VERSION_KEY)
+
+
+def invalidate_event(event_id) -> None:
+    """Invalidate the cached race pages of an event and the event cards."""
+    invalidate_version(event_version_key(event_id))
+    invalidate_listing()
+
+
+def event_page_version(event_id) -> int:
+    """Return the current page version of an event (for ``{% cache %}``)."""
+    key = event_version_key(event_id)
+    return get_versions([key])[key]
+
+
+def cache_public_fragment(view):
+    """Cache the output of a public HTMX partial.
+
+    The key covers the view, the language and the version of what the
+    partial shows: the event's version when the URL has an ``event_id``,
+    the listing version otherwise. Hits are served without touching the
+    database. Only successful GET responses are cached.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if request.method != "GET":
+            return view(request, *args, **kwargs)
+
+        event_id = kwargs.get("event_id")
+        if event_id is None:
+            version_key = LISTING_VERSION_KEY
+        else:
+            version_key = event_version_key(event_id)
+        version = get_versions([version_key])[version_key]
+        key = ":".join([
+            "pages",
+            view.__name__,
+            translation.get_language() or settings.LANGUAGE_CODE,
+            str(event_id or "all"),
+            str(version),
+        ])
+
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            cache.set(
+                key,
+                (response.content, response["Content-Type"]),
+                page_cache_timeout(),
+            )
+        return response
+
+    return wrapped
@@ -0,0 +1,20 @@
+"""Capacity package for the event application.
+
+Reserves seats atomically so that events and races cannot be oversold
+while registrations wait for payment, and maintains the paid-athlete
+counters shown on listing pages.
+"""
+
+from .counters import adjust_paid_athletes, recount_paid_athletes  # noqa: F401
+from .reservations import (  # noqa: F401
+    CapacityExceeded,
+    confirm_seats,
+    extend_hold,
+    has_room,
+    recount,
+    release_expired_holds,
+    release_seats,
+    reserve_seats,
+    reserve_seats_by_race,
+    reserved_seats,
+)
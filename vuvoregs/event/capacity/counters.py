@@ -0,0 +1,65 @@
+"""Maintained paid-athlete counters on ``Event`` and ``Race``.
+
+``Event.paid_athletes`` and ``Race.paid_athletes`` count the athletes of
+paid registrations. They are adjusted in the same transaction that moves a
+registration into or out of ``paid`` (see ``event.payments.transitions``),
+so listing pages read a column instead of joining ``Athlete`` to
+``Registration``. ``recount_paid_athletes`` rebuilds them from the source
+rows if they ever drift.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from event.caching import invalidate_listing
+from event.models import Athlete, Event, Race
+
+
+def adjust_paid_athletes(registration, delta: int) -> None:
+    """Add ``delta`` times the registration's athletes to its counters."""
+    if not delta:
+        return
+    per_race = (
+        registration.athletes.order_by()
+        .values("race_id")
+        .annotate(athletes=Count("id"))
+        .values_list("race_id", "athletes")
+    )
+    total = 0
+    for race_id, athletes in per_race:
+        total += athletes
+        Race.objects.filter(pk=race_id).update(
+            paid_athletes=Greatest(F("paid_athletes") + delta * athletes, Value(0))
+        )
+    if total:
+        Event.objects.filter(pk=registration.event_id).update(
+            paid_athletes=Greatest(F("paid_athletes") + delta * total, Value(0))
+        )
+        invalidate_listing()
+
+
+def recount_paid_athletes(events=None) -> None:
+    """Rebuild the paid-athlete counters (of ``events``, or of every event)."""
+    paid = Athlete.objects.filter(registration__payment_status="paid").order_by()
+    event_counts = (
+        paid.filter(registration__event=OuterRef("pk"))
+        .values("registration__event")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    race_counts = (
+        paid.filter(race=OuterRef("pk"))
+        .values("race")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    event_qs, race_qs = Event.objects.all(), Race.objects.all()
+    if events is not None:
+        event_qs = event_qs.filter(pk__in=[e.pk for e in events])
+        race_qs = race_qs.filter(event__in=event_qs)
+
+    with transaction.atomic():
+        event_qs.update(paid_athletes=Coalesce(Subquery(event_counts), 0))
+        race_qs.update(paid_athletes=Coalesce(Subquery(race_counts), 0))
+    invalidate_listing()
@@ -0,0 +1,304 @@
+"""Atomic seat reservation for events and races.
+
+Every registration claims its seats when it is created. The claim is a
+``held`` ``SeatReservation`` per race plus an increment of the event- and
+race-level ``CapacityCounter`` rows, done under a row lock so concurrent
+checkouts cannot oversell. Holds expire after the checkout's payment
+timeout unless the payment confirms them; expired holds are released by the
+sweeper (``release_expired_holds``) and their seats go back to the pool.
+
+Admission only reads the counters, so it costs one indexed lookup instead of
+a count over ``Athlete`` joined to ``Registration``.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from event.caching import invalidate_listing
+from event.models import Athlete, CapacityCounter, SeatReservation
+
+# Extra time after Viva's payment timeout for the webhook to arrive.
+CHECKOUT_GRACE_SECONDS = 60
+
+
+class CapacityExceeded(Exception):
+    """Raised when there are not enough seats left for a reservation."""
+
+
+def _hold_timeout() -> timedelta:
+    return timedelta(seconds=getattr(settings, "SEAT_HOLD_TIMEOUT", 15 * 60))
+
+
+def _count_reserved(event, race=None) -> int:
+    """Count reserved seats from scratch (used to seed or repair a counter)."""
+    reservations = SeatReservation.objects.filter(
+        race__event=event,
+        status__in=[SeatReservation.HELD, SeatReservation.CONFIRMED],
+    )
+    paid = Athlete.objects.filter(
+        registration__event=event,
+        registration__payment_status="paid",
+        registration__seat_reservations__isnull=True,
+    )
+    if race is not None:
+        reservations = reservations.filter(race=race)
+        paid = paid.filter(race=race)
+    held = reservations.aggregate(total=Sum("seats"))["total"] or 0
+    return held + paid.count()
+
+
+def _locked_counter(event, race=None) -> CapacityCounter:
+    """Return the counter row for an event (or race), locked for update.
+
+    Creates and seeds the row on first use. Must run inside a transaction.
+    """
+    counters = CapacityCounter.objects.select_for_update()
+    counter = counters.filter(event=event, race=race).first()
+    if counter is None:
+        try:
+            with transaction.atomic():
+                CapacityCounter.objects.create(
+                    event=event, race=race, reserved=_count_reserved(event, race)
+                )
+        except IntegrityError:
+            pass  # Created concurrently by another request
+        counter = counters.get(event=event, race=race)
+    return counter
+
+
+def _locked_counters(race):
+    """Lock the event counter, then the race counter (always in that order)."""
+    return _locked_counter(race.event), _locked_counter(race.event, race)
+
+
+def _locked_event_counters(event, races):
+    """Lock the event counter, then the counters of ``races`` in pk order."""
+    event_counter = _locked_counter(event)
+    race_counters = {
+        race: _locked_counter(event, race)
+        for race in sorted(races, key=lambda race: race.pk)
+    }
+    return event_counter, race_counters
+
+
+def _adjust(counters, delta: int) -> None:
+    CapacityCounter.objects.filter(pk__in=[c.pk for c in counters]).update(
+        reserved=F("reserved") + delta
+    )
+    # The event cards show whether the event still has room
+    invalidate_listing()
+
+
+def _full_scope(event, counters, seats_by_race):
+    """Return the event or race that cannot take the seats, or None."""
+    event_counter, race_counters = counters
+    checks = [(event, event_counter, sum(seats_by_race.values()))]
+    checks += [
+        (race, race_counters[race], seats) for race, seats in seats_by_race.items()
+    ]
+    for scope, counter, seats in checks:
+        limit = scope.max_participants
+        if limit is not None and counter.reserved + seats > limit:
+            return scope
+    return None
+
+
+def reserved_seats(event, race=None) -> int:
+    """Return the number of reserved seats of an event (or one of its races)."""
+    reserved = (
+        CapacityCounter.objects.filter(event=event, race=race)
+        .values_list("reserved", flat=True)
+        .first()
+    )
+    if reserved is None:
+        with transaction.atomic():
+            reserved = _locked_counter(event, race).reserved
+    return reserved
+
+
+def has_room(event, race=None, seats: int = 1) -> bool:
+    """Return True if ``seats`` more seats fit in the event (and race)."""
+    limits = [(None, event.max_participants)]
+    if race is not None:
+        limits.append((race, race.max_participants))
+    return all(
+        limit is None or reserved_seats(event, scope) + seats <= limit
+        for scope, limit in limits
+    )
+
+
+def reserve_seats(registration, race, seats: int, timeout=None) -> SeatReservation:
+    """Hold ``seats`` seats of ``race`` for a registration.
+
+    Raises:
+        CapacityExceeded: If the event or race has no room left.
+    """
+    (reservation,) = reserve_seats_by_race(registration, {race: seats}, timeout)
+    return reservation
+
+
+def reserve_seats_by_race(
+    registration, seats_by_race, timeout=None
+) -> list[SeatReservation]:
+    """Hold seats of several races of one event for a registration.
+
+    ``seats_by_race`` maps each race to its number of seats. The event limit
+    is checked against the total, so a team spread over several races cannot
+    overfill the event. Expired holds of the event are swept once before
+    giving up.
+
+    Raises:
+        CapacityExceeded: With the event or race that has no room left.
+    """
+    event = registration.event
+    seats_by_race = dict(sorted(seats_by_race.items(), key=lambda item: item[0].pk))
+    expires_at = timezone.now() + (timeout or _hold_timeout())
+
+    with transaction.atomic():
+        counters = _locked_event_counters(event, seats_by_race)
+        if _full_scope(event, counters, seats_by_race) is not None:
+            release_expired_holds(event=event)
+            counters = _locked_event_counters(event, seats_by_race)
+            full = _full_scope(event, counters, seats_by_race)
+            if full is not None:
+                raise CapacityExceeded(full)
+
+        event_counter, race_counters = counters
+        _adjust([event_counter], sum(seats_by_race.values()))
+        reservations = []
+        for race, seats in seats_by_race.items():
+            _adjust([race_counters[race]], seats)
+            reservation, _ = SeatReservation.objects.update_or_create(
+                registration=registration,
+                race=race,
+                defaults={
+                    "seats": seats,
+                    "status": SeatReservation.HELD,
+                    "expires_at": expires_at,
+                },
+            )
+            reservations.append(reservation)
+    return reservations
+
+
+def extend_hold(registration, seconds: int) -> None:
+    """Keep a registration's holds alive for another ``seconds``.
+
+    Called when checkout starts. Holds that have already been released are
+    re-reserved if there is still room.
+
+    Raises:
+        CapacityExceeded: If a hold was released and its seats are gone.
+    """
+    reservations = SeatReservation.objects.filter(registration=registration).exclude(
+        status=SeatReservation.CONFIRMED
+    )
+    timeout = timedelta(seconds=seconds + CHECKOUT_GRACE_SECONDS)
+    lost = {}
+    for reservation in reservations.select_related("race"):
+        if reservation.status == SeatReservation.HELD:
+            expires_at = max(reservation.expires_at, timezone.now() + timeout)
+            extended = SeatReservation.objects.filter(
+                pk=reservation.pk, status=SeatReservation.HELD
+            ).update(expires_at=expires_at)
+            if extended:
+                continue
+        # Released (or swept meanwhile): try to claim the seats again
+        lost[reservation.race] = reservation.seats
+
+    if lost:
+        reserve_seats_by_race(registration, lost, timeout=timeout)
+
+
+def confirm_seats(registration) -> None:
+    """Turn a registration's holds into paid seats.
+
+    Idempotent. If a hold was already released (or never existed), its
+    seats are claimed again without a capacity check: the athlete has paid.
+    """
+    with transaction.atomic():
+        reservations = list(
+            SeatReservation.objects.select_for_update().filter(
+                registration=registration
+            )
+        )
+        if reservations:
+            claims = {
+                reservation.race: reservation.seats
+                for reservation in reservations
+                if reservation.status == SeatReservation.RELEASED
+            }
+        else:
+            athletes = registration.athletes.select_related("race__event")
+            claims = Counter(athlete.race for athlete in athletes)
+
+        for race, seats in sorted(claims.items(), key=lambda item: item[0].pk):
+            _adjust(_locked_counters(race), seats)
+            SeatReservation.objects.update_or_create(
+                registration=registration,
+                race=race,
+                defaults={
+                    "seats": seats,
+                    "status": SeatReservation.CONFIRMED,
+                    "expires_at": timezone.now(),
+                },
+            )
+        SeatReservation.objects.filter(
+            registration=registration, status=SeatReservation.HELD
+        ).update(status=SeatReservation.CONFIRMED)
+
+
+def release_seats(registration) -> None:
+    """Give a registration's seats back to the pool. Idempotent."""
+    with transaction.atomic():
+        reservations = list(
+            SeatReservation.objects.select_for_update()
+            .filter(registration=registration)
+            .exclude(status=SeatReservation.RELEASED)
+            .order_by("race_id")
+        )
+        for reservation in reservations:
+            _adjust(_locked_counters(reservation.race), -reservation.seats)
+        SeatReservation.objects.filter(
+            pk__in=[reservation.pk for reservation in reservations]
+        ).update(status=SeatReservation.RELEASED)
+
+
+def release_expired_holds(event=None, now=None) -> int:
+    """Release every expired hold (optionally of one event).
+
+    Returns:
+        int: The number of holds released.
+    """
+    now = now or timezone.now()
+    expired = SeatReservation.objects.filter(
+        status=SeatReservation.HELD, expires_at__lt=now
+    ).select_related("race__event")
+    if event is not None:
+        expired = expired.filter(race__event=event)
+
+    released = 0
+    for reservation in expired:
+        with transaction.atomic():
+            claimed = SeatReservation.objects.filter(
+                pk=reservation.pk, status=SeatReservation.HELD, expires_at__lt=now
+            ).update(status=SeatReservation.RELEASED)
+            if claimed:
+                _adjust(_locked_counters(reservation.race), -reservation.seats)
+                released += 1
+    return released
+
+
+def recount(event) -> None:
+    """Rebuild all capacity counters of an event from the source rows."""
+    with transaction.atomic():
+        for race in [None, *event.races.all()]:
+            counter = _locked_counter(event, race)
+            counter.reserved = _count_reserved(event, race)
+            counter.save(update_fields=["reserved"])
+    invalidate_listing()
@@ -0,0 +1,15 @@
+"""Data exports for the event application.
+
+Exports stream their rows from the database, so memory use stays flat
+however many athletes an event has.
+"""
+
+from .athletes import (  # noqa: F401
+    COLUMNS,
+    DEFAULT_COLUMNS,
+    athlete_rows,
+    export_athletes,
+    option_names,
+    stream_csv,
+    stream_xlsx,
+)
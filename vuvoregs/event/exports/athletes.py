@@ -0,0 +1,148 @@
+"""Streaming athlete exports (CSV and XLSX).
+
+Rows are read with ``values_list()`` and ``iterator(chunk_size=...)``, so
+neither model instances nor the whole result are held in memory, and
+related names come from joins instead of one query per athlete. CSV is
+written row by row into a ``StreamingHttpResponse``; XLSX is built with
+openpyxl's write-only workbook in a temporary file and streamed from there.
+
+Columns are chosen by key from ``COLUMNS``; any package option (a key of
+``Athlete.selected_options``) can be added as one more column.
+"""
+
+import csv
+from datetime import date
+from tempfile import TemporaryFile
+
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+
+from event.models import PackageOption
+
+CHUNK_SIZE = 2000
+
+# key -> (header, values_list lookup)
+COLUMNS = {
+    "id": ("id", "id"),
+    "first_name": ("first_name", "first_name"),
+    "last_name": ("last_name", "last_name"),
+    "fathers_name": ("fathers_name", "fathers_name"),
+    "sex": ("sex", "sex"),
+    "dob": ("dob", "dob"),
+    "email": ("email", "email"),
+    "phone": ("phone", "phone"),
+    "hometown": ("hometown", "hometown"),
+    "team": ("team", "team"),
+    "event": ("event", "race__event__name"),
+    "race": ("race", "race__name"),
+    "package": ("package", "package__name"),
+    "pickup_point": ("pickup_point", "pickup_point__name"),
+    "bib_number": ("bib_number", "bib_number"),
+    "registration": ("registration", "registration_id"),
+    "payment_status": ("payment_status", "registration__payment_status"),
+}
+DEFAULT_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "dob",
+    "package",
+    "race",
+    "pickup_point",
+    "bib_number",
+)
+
+
+def option_names(athletes) -> list[str]:
+    """Return the package option names used by the packages of ``athletes``."""
+    return list(
+        PackageOption.objects.filter(package__in=athletes.values("package"))
+        .order_by("name")
+        .values_list("name", flat=True)
+        .distinct()
+    )
+
+
+def _option_value(selected, name) -> str:
+    value = selected.get(name, "") if isinstance(selected, dict) else ""
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return str(value)
+
+
+def athlete_rows(athletes, columns=DEFAULT_COLUMNS, options=(), chunk_size=CHUNK_SIZE):
+    """Yield the header and then one list of cell values per athlete.
+
+    Args:
+        athletes: The athletes to export (a queryset).
+        columns: Keys of ``COLUMNS``, in order.
+        options: Package option names, exported after the columns.
+        chunk_size: Rows fetched from the database at a time.
+    """
+    lookups = [COLUMNS[key][1] for key in columns]
+    if options:
+        lookups.append("selected_options")
+    yield [COLUMNS[key][0] for key in columns] + list(options)
+
+    rows = athletes.order_by("pk").values_list(*lookups)
+    for values in rows.iterator(chunk_size=chunk_size):
+        row = ["" if value is None else value for value in values[: len(columns)]]
+        if options:
+            selected = values[-1]
+            row += [_option_value(selected, name) for name in options]
+        yield row
+
+
+class Echo:
+    """File-like object that returns what is written, for streaming CSV."""
+
+    def write(self, value):
+        """Return the value instead of storing it."""
+        return value
+
+
+def _csv_chunks(rows, delimiter):
+    writer = csv.writer(Echo(), delimiter=delimiter)
+    yield "\ufeff"  # UTF-8 BOM for Excel
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if isinstance(value, date) else value for value in row
+        ])
+
+
+def stream_csv(rows, filename: str, delimiter: str = ";") -> StreamingHttpResponse:
+    """Return a response streaming ``rows`` as a CSV download."""
+    response = StreamingHttpResponse(
+        _csv_chunks(rows, delimiter), content_type="text/csv; charset=utf-8"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def stream_xlsx(rows, filename: str) -> FileResponse:
+    """Return a response streaming ``rows`` as an XLSX download."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Athletes")
+    for row in rows:
+        sheet.append(row)
+    file = TemporaryFile()
+    workbook.save(file)
+    file.seek(0)
+    return FileResponse(
+        file,
+        as_attachment=True,
+        filename=f"{filename}.xlsx",
+        content_type=(
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        ),
+    )
+
+
+def export_athletes(
+    athletes, filename: str, fmt: str = "csv", columns=DEFAULT_COLUMNS, options=()
+):
+    """Return a streaming CSV (``fmt="csv"``) or XLSX download of athletes."""
+    rows = athlete_rows(athletes, columns, options)
+    if fmt == "xlsx":
+        return stream_xlsx(rows, filename)
+    return stream_csv(rows, filename)
@@ -15,3 +15,4 @@ from .athlete import (  # noqa: F401
     athlete_formset_factory,
 )
 from .billing import BillingForm  # noqa: F401
+from .context import PreloadedChoiceField, RaceFormContext  # noqa: F401
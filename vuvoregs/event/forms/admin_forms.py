@@ -9,6 +9,7 @@ Includes:
 from django import forms
 from django.utils.translation import gettext_lazy as _
 
+from event.exports import COLUMNS, DEFAULT_COLUMNS
 from event.models.event import Event
 
 
@@ -24,6 +25,11 @@ class BibNumberImportForm(forms.Form):
         help_text=_("Upload a CSV file with two columns: id;bib_number"),
         required=True,
     )
+    dry_run = forms.BooleanField(
+        label=_("Preview only"),
+        help_text=_("Check the file and list the changes without saving them."),
+        required=False,
+    )
 
 
 class ExportEventAthletesForm(forms.Form):
@@ -37,6 +43,22 @@ class ExportEventAthletesForm(forms.Form):
         required=True,
         label=_("Select Event"),
     )
+    format = forms.ChoiceField(
+        choices=[("csv", "CSV"), ("xlsx", "Excel (.xlsx)")],
+        initial="csv",
+        label=_("Format"),
+    )
+    columns = forms.MultipleChoiceField(
+        choices=[(key, header) for key, (header, _lookup) in COLUMNS.items()],
+        initial=list(DEFAULT_COLUMNS),
+        widget=forms.CheckboxSelectMultiple,
+        label=_("Columns"),
+    )
+    include_options = forms.BooleanField(
+        required=False,
+        label=_("Include package options"),
+        help_text=_("Add one column per package option (e.g. T-shirt size)."),
+    )
 
 
 class TeamExcelUploadForm(forms.Form):
@@ -47,6 +69,11 @@ class TeamExcelUploadForm(forms.Form):
         - Must match the official template (race_name, package_name required)
     """
 
+    event = forms.ModelChoiceField(
+        queryset=Event.objects.all(),
+        required=True,
+        label=_("Select Event"),
+    )
     excel_file = forms.FileField(
         label=_("Upload Excel File (.xlsx)"),
         help_text=_(
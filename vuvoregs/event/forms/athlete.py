@@ -4,24 +4,25 @@ Includes:
 - AthleteForm: Captures individual athlete info and dynamic option logic
 - MinParticipantsFormSet: Enforces race-level participant thresholds
 - athlete_formset_factory: Produces an inline formset for Registration
+
+The choices of every form come from one RaceFormContext per formset.
 """
 
+import logging
+
 from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.forms import (
-    BaseInlineFormSet,
-    ModelChoiceField,
-    RadioSelect,
-    inlineformset_factory,
-)
+from django.forms import BaseInlineFormSet, RadioSelect, inlineformset_factory
 from django.utils.translation import gettext_lazy as _
 
 from event.models.athlete import Athlete
-from event.models.event import PickUpPoint
-from event.models.package import RacePackage, RaceSpecialPrice
 from event.models.registration import Registration
 
+from .context import PreloadedChoiceField, RaceFormContext
+
+logger = logging.getLogger(__name__)
+
 
 class AthleteForm(forms.ModelForm):
     """Form for capturing a single athlete's data during registration."""
@@ -66,12 +67,16 @@ class AthleteForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         self.race = kwargs.pop("race", None)
+        self.context = kwargs.pop("context", None)
         super().__init__(*args, **kwargs)
 
         self.request = None
         self.formIndex = None
 
-        if self.race:
+        if self.context is None and self.race:
+            self.context = RaceFormContext.load(self.race)
+        if self.context:
+            self.race = self.context.race
             self.instance.race = self.race
             self.populatePackageField()
             self.populateRoleField()
@@ -84,23 +89,12 @@ class AthleteForm(forms.ModelForm):
         }
 
     def populatePackageField(self):
-        """Populate package queryset and preselect the only available package if applicable."""
-        packages_data = self.race.get_packages_with_prices()
-
-        # Defensive: extract packages that exist
-        available_packages = [
-            d["package"]
-            for d in packages_data
-            if "package" in d and d["package"] is not None
-        ]
-        print("📦 Available package count:", len(packages_data))
-        print("📦 Extracted packages:", available_packages)
-
-        # Set field queryset
-        self.fields["package"].queryset = RacePackage.objects.filter(
-            id__in=[pkg.id for pkg in available_packages]
+        """Populate package choices and preselect the only available package."""
+        available_packages = self.context.available_packages
+        self.fields["package"] = PreloadedChoiceField(
+            available_packages, required=False, label=_("Package")
         )
-        self.sortedPackages = packages_data
+        self.sortedPackages = self.context.packages
 
         # Auto-select if only one package
         if len(available_packages) == 1:
@@ -108,13 +102,9 @@ class AthleteForm(forms.ModelForm):
 
     def populateRoleField(self):
         """Dynamically inject the role field only if needed."""
-        if not self.race or not self.race.requires_roles():
-            return
-
-        allowed_roles = self.race.get_allowed_roles()
-        if allowed_roles.exists():
-            self.fields["role"] = forms.ModelChoiceField(
-                queryset=allowed_roles,
+        if self.context.roles:
+            self.fields["role"] = PreloadedChoiceField(
+                self.context.roles,
                 required=True,
                 label=_("Role"),
                 help_text=_("Select the role this athlete will perform."),
@@ -122,23 +112,32 @@ class AthleteForm(forms.ModelForm):
 
     def populateSpecialPrices(self):
         """Inject optional special price field if defined on race."""
-        specials = RaceSpecialPrice.objects.filter(race=self.race)
-        if specials.exists():
-            self.fields["special_price"] = ModelChoiceField(
-                queryset=specials,
+        if self.context.special_prices:
+            self.fields["special_price"] = PreloadedChoiceField(
+                self.context.special_prices,
+                empty_label=_("No discount"),
                 required=False,
                 label=_("Special Price (optional)"),
                 widget=RadioSelect,
             )
-            self.fields["special_price"].choices = [("", _("No discount"))] + list(
-                self.fields["special_price"].choices
-            )
         else:
             self.fields.pop("special_price", None)
 
     def filterPickupPoints(self):
         """Filter pickup points to match the current event only."""
-        self.fields["pickup_point"].queryset = self.race.event.pickup_points.all()
+        self.fields["pickup_point"] = PreloadedChoiceField(
+            self.context.pickup_points, required=False, label=_("Pickup Point")
+        )
+
+    def _get_validation_exclusions(self):
+        """Skip the model's foreign key lookups for choices cleaned from the context."""
+        exclude = super()._get_validation_exclusions()
+        exclude.update(
+            name
+            for name, field in self.fields.items()
+            if isinstance(field, PreloadedChoiceField)
+        )
+        return exclude
 
     def setRequestAndIndex(self, request, index):
         """Used by formset to pass request context for option parsing."""
@@ -175,7 +174,7 @@ class AthleteForm(forms.ModelForm):
             self.instance.role = self.cleaned_data.get("role") or self.initial.get(
                 "role"
             )
-        print("💾 selected_options =", self.instance.selected_options)
+        logger.debug("selected_options = %s", self.instance.selected_options)
         return cleaned_data
 
 
@@ -188,9 +187,21 @@ class MinParticipantsFormSet(BaseInlineFormSet):
 
     def __init__(self, *args, **kwargs):
         self.race = kwargs.pop("race", None)
+        self.context = kwargs.pop("context", None)
+        if self.context is None and self.race:
+            self.context = RaceFormContext.load(self.race)
+        if self.context:
+            self.race = self.context.race
         super().__init__(*args, **kwargs)
         self.request = None
 
+    def get_form_kwargs(self, index):
+        """Share the formset's race context with every form."""
+        kwargs = super().get_form_kwargs(index)
+        if self.context:
+            kwargs["context"] = self.context
+        return kwargs
+
     def setRequest(self, request):
         """Attach the request to each form (used for parsing selected package options)."""
         self.request = request
@@ -201,14 +212,14 @@ class MinParticipantsFormSet(BaseInlineFormSet):
         form.setRequestAndIndex(self.request, index)
         form.race = self.race
 
-        if self.race and self.race.requires_roles():
-            allowed_roles = list(self.race.get_allowed_roles())
+        if self.race:
+            allowed_roles = self._allowed_roles()
 
             if allowed_roles:
                 # Add the field if not already present
                 if "role" not in form.fields:
-                    form.fields["role"] = ModelChoiceField(
-                        queryset=self.race.get_allowed_roles(),
+                    form.fields["role"] = PreloadedChoiceField(
+                        allowed_roles,
                         required=True,
                         label=_("Role"),
                         help_text=_("Select the role this athlete will perform."),
@@ -228,6 +239,11 @@ class MinParticipantsFormSet(BaseInlineFormSet):
                 form.fields["role"].widget.attrs["readonly"] = True
                 form.fields["role"].widget.attrs["data-locked"] = "true"
 
+    def _allowed_roles(self) -> list:
+        if self.context:
+            return list(self.context.roles)
+        return list(self.race.get_allowed_roles())
+
     def clean(self):
         """Enforce minimum participants and required roles (if race type uses them)."""
         super().clean()
@@ -242,8 +258,8 @@ class MinParticipantsFormSet(BaseInlineFormSet):
         ]
 
         # 🔒 Role validation
-        if self.race.requires_roles():
-            required_roles = list(self.race.get_allowed_roles())
+        required_roles = self._allowed_roles()
+        if required_roles:
             provided_roles = set()
 
             for form in valid_forms:
@@ -253,19 +269,11 @@ class MinParticipantsFormSet(BaseInlineFormSet):
                 if role:
                     provided_roles.add(role)
 
-            # ✅ Moved outside loop
-            print("👉 Required roles:", [str(r) for r in required_roles])
-            print(
-                "👉 Provided roles (cleaned or initial):",
-                [str(r) for r in provided_roles],
-            )
-
             missing_roles = [
                 role for role in required_roles if role not in provided_roles
             ]
 
             if missing_roles:
-                print("❌ Missing roles:", [str(r) for r in missing_roles])
                 raise ValidationError(
                     _("The following roles must be assigned: %(roles)s.")
                     % {"roles": ", ".join(str(r) for r in missing_roles)}
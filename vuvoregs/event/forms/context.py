@@ -0,0 +1,79 @@
+"""Race data shared by every athlete form of a registration request.
+
+Includes:
+- RaceFormContext: Packages (with prices and options), roles, special
+  prices and pickup points of a race, loaded once per request
+- PreloadedChoiceField: A model choice field over already loaded objects
+
+A formset of fifty athletes renders and validates from the same context
+as a formset of one, so building it costs the same few queries.
+"""
+
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import prefetch_related_objects
+from django.forms import ModelChoiceField
+
+from event.pricing import load_price_tables
+
+
+class PreloadedChoiceField(ModelChoiceField):
+    """A ModelChoiceField whose choices are objects that are already loaded.
+
+    Rendering the choices and cleaning a submitted id read ``objects``
+    instead of the database.
+    """
+
+    def __init__(self, objects, *, empty_label="---------", **kwargs):
+        """Offer ``objects`` (model instances) as the choices."""
+        self.objects = {str(obj.pk): obj for obj in objects}
+        super().__init__(queryset=None, empty_label=empty_label, **kwargs)
+        self.choices = [
+            *([("", self.empty_label)] if self.empty_label is not None else []),
+            *((obj.pk, self.label_from_instance(obj)) for obj in objects),
+        ]
+
+    def to_python(self, value):
+        """Return the loaded object of a submitted id (or object)."""
+        if value in self.empty_values:
+            return None
+        try:
+            return self.objects[str(getattr(value, "pk", value))]
+        except KeyError:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            ) from None
+
+
+@dataclass(frozen=True)
+class RaceFormContext:
+    """Everything the athlete forms of one race offer, loaded once."""
+
+    race: object
+    packages: tuple  # get_packages_with_prices() rows, cheapest first
+    roles: tuple
+    special_prices: tuple
+    pickup_points: tuple
+
+    @classmethod
+    def load(cls, race) -> "RaceFormContext":
+        """Load the context of ``race`` (a handful of queries, once)."""
+        (race,) = load_price_tables([race])
+        prefetch_related_objects(
+            [race], "packages__event", "packages__packageoption_set", "race_type__roles"
+        )
+        return cls(
+            race=race,
+            packages=tuple(race.get_packages_with_prices()),
+            roles=tuple(race.race_type.roles.all()),
+            special_prices=tuple(race.special_prices.all()),
+            pickup_points=tuple(race.event.pickup_points.all()),
+        )
+
+    @property
+    def available_packages(self) -> list:
+        """Return the visible packages, cheapest first."""
+        return [row["package"] for row in self.packages]
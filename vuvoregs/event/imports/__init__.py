@@ -0,0 +1,8 @@
+"""Bulk data imports for the event application.
+
+Imports validate a whole file in one pass and write with bulk queries,
+so their cost grows with the number of chunks rather than rows.
+"""
+
+from .bibs import BibChange, BibImportResult, RowError, import_bibs  # noqa: F401
+from .teams import TeamImportResult, TeamRowError, import_team  # noqa: F401
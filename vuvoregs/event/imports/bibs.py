@@ -0,0 +1,193 @@
+"""Bulk import of bib numbers from a ``id;bib_number`` CSV file.
+
+The file is read as a stream in chunks. Each chunk costs one ``in_bulk``
+query for its athletes; one more query loads the bibs already taken in the
+events touched, and the changes are written with ``bulk_update`` of the
+``bib_number`` column only, in one transaction. Rows that fail validation
+are reported with their line number and skipped; a dry run reports the
+same errors and the changes it would make without writing anything.
+"""
+
+import csv
+from dataclasses import dataclass, field
+from io import TextIOWrapper
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import F
+
+from event.models import Athlete
+
+CHUNK_SIZE = 1000
+BIB_MAX_LENGTH = Athlete._meta.get_field("bib_number").max_length
+
+
+@dataclass(frozen=True)
+class RowError:
+    """A CSV row that was not imported."""
+
+    line: int
+    athlete_id: str
+    bib_number: str
+    message: str
+
+
+@dataclass(frozen=True)
+class BibChange:
+    """A bib number that is (or would be, in a dry run) changed."""
+
+    line: int
+    athlete_id: int
+    athlete: str
+    old: str
+    new: str
+
+
+@dataclass
+class BibImportResult:
+    """Outcome of a bib import."""
+
+    dry_run: bool
+    changes: list[BibChange] = field(default_factory=list)
+    errors: list[RowError] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def _rows(file, delimiter):
+    """Yield ``(line, athlete_id, bib_number)`` for each row of the file."""
+    text = TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text, delimiter=delimiter)
+    for row in reader:
+        yield (
+            reader.line_num,
+            (row.get("id") or "").strip(),
+            (row.get("bib_number") or "").strip(),
+        )
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _validate_row(athlete_id, bib) -> str | None:
+    if not athlete_id.isdigit():
+        return "Invalid athlete ID."
+    if len(bib) > BIB_MAX_LENGTH:
+        return f"Bib number is longer than {BIB_MAX_LENGTH} characters."
+    return None
+
+
+def _taken_bibs(event_ids, importing) -> dict:
+    """Return ``{(event_id, bib): athlete_id}`` of bibs kept by other athletes."""
+    taken = (
+        Athlete.objects.filter(race__event_id__in=event_ids)
+        .exclude(bib_number="")
+        .values_list("race__event_id", "bib_number", "pk")
+    )
+    return {
+        (event_id, bib): pk
+        for event_id, bib, pk in taken.iterator()
+        if pk not in importing
+    }
+
+
+def import_bibs(
+    file, *, dry_run: bool = False, chunk_size: int = CHUNK_SIZE, delimiter=";"
+) -> BibImportResult:
+    """Assign the bib numbers of a CSV file to athletes.
+
+    Bib numbers must be unique within an event; an empty bib number clears
+    the athlete's bib.
+
+    Args:
+        file: The uploaded file (binary).
+        dry_run: Report the changes without saving them.
+        chunk_size: Rows read (and athletes fetched) at a time.
+        delimiter: The CSV delimiter.
+
+    Returns:
+        BibImportResult: The changes, the rejected rows and the number of
+        rows that already had the given bib.
+    """
+    result = BibImportResult(dry_run=dry_run)
+    # (event_id, bib) -> line of the row assigning it, to catch duplicates
+    assigned = {}
+    seen_ids = set()
+    pending = []  # (line, athlete, new bib) passing the per-row checks
+
+    for chunk in _chunks(_rows(file, delimiter), chunk_size):
+        athletes = (
+            Athlete.objects.only("pk", "first_name", "last_name", "bib_number")
+            .annotate(event_id=F("race__event_id"))
+            .in_bulk({int(pk) for _, pk, _ in chunk if pk.isdigit()})
+        )
+        for line, athlete_id, bib in chunk:
+            message = _validate_row(athlete_id, bib)
+            athlete = athletes.get(int(athlete_id)) if message is None else None
+            if message is None and athlete is None:
+                message = "No athlete with this ID."
+            elif message is None and athlete.pk in seen_ids:
+                message = "Athlete appears more than once in the file."
+            elif message is None and bib and (athlete.event_id, bib) in assigned:
+                line_used = assigned[athlete.event_id, bib]
+                message = f"Bib number is already assigned on line {line_used}."
+            if message:
+                result.errors.append(RowError(line, athlete_id, bib, message))
+                continue
+
+            seen_ids.add(athlete.pk)
+            if bib:
+                assigned[athlete.event_id, bib] = line
+            pending.append((line, athlete, bib))
+
+    # Bibs held by athletes outside the file stay taken, and so do the old
+    # bibs of athletes whose row is rejected here, which can reject further
+    # rows: repeat until no more rows are rejected.
+    taken = _taken_bibs({athlete.event_id for _, athlete, _ in pending}, seen_ids)
+    while True:
+        accepted = []
+        for line, athlete, bib in pending:
+            owner = taken.get((athlete.event_id, bib)) if bib else None
+            if owner is None:
+                accepted.append((line, athlete, bib))
+                continue
+            result.errors.append(
+                RowError(
+                    line,
+                    str(athlete.pk),
+                    bib,
+                    f"Bib number is already used by athlete {owner}.",
+                )
+            )
+            if athlete.bib_number:
+                taken[athlete.event_id, athlete.bib_number] = athlete.pk
+        if len(accepted) == len(pending):
+            break
+        pending = accepted
+
+    to_update = []
+    for line, athlete, bib in pending:
+        if athlete.bib_number == bib:
+            result.unchanged += 1
+            continue
+        result.changes.append(
+            BibChange(
+                line,
+                athlete.pk,
+                f"{athlete.first_name} {athlete.last_name}",
+                athlete.bib_number,
+                bib,
+            )
+        )
+        athlete.bib_number = bib
+        to_update.append(athlete)
+
+    result.errors.sort(key=lambda error: error.line)
+    if not dry_run and to_update:
+        with transaction.atomic():
+            Athlete.objects.bulk_update(
+                to_update, fields=["bib_number"], batch_size=chunk_size
+            )
+    return result
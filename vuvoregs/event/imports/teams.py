@@ -0,0 +1,281 @@
+"""Bulk team registration from an Excel sheet.
+
+A club's sheet becomes one ``Registration`` with one athlete per row. The
+workbook is read in openpyxl's read-only (streaming) mode. Races, packages
+(with their options), pickup points, roles and special prices are loaded
+once into lookup maps, so validating a row costs no queries; rows are
+checked with the same rules as ``Athlete.clean``. The total is priced from
+the races' compiled price tables (``price_athletes``), and the athletes are
+written with one ``bulk_create``. The team's seats are held per race in the
+same transaction (``reserve_seats_by_race``), under the capacity counter
+locks, so the rows of several races together cannot overfill the event.
+
+The import is all or nothing: if any row is rejected, nothing is saved and
+every rejected row is reported.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.dateparse import parse_date
+from openpyxl import load_workbook
+
+from event.capacity import CapacityExceeded, reserve_seats_by_race
+from event.models import Athlete, Race, RacePackage, Registration
+from event.pricing import load_price_tables, price_athletes
+from event.pricing.engine import ZERO
+from event.rollups import add_registration
+from event.search import athlete_search_text, index_athletes
+
+BATCH_SIZE = 500
+
+REQUIRED_COLUMNS = (
+    "race_name",
+    "package_name",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "sex",
+    "hometown",
+)
+FIELD_COLUMNS = (
+    "first_name",
+    "last_name",
+    "fathers_name",
+    "team",
+    "email",
+    "phone",
+    "sex",
+    "hometown",
+)
+REFERENCE_COLUMNS = (
+    "race_name",
+    "package_name",
+    "pickup_point",
+    "role",
+    "special_price",
+)
+DATE_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y")
+# Foreign keys are resolved from the lookup maps; clean_fields() would
+# query the database to check each one again.
+FOREIGN_KEYS = [
+    "registration",
+    "race",
+    "package",
+    "pickup_point",
+    "role",
+    "special_price",
+]
+
+
+@dataclass(frozen=True)
+class TeamRowError:
+    """A sheet row that cannot be imported."""
+
+    row: int | None  # None for errors about the whole sheet
+    message: str
+
+    def __str__(self):
+        """Return the error as shown to the user."""
+        return self.message if self.row is None else f"Row {self.row}: {self.message}"
+
+
+@dataclass
+class TeamImportResult:
+    """Outcome of a team import."""
+
+    registration: Registration | None = None
+    athletes: list[Athlete] = field(default_factory=list)
+    errors: list[TeamRowError] = field(default_factory=list)
+
+
+def _key(value) -> str:
+    return str(value or "").strip().casefold()
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # Phone numbers typed as numbers
+    return str(value).strip()
+
+
+def _parse_dob(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = _text(value)
+    parsed = parse_date(text)
+    if parsed:
+        return parsed
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    raise ValidationError(f"Invalid date of birth '{text}'.")
+
+
+class _Lookups:
+    """Everything rows refer to, loaded once for the event."""
+
+    def __init__(self, event):
+        races = load_price_tables(
+            Race.objects.filter(event=event)
+            .select_related("race_type")
+            .prefetch_related("race_type__roles")
+        )
+        self.races = {_key(race.name): race for race in races}
+        self.special_prices = {
+            (race.pk, _key(name)): special
+            for race in races
+            for special in race.special_prices.all()
+            for name in (special.name, special.label)
+        }
+        packages = RacePackage.objects.filter(race__event=event).prefetch_related(
+            Prefetch("packageoption_set", to_attr="options")
+        )
+        self.packages = {(p.race_id, _key(p.name)): p for p in packages}
+        self.pickup_points = {_key(p.name): p for p in event.pickup_points.all()}
+        self.roles = {
+            race.pk: {_key(role.name): role for role in race.race_type.roles.all()}
+            for race in races
+        }
+
+
+def _build_athlete(values, lookups, option_columns) -> Athlete:
+    """Turn a row into an unsaved athlete, or raise ValidationError."""
+    race = lookups.races.get(_key(values.get("race_name")))
+    if race is None:
+        raise ValidationError(f"Unknown race '{_text(values.get('race_name'))}'.")
+    package = lookups.packages.get((race.pk, _key(values.get("package_name"))))
+    if package is None:
+        raise ValidationError(
+            f"Unknown package '{_text(values.get('package_name'))}' "
+            f"for race '{race.name}'."
+        )
+
+    athlete = Athlete(
+        race=race,
+        package=package,
+        dob=_parse_dob(values.get("dob")),
+        **{name: _text(values.get(name)) for name in FIELD_COLUMNS},
+    )
+    athlete.sex = athlete.sex.capitalize()
+
+    for column, mapping, attr in (
+        ("pickup_point", lookups.pickup_points, "pickup_point"),
+        ("role", lookups.roles[race.pk], "role"),
+    ):
+        if _key(values.get(column)):
+            related = mapping.get(_key(values.get(column)))
+            if related is None:
+                raise ValidationError(f"Unknown {column} '{_text(values[column])}'.")
+            setattr(athlete, attr, related)
+    if _key(values.get("special_price")):
+        special = lookups.special_prices.get((race.pk, _key(values["special_price"])))
+        if special is None:
+            raise ValidationError(
+                f"Unknown special price '{_text(values['special_price'])}'."
+            )
+        athlete.special_price = special
+
+    athlete.selected_options = {
+        name: [v.strip() for v in _text(values[name]).split(",") if v.strip()]
+        for name in option_columns
+        if name in {option.name for option in package.options}
+    }
+
+    # Same rules as Athlete.clean(), against the preloaded rows
+    athlete.clean_fields(exclude=FOREIGN_KEYS)
+    Athlete.validate_selected_options(athlete.selected_options, package.options)
+    if lookups.roles[race.pk]:
+        Athlete.validate_role(athlete.role_id, lookups.roles[race.pk].values())
+    return athlete
+
+
+def _messages(error: ValidationError) -> str:
+    if hasattr(error, "error_dict"):
+        return "; ".join(
+            f"{name}: {' '.join(messages)}"
+            for name, messages in error.message_dict.items()
+        )
+    return " ".join(error.messages)
+
+
+def import_team(file, event) -> TeamImportResult:
+    """Register the athletes of an Excel sheet as one registration of ``event``.
+
+    The first row holds the column names: ``race_name`` and
+    ``package_name``, the athlete fields (``first_name``, ``last_name``,
+    ``email``, ``phone``, ``sex``, ``hometown``, optionally ``dob``,
+    ``fathers_name`` and ``team``), optionally ``pickup_point``, ``role``
+    and ``special_price`` (by name), and one column per package option with
+    comma-separated values.
+
+    Returns:
+        TeamImportResult: The new registration and athletes, or the errors.
+    """
+    result = TeamImportResult()
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_text(cell) for cell in next(rows, ())]
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            result.errors.append(
+                TeamRowError(None, f"Missing columns: {', '.join(missing)}.")
+            )
+            return result
+
+        known = {*FIELD_COLUMNS, *REFERENCE_COLUMNS, "dob"}
+        option_columns = [name for name in header if name and name not in known]
+        lookups = _Lookups(event)
+
+        for number, cells in enumerate(rows, start=2):
+            if not any(_text(cell) for cell in cells):
+                continue  # Blank line
+            values = dict(zip(header, cells, strict=False))
+            try:
+                result.athletes.append(_build_athlete(values, lookups, option_columns))
+            except ValidationError as e:
+                result.errors.append(TeamRowError(number, _messages(e)))
+    finally:
+        workbook.close()
+
+    if not result.athletes and not result.errors:
+        result.errors.append(TeamRowError(None, "The sheet has no athletes."))
+    if result.errors:
+        result.athletes = []
+        return result
+
+    try:
+        with transaction.atomic():
+            result.registration = Registration.objects.create(
+                event=event, total_amount=sum(price_athletes(result.athletes), ZERO)
+            )
+            reserve_seats_by_race(
+                result.registration, Counter(a.race for a in result.athletes)
+            )
+            for athlete in result.athletes:
+                athlete.registration = result.registration
+                athlete.search_text = athlete_search_text(athlete)
+            Athlete.objects.bulk_create(result.athletes, batch_size=BATCH_SIZE)
+            index_athletes(result.athletes)
+            add_registration(result.registration)
+    except CapacityExceeded as e:
+        result.registration = None
+        result.athletes = []
+        result.errors.append(
+            TeamRowError(None, f"Not enough places left in '{e.args[0].name}'.")
+        )
+    return result
@@ -0,0 +1,142 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models.functions import Upper
+from django.utils import timezone
+
+from event.models import (
+    Athlete,
+    Event,
+    Payment,
+    Race,
+    RacePackage,
+    Registration,
+    TimeBasedPrice,
+)
+
+# Indexes added for the lookups below; --compare drops them to show the
+# plans without them.
+HOT_INDEXES = {
+    Registration: (
+        "registration_event_created_idx",
+        "registration_payment_idx",
+        "registration_paid_event_idx",
+    ),
+    Athlete: ("athlete_race_registration_idx",),
+    Payment: (
+        "payment_order_code_idx",
+        "payment_transaction_idx",
+        "payment_transaction_upper_idx",
+    ),
+    TimeBasedPrice: ("time_price_window_idx",),
+    RacePackage: ("package_race_visible_idx",),
+}
+
+
+def hot_queries(event, race):
+    """Return ``{name: queryset}`` of the lookups the indexes serve."""
+    now = timezone.now()
+    payment = Payment.objects.order_by("-pk").first()
+    transaction_id = payment.transaction_id if payment else "missing"
+    order_code = payment.order_code if payment else "missing"
+    return {
+        "dashboard registrations": Registration.objects.filter(event=event).order_by(
+            "-created_at"
+        )[:50],
+        "paid registrations": Registration.objects.filter(
+            event=event, payment_status="paid"
+        ).order_by(),
+        "unpaid registrations": Registration.objects.filter(
+            payment_status="not_paid"
+        ).order_by(),
+        "paid athletes of race": Athlete.objects.filter(
+            race=race, registration__payment_status="paid"
+        ).order_by(),
+        "payment by transaction id": Payment.objects.alias(
+            transaction_upper=Upper("transaction_id")
+        ).filter(transaction_upper=transaction_id.upper()),
+        "payment by order code": Payment.objects.filter(order_code=order_code),
+        "current time windows": TimeBasedPrice.objects.filter(
+            race=race, start_date__lte=now, end_date__gte=now
+        ),
+        "visible packages": race.get_visible_packages(),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plans and timings of the hot lookups "
+        "(with --compare, also without the supporting indexes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--event", type=int, help="Event ID (default: busiest).")
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs timed per query."
+        )
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Also run every query with the indexes dropped (rolled back).",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options["event"]:
+            events = events.filter(pk=options["event"])
+        event = events.order_by("-paid_athletes", "pk").first()
+        race = Race.objects.filter(event=event).order_by("-paid_athletes").first()
+        if event is None or race is None:
+            raise CommandError("No event with races to explain; seed some data.")
+
+        queries = hot_queries(event, race)
+        self.stdout.write(f"Event {event.pk}, race {race.pk} on {connection.vendor}")
+
+        if options["compare"]:
+            drop_sql, missing = self._drop_index_sql()
+            for name in missing:
+                self.stdout.write(self.style.WARNING(f"Index {name} is not in the DB."))
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for sql in drop_sql:
+                        cursor.execute(sql)
+                self._report("without indexes", queries, options["repeat"])
+                transaction.set_rollback(True)
+
+        self._report("with indexes", queries, options["repeat"])
+
+    def _drop_index_sql(self):
+        """Return the DROP INDEX statements of the hot indexes in the DB."""
+        missing = []
+        with connection.cursor() as cursor:
+            existing = {
+                model: connection.introspection.get_constraints(
+                    cursor, model._meta.db_table
+                )
+                for model in HOT_INDEXES
+            }
+        with connection.schema_editor(collect_sql=True) as editor:
+            for model, names in HOT_INDEXES.items():
+                for index in model._meta.indexes:
+                    if index.name not in names:
+                        continue
+                    if index.name in existing[model]:
+                        editor.remove_index(model, index)
+                    else:
+                        missing.append(index.name)
+        return editor.collected_sql, missing
+
+    def _report(self, title, queries, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {title} ==="))
+        for name, queryset in queries.items():
+            timings = []
+            for _ in range(max(repeat, 1)):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                self.style.SUCCESS(f"\n{name}: {statistics.median(timings):.2f} ms")
+            )
+            self.stdout.write(queryset.explain())
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from event.payments.webhooks import process_webhook_events
+
+
+class Command(BaseCommand):
+    help = "Apply stored webhook notifications that were not applied yet."
+
+    def handle(self, *args, **kwargs):
+        applied = process_webhook_events()
+        self.stdout.write(self.style.SUCCESS(f"✅ Applied {applied} webhook event(s)."))
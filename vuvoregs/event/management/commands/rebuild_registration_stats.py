@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from event.models import Event
+from event.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily registration rollups read by the dashboards."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="Only rebuild this event ID (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        events = None
+        if options["events"]:
+            events = list(Event.objects.filter(pk__in=options["events"]))
+
+        rows = rebuild(events)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Rebuilt {rows} daily registration stats row(s).")
+        )
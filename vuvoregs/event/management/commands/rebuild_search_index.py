@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from event.models import Event
+from event.search import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the athlete search documents and rebuild the search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="Only rebuild the athletes of this event ID (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        events = None
+        if options["events"]:
+            events = list(Event.objects.filter(pk__in=options["events"]))
+
+        updated = rebuild(events)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Updated {updated} search document(s) and rebuilt the index."
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from event.capacity import recount, recount_paid_athletes
+from event.models import Event
+
+
+class Command(BaseCommand):
+    help = "Rebuild paid-athlete and seat capacity counters from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            dest="events",
+            help="Only recount this event ID (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options["events"]:
+            events = events.filter(pk__in=options["events"])
+        events = list(events)
+
+        recount_paid_athletes(events)
+        for event in events:
+            recount(event)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Recounted counters for {len(events)} event(s).")
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from event.capacity import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "Release seat holds whose checkout has expired."
+
+    def handle(self, *args, **kwargs):
+        released = release_expired_holds()
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Released {released} expired hold(s).")
+        )
@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from event.benchmarks import BASELINE_PATH, SCENARIOS, compare, load, run_suite, save
+from event.benchmarks.runner import DEFAULT_SIZES
+from event.search import ensure_index
+
+
+class _DisableMigrations:
+    """Build the test schema from the models (the migrations lag behind)."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the registration, payment and dashboard views on seeded test "
+        "databases and fail if they regress against the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=list(DEFAULT_SIZES),
+            help="Athletes per race to seed, one run per size.",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=5, help="Runs per scenario (default 5)."
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=[scenario.name for scenario in SCENARIOS],
+            help="Only run this scenario (can be repeated).",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark-results.json",
+            help="Where to write the results (JSON).",
+        )
+        parser.add_argument(
+            "--baseline", default=str(BASELINE_PATH), help="Results to compare with."
+        )
+        parser.add_argument(
+            "--check-latency",
+            action="store_true",
+            help="Also fail on slower requests (only meaningful on the machine "
+            "that recorded the baseline).",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=1.0,
+            help="Allowed latency growth with --check-latency, e.g. 1.0 for +100%%.",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Store these results as the new baseline.",
+        )
+
+    def handle(self, *args, **options):
+        settings.MIGRATION_MODULES = _DisableMigrations()
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        # Built without migrations, so without the search index migration
+        ensure_index()
+        try:
+            results = run_suite(
+                options["sizes"],
+                options["repeat"],
+                options["scenarios"],
+                log=self._log,
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        save(results, options["output"])
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options["update_baseline"]:
+            save(results, options["baseline"])
+            self.stdout.write(self.style.SUCCESS("✅ Baseline updated."))
+            return
+
+        try:
+            baseline = load(options["baseline"])
+        except FileNotFoundError:
+            self.stdout.write(self.style.WARNING("No baseline to compare with."))
+            return
+
+        regressions = compare(
+            results,
+            baseline,
+            tolerance=options["tolerance"],
+            latency=options["check_latency"],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(self.style.ERROR(f"❌ {regression}"))
+            raise CommandError(f"{len(regressions)} benchmark regression(s).")
+        self.stdout.write(self.style.SUCCESS("✅ No regressions against the baseline."))
+
+    def _log(self, size, name, result):
+        self.stdout.write(
+            f"[{size}] {name}: {result['median_ms']:.2f} ms, "
+            f"{result['queries']} queries"
+        )
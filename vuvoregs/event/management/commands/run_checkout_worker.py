@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from event.payments.checkout_queue import process_pending
+
+
+class Command(BaseCommand):
+    help = "Create queued Viva Smart Checkout orders (ASYNC_CHECKOUT worker)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.5,
+            help="Seconds to wait between polls of an empty queue.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("⏳ Checkout worker started.")
+        while True:
+            processed = process_pending()
+            if processed:
+                self.stdout.write(f"✅ Created {processed} checkout order(s).")
+            if options["once"]:
+                break
+            if not processed:
+                time.sleep(options["sleep"])
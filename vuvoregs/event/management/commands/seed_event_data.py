@@ -1,10 +1,16 @@
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from decimal import Decimal
 import json
 import random
+import uuid
 
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.signals import post_delete, pre_delete
 from django.utils.timezone import make_aware, now
 from faker import Faker
 
@@ -23,10 +29,43 @@ from event.models import (
     TermsAndConditions,
     TimeBasedPrice,
 )
+from event.pricing import load_price_tables, price_athletes
+from event.pricing.engine import ZERO
+from event.search import athlete_search_text, index_athletes
+from event.signals import athlete_deleted, registration_deleted
+from payments import PaymentStatus
+
+# Faker is slow per call; rows draw from pools generated once per run.
+POOL_SIZE = 500
+OPTION_VALUES = ["XS", "S", "M", "L", "XL"]
+
+
+# Per-row delete handlers (seats, paid counters, rollups, search index).
+# The clear deletes every row and rebuilds all of those afterwards.
+CLEAR_MUTED_RECEIVERS = [
+    (pre_delete, registration_deleted, Registration),
+    (post_delete, athlete_deleted, Athlete),
+]
+
+
+@contextmanager
+def _without_delete_receivers():
+    """Disconnect the per-row delete handlers, so Django deletes in bulk."""
+    for signal, receiver, sender in CLEAR_MUTED_RECEIVERS:
+        signal.disconnect(receiver, sender=sender)
+    try:
+        yield
+    finally:
+        for signal, receiver, sender in CLEAR_MUTED_RECEIVERS:
+            signal.connect(receiver, sender=sender)
 
 
 class Command(BaseCommand):
-    help = "Seed events, races, packages, and athletes with realistic data."
+    help = (
+        "Seed events, races, packages, registrations, athletes and payments. "
+        "Rows are written with bulk_create in batches, so millions of athletes "
+        "can be generated; the same --seed gives the same data."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -34,12 +73,50 @@ class Command(BaseCommand):
             action="store_true",
             help="Seed only 1 event and 5 athletes per race.",
         )
+        parser.add_argument(
+            "--events", type=int, default=3, help="Number of events (default 3)."
+        )
+        parser.add_argument(
+            "--athletes-per-race",
+            type=int,
+            default=30,
+            help="Athletes registered in every race (default 30).",
+        )
+        parser.add_argument(
+            "--paid-ratio",
+            type=float,
+            default=0.8,
+            help="Share of registrations that are paid, 0 to 1 (default 0.8).",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Random seed (default 0)."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Athletes written per bulk_create (default 2000).",
+        )
 
     def handle(self, *args, **options):
-        debug = options["debug"]
-        fake = Faker()
+        if not 0 <= options["paid_ratio"] <= 1:
+            raise CommandError("--paid-ratio must be between 0 and 1.")
+        event_count = 1 if options["debug"] else options["events"]
+        per_race = 5 if options["debug"] else options["athletes_per_race"]
+        # Separate streams, so the catalogue does not depend on the volume
+        self.catalogue_rng = random.Random(options["seed"])
+        self.rng = random.Random(f"{options['seed']}-rows")
+        self.fake = Faker()
+        self.fake.seed_instance(options["seed"])
+        self.paid_ratio = options["paid_ratio"]
+        self.batch_size = max(options["batch_size"], 1)
         User = get_user_model()
 
+        staff_users = list(User.objects.filter(is_staff=True).order_by("pk"))
+        if not staff_users:
+            self.stdout.write(self.style.ERROR("❌ No staff users found."))
+            return
+
         self.stdout.write(self.style.WARNING("🧹 Clearing existing data..."))
         models_to_clear = [
             Athlete,
@@ -54,8 +131,10 @@ class Command(BaseCommand):
             RaceSpecialPrice,
             TimeBasedPrice,
         ]
-        for model in models_to_clear:
-            model.objects.all().delete()
+        with transaction.atomic(), _without_delete_receivers():
+            for model in models_to_clear:
+                model.objects.all().delete()
+        call_command("rebuild_search_index", stdout=self.stdout)
 
         # Create default race types & roles
         if RaceType.objects.count() == 0:
@@ -65,168 +144,254 @@ class Command(BaseCommand):
             rt = RaceType.objects.create(name="Duathlon", min_participants=2)
             rt.roles.set([runner, cyclist])
 
-        staff_users = User.objects.filter(is_staff=True)
-        if not staff_users.exists():
-            self.stdout.write(self.style.ERROR("❌ No staff users found."))
-            return
+        self.first_names = [self.fake.first_name() for _ in range(POOL_SIZE)]
+        self.last_names = [self.fake.last_name() for _ in range(POOL_SIZE)]
+        self.cities = [self.fake.city() for _ in range(POOL_SIZE // 5)]
+        self.clubs = [
+            self.fake.word().capitalize() + " Club" for _ in range(POOL_SIZE // 5)
+        ]
+        self.athlete_number = 0
 
-        event_count = 1 if debug else random.randint(2, 5)
-
-        for _ in range(event_count):
-            organizer = random.choice(staff_users)
-            event = Event.objects.create(
-                name=f"{fake.city()} Run {datetime.now().year}",
-                location=fake.city(),
-                date=fake.date_between(start_date="+10d", end_date="+60d"),
-                organizer=organizer,
-                is_available=True,
-                registration_start_date=make_aware(datetime.now() - timedelta(days=60)),
-                registration_end_date=make_aware(datetime.now() + timedelta(days=60)),
+        total = 0
+        for number in range(event_count):
+            with transaction.atomic():
+                event, races = self._create_event(staff_users)
+                for race in races:
+                    total += self._seed_race(event, race, per_race)
+            self.stdout.write(
+                f"Event {number + 1}/{event_count}: {event.name} ({total} athletes)"
             )
 
-            TermsAndConditions.objects.create(
-                event=event, content="Standard race terms apply.", version="1.0"
-            )
+        # Registrations were bulk-created; sync the counters and rollups
+        call_command("recount", stdout=self.stdout)
+        call_command("rebuild_registration_stats", stdout=self.stdout)
 
-            pickup_points = [
-                PickUpPoint.objects.create(
-                    event=event,
-                    name=fake.company(),
-                    address=fake.address(),
-                    working_hours="Mon–Fri 9am–5pm",
-                )
-                for _ in range(random.randint(2, 4))
-            ]
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Dummy data successfully created: {total} athletes.")
+        )
 
-            races = []
-            for _ in range(random.randint(2, 5)):
-                race_type = random.choice(RaceType.objects.all())
-                race = Race.objects.create(
-                    event=event,
-                    name=f"{fake.word().capitalize()} Dash",
-                    race_type=race_type,
-                    race_km=random.choice([5.0, 10.0, 21.1]),
-                    base_price_individual=random.randint(20, 40),
-                    base_price_team=random.randint(15, 30),
-                    team_discount_threshold=random.choice([None, 3, 5]),
-                )
-                races.append(race)
+    def _create_event(self, staff_users):
+        """Create an event with its races, prices and packages."""
+        rng, fake = self.catalogue_rng, self.fake
+        event = Event.objects.create(
+            name=f"{fake.city()} Run {datetime.now().year}",
+            location=fake.city(),
+            date=fake.date_between(start_date="+10d", end_date="+60d"),
+            organizer=rng.choice(staff_users),
+            is_available=True,
+            registration_start_date=make_aware(datetime.now() - timedelta(days=60)),
+            registration_end_date=make_aware(datetime.now() + timedelta(days=60)),
+        )
 
-                # Time-based prices
-                start = now()
-                TimeBasedPrice.objects.create(
+        TermsAndConditions.objects.create(
+            event=event, content="Standard race terms apply.", version="1.0"
+        )
+
+        for _ in range(rng.randint(2, 4)):
+            PickUpPoint.objects.create(
+                event=event,
+                name=fake.company(),
+                address=fake.address(),
+                working_hours="Mon–Fri 9am–5pm",
+            )
+
+        race_types = list(RaceType.objects.order_by("pk"))
+        start = now()
+        for _ in range(rng.randint(2, 5)):
+            race = Race.objects.create(
+                event=event,
+                name=f"{fake.word().capitalize()} Dash",
+                race_type=rng.choice(race_types),
+                race_km=rng.choice([5.0, 10.0, 21.1]),
+                base_price_individual=rng.randint(20, 40),
+                base_price_team=rng.randint(15, 30),
+                team_discount_threshold=rng.choice([None, 3, 5]),
+            )
+
+            # Time-based prices: past, current and upcoming windows
+            TimeBasedPrice.objects.bulk_create([
+                TimeBasedPrice(
+                    race=race,
+                    label="Super Early Bird",
+                    start_date=start - timedelta(days=60),
+                    end_date=start - timedelta(days=10),
+                    price_adjustment=Decimal("-10.00"),
+                ),
+                TimeBasedPrice(
                     race=race,
                     label="Early Bird",
                     start_date=start - timedelta(days=10),
                     end_date=start + timedelta(days=10),
                     price_adjustment=Decimal("-5.00"),
-                )
-                TimeBasedPrice.objects.create(
+                ),
+                TimeBasedPrice(
                     race=race,
                     label="Late Fee",
                     start_date=start + timedelta(days=30),
                     end_date=start + timedelta(days=90),
                     price_adjustment=Decimal("5.00"),
-                )
+                ),
+            ])
 
-                # Special prices
-                for _ in range(1):
-                    RaceSpecialPrice.objects.create(
-                        race=race,
-                        name=fake.word().capitalize() + " Discount",
-                        label="Local Citizen",
-                        description="Discount for residents or students",
-                        discount_amount=random.choice([5, 10]),
-                    )
+            # Special prices
+            RaceSpecialPrice.objects.create(
+                race=race,
+                name=fake.word().capitalize() + " Discount",
+                label="Local Citizen",
+                description="Discount for residents or students",
+                discount_amount=rng.choice([5, 10]),
+            )
 
-                # Packages
-                for _ in range(random.randint(1, 3)):
-                    pkg = RacePackage.objects.create(
-                        event=event,
-                        race=race,
-                        name=fake.color_name() + " Package",
-                        description="Includes bib and chip",
-                        price_adjustment=random.choice([0, 5, 10]),
+            # Packages
+            for number in range(rng.randint(1, 3)):
+                pkg = RacePackage.objects.create(
+                    event=event,
+                    race=race,
+                    name=f"{fake.color_name()} Package {number + 1}",
+                    description="Includes bib and chip",
+                    price_adjustment=rng.choice([0, 5, 10]),
+                )
+                PackageOption.objects.bulk_create([
+                    PackageOption(
+                        package=pkg,
+                        name=f"{fake.word().capitalize()} Option {option + 1}",
+                        options_string=", ".join(OPTION_VALUES),
+                        options_json=OPTION_VALUES,
                     )
+                    for option in range(rng.randint(1, 2))
+                ])
 
-                    for _ in range(random.randint(1, 2)):
-                        options = ["XS", "S", "M", "L", "XL"]
-                        option = PackageOption.objects.create(
-                            package=pkg,
-                            name=fake.word().capitalize() + " Option",
-                            options_string=", ".join(options),
+        races = load_price_tables(
+            Race.objects.filter(event=event)
+            .order_by("pk")
+            .select_related("race_type")
+            .prefetch_related(
+                "race_type__roles",
+                Prefetch(
+                    "packages",
+                    queryset=RacePackage.objects.order_by("pk").prefetch_related(
+                        Prefetch(
+                            "packageoption_set",
+                            queryset=PackageOption.objects.order_by("pk"),
                         )
-                        option.set_options_from_string(option.options_string)
-
-            # Registration & athletes
-            for race in races:
-                num_athletes = 5 if debug else random.randint(20, 40)
-                created = 0
-                while created < num_athletes:
-                    reg = Registration.objects.create(
-                        event=event,
-                        status="completed",
-                        payment_status="paid",
-                        agreed_to_terms=event.terms,
-                        agrees_to_terms=True,
-                        created_at=make_aware(
-                            fake.date_time_between(start_date="-60d", end_date="now")
-                        ),
-                    )
+                    ),
+                ),
+            )
+        )
+        return event, races
 
-                    n = min(random.randint(1, 4), num_athletes - created)
-                    for _ in range(n):
-                        valid_packages = race.packages.all()
-                        if not valid_packages.exists():
-                            continue
-                        pkg = random.choice(valid_packages)
-                        options = {
-                            opt.name: [random.choice(opt.options_json)]
-                            for opt in pkg.packageoption_set.all()
-                            if opt.options_json
-                        }
-
-                        role = None
-                        if race.requires_roles():
-                            allowed = race.get_allowed_roles()
-                            role = random.choice(list(allowed)) if allowed else None
-
-                        special_price = (
-                            random.choice(list(race.special_prices.all()))
-                            if race.special_prices.exists() and random.random() < 0.4
-                            else None
-                        )
+    def _seed_race(self, event, race, count) -> int:
+        """Register ``count`` athletes in a race, in bulk batches."""
+        rng = self.rng
+        terms = event.terms
+        pickup_points = list(event.pickup_points.order_by("pk"))
+        packages = list(race.packages.all())
+        roles = list(race.race_type.roles.all())
+        special_prices = list(race.special_prices.all())
+        registration_start = event.registration_start_date
 
-                        Athlete.objects.create(
-                            registration=reg,
-                            race=race,
-                            package=pkg,
-                            pickup_point=random.choice(pickup_points),
-                            first_name=fake.first_name(),
-                            last_name=fake.last_name(),
-                            team=fake.word().capitalize() + " Club",
-                            email=fake.unique.email(),
-                            phone=fake.phone_number(),
-                            sex=random.choice(["Male", "Female"]),
-                            dob=fake.date_of_birth(minimum_age=16, maximum_age=55),
-                            hometown=fake.city(),
-                            selected_options=options,
-                            role=role,
-                            special_price=special_price,
-                        )
+        created = 0
+        while created < count:
+            batch = []  # (registration, athletes, created_at)
+            size = 0
+            while created < count and size < self.batch_size:
+                n = min(rng.randint(1, 4), count - created)
+                paid = rng.random() < self.paid_ratio
+                athletes = [
+                    self._athlete(race, packages, pickup_points, roles, special_prices)
+                    for _ in range(n)
+                ]
+                registration = Registration(
+                    event=event,
+                    status="completed" if paid else "pending",
+                    payment_status="paid" if paid else "not_paid",
+                    agreed_to_terms=terms if paid else None,
+                    agrees_to_terms=paid,
+                    total_amount=sum(price_athletes(athletes), ZERO),
+                )
+                created_at = registration_start + timedelta(
+                    seconds=rng.randrange(60 * 24 * 3600)
+                )
+                batch.append((registration, athletes, created_at))
+                created += n
+                size += n
+            self._write_batch(batch)
+        return created
 
-                    reg.update_total_amount()
-                    Payment.objects.create(
-                        variant="dummy",
-                        total=Decimal(reg.total_amount),
-                        currency="EUR",
-                        description=f"Reg #{reg.id}",
-                        billing_email=reg.athletes.first().email,
-                        status="confirmed",
-                        captured_amount=Decimal("0.00"),
-                        extra_data=json.dumps({"registration_id": reg.id}),
-                    )
+    def _athlete(self, race, packages, pickup_points, roles, special_prices):
+        """Return an unsaved athlete with random details and options."""
+        rng = self.rng
+        self.athlete_number += 1
+        first_name = rng.choice(self.first_names)
+        last_name = rng.choice(self.last_names)
+        package = rng.choice(packages)
+        return Athlete(
+            race=race,
+            package=package,
+            pickup_point=rng.choice(pickup_points) if pickup_points else None,
+            first_name=first_name,
+            last_name=last_name,
+            team=rng.choice(self.clubs),
+            email=f"{first_name}.{last_name}.{self.athlete_number}@example.com".lower(),
+            phone=f"69{rng.randrange(10**8):08d}",
+            sex=rng.choice(["Male", "Female"]),
+            dob=datetime(1970, 1, 1).date() + timedelta(days=rng.randrange(14000)),
+            hometown=rng.choice(self.cities),
+            selected_options={
+                option.name: [rng.choice(option.options_json)]
+                for option in package.packageoption_set.all()
+                if option.options_json
+            },
+            role=rng.choice(roles) if roles else None,
+            special_price=(
+                rng.choice(special_prices)
+                if special_prices and rng.random() < 0.4
+                else None
+            ),
+        )
+
+    def _write_batch(self, batch):
+        """Write registrations, then their athletes and payments."""
+        rng = self.rng
+        registrations = [registration for registration, _, _ in batch]
+        Registration.objects.bulk_create(registrations)
 
-                    created += n
+        athletes = []
+        for registration, members, _ in batch:
+            for athlete in members:
+                athlete.registration = registration
+                athlete.search_text = athlete_search_text(athlete)
+            athletes.extend(members)
+        Athlete.objects.bulk_create(athletes)
+        index_athletes(athletes)
+
+        payments = [
+            Payment(
+                variant="dummy",
+                total=registration.total_amount,
+                currency="EUR",
+                description=f"Reg #{registration.id}",
+                billing_email=members[0].email,
+                status=(
+                    PaymentStatus.CONFIRMED
+                    if registration.payment_status == "paid"
+                    else PaymentStatus.WAITING
+                ),
+                captured_amount=(
+                    registration.total_amount
+                    if registration.payment_status == "paid"
+                    else Decimal("0.00")
+                ),
+                extra_data=json.dumps({"registration_id": registration.id}),
+                transaction_id=str(uuid.UUID(int=rng.getrandbits(128))),
+                order_code=str(rng.randrange(10**15, 10**16)),
+            )
+            for registration, members, _ in batch
+        ]
+        Payment.objects.bulk_create(payments)
 
-        self.stdout.write(self.style.SUCCESS("✅ Dummy data successfully created."))
+        # bulk_create stamped created_at with now (auto_now_add); backdate it
+        for (registration, _, created_at), payment in zip(batch, payments, strict=True):
+            registration.payment = payment
+            registration.created_at = created_at
+        Registration.objects.bulk_update(registrations, ["payment", "created_at"])
@@ -0,0 +1,587 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0033_alter_athlete_bib_number_alter_athlete_team_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RaceRole',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='Name')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RaceSpecialPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Name of the special price, e.g., 'Domestic Citizen'", max_length=255, verbose_name='Internal Name')),
+                ('label', models.CharField(max_length=255, verbose_name='Display Label')),
+                ('description', models.TextField(blank=True, help_text='Description of the special price, if applicable.', verbose_name='Description')),
+                ('discount_amount', models.DecimalField(decimal_places=2, help_text='Discount subtracted from base race price', max_digits=10, verbose_name='Discount Amount')),
+                ('document', models.FileField(blank=True, help_text='Optional declaration form athletes must show.', null=True, upload_to='special_price_docs/')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TimeBasedPrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=255, verbose_name='Label')),
+                ('start_date', models.DateTimeField(verbose_name='Start Date')),
+                ('end_date', models.DateTimeField(verbose_name='End Date')),
+                ('price_adjustment', models.DecimalField(decimal_places=2, help_text='Adjustment to apply during this time window. Can be negative (discount) or positive (surcharge).', max_digits=10, verbose_name='Price Adjustment')),
+            ],
+            options={
+                'verbose_name': 'Time-Based Price',
+                'verbose_name_plural': 'Time-Based Prices',
+                'ordering': ['start_date'],
+            },
+        ),
+        migrations.RemoveField(
+            model_name='packagespecialprice',
+            name='event',
+        ),
+        migrations.RemoveField(
+            model_name='packagespecialprice',
+            name='package',
+        ),
+        migrations.RemoveField(
+            model_name='packagespecialprice',
+            name='race',
+        ),
+        migrations.RemoveField(
+            model_name='athlete',
+            name='special_price_option',
+        ),
+        migrations.AlterModelOptions(
+            name='athlete',
+            options={'ordering': ['-registration__created_at'], 'verbose_name': 'Athlete', 'verbose_name_plural': 'Athletes'},
+        ),
+        migrations.RemoveConstraint(
+            model_name='racepackage',
+            name='unique_package_per_event',
+        ),
+        migrations.RemoveField(
+            model_name='athlete',
+            name='agreed_to_terms',
+        ),
+        migrations.RemoveField(
+            model_name='athlete',
+            name='agrees_to_terms',
+        ),
+        migrations.RemoveField(
+            model_name='race',
+            name='min_participants',
+        ),
+        migrations.RemoveField(
+            model_name='racepackage',
+            name='price',
+        ),
+        migrations.RemoveField(
+            model_name='racepackage',
+            name='races',
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='fathers_name',
+            field=models.CharField(blank=True, max_length=100, verbose_name="Father's Name"),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='hometown_el',
+            field=models.CharField(max_length=100, null=True, verbose_name='Hometown'),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='hometown_en',
+            field=models.CharField(max_length=100, null=True, verbose_name='Hometown'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='description_el',
+            field=models.TextField(blank=True, null=True, verbose_name='Description'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='description_en',
+            field=models.TextField(blank=True, null=True, verbose_name='Description'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='email',
+            field=models.EmailField(blank=True, help_text='Email address for event-related inquiries.', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='location_el',
+            field=models.CharField(max_length=255, null=True, verbose_name='Location'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='location_en',
+            field=models.CharField(max_length=255, null=True, verbose_name='Location'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='name_el',
+            field=models.CharField(max_length=255, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='name_en',
+            field=models.CharField(max_length=255, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='parental_declaration',
+            field=models.FileField(blank=True, help_text='Optional parental consent form required for minors.', null=True, upload_to='static/parental_declarations/', verbose_name='Parental Declaration Form'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='pickup_date',
+            field=models.DateField(blank=True, null=True, verbose_name='Pick Up Date'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='order_code',
+            field=models.CharField(blank=True, default='', help_text='Optional external order reference or code.', max_length=50, verbose_name='Order Code'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='base_price_individual',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Base price for individual registrations.', max_digits=10, verbose_name='Individual Base Price'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='base_price_team',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Base price per athlete for team registrations.', max_digits=10, verbose_name='Team Base Price'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='images/event_images/race_images', verbose_name='Image'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='name_el',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='name_en',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='pickup_date',
+            field=models.DateField(blank=True, help_text='Optional override for this specific race.', null=True, verbose_name='Pickup Date'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='team_discount_threshold',
+            field=models.PositiveIntegerField(blank=True, help_text='Minimum number of athletes for team pricing to apply.', null=True, verbose_name='Team Discount Threshold'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='description_el',
+            field=models.TextField(null=True, verbose_name='Description'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='description_en',
+            field=models.TextField(null=True, verbose_name='Description'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='name_el',
+            field=models.CharField(max_length=255, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='name_en',
+            field=models.CharField(max_length=255, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='price_adjustment',
+            field=models.DecimalField(decimal_places=2, default=0.0, help_text='Adjustment applied to race base price', max_digits=10, verbose_name='Price Adjustment'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='race',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='packages', to='event.race', verbose_name='Race'),
+        ),
+        migrations.AddField(
+            model_name='racepackage',
+            name='visible_until',
+            field=models.DateTimeField(blank=True, help_text='Package will be hidden after this datetime. Leave blank to always show.', null=True, verbose_name='Visible Until'),
+        ),
+        migrations.AddField(
+            model_name='racetype',
+            name='description_el',
+            field=models.TextField(blank=True, null=True, verbose_name='Description'),
+        ),
+        migrations.AddField(
+            model_name='racetype',
+            name='description_en',
+            field=models.TextField(blank=True, null=True, verbose_name='Description'),
+        ),
+        migrations.AddField(
+            model_name='racetype',
+            name='min_participants',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='racetype',
+            name='name_el',
+            field=models.CharField(max_length=50, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='racetype',
+            name='name_en',
+            field=models.CharField(max_length=50, null=True, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='registration',
+            name='agreed_to_terms',
+            field=models.ForeignKey(blank=True, help_text='Specific terms document agreed to by the user.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='event.termsandconditions', verbose_name='Agreed Terms Version'),
+        ),
+        migrations.AddField(
+            model_name='registration',
+            name='agrees_to_terms',
+            field=models.BooleanField(default=False, help_text='Indicates whether user actively agreed to the terms.', verbose_name='Agrees to Terms'),
+        ),
+        migrations.AddField(
+            model_name='termsandconditions',
+            name='content_el',
+            field=models.TextField(help_text='You can use basic HTML or markdown for formatting.', null=True, verbose_name='Content'),
+        ),
+        migrations.AddField(
+            model_name='termsandconditions',
+            name='content_en',
+            field=models.TextField(help_text='You can use basic HTML or markdown for formatting.', null=True, verbose_name='Content'),
+        ),
+        migrations.AddField(
+            model_name='termsandconditions',
+            name='title_el',
+            field=models.CharField(default='Terms and Conditions', help_text='Title for internal/admin reference.', max_length=255, null=True, verbose_name='Title'),
+        ),
+        migrations.AddField(
+            model_name='termsandconditions',
+            name='title_en',
+            field=models.CharField(default='Terms and Conditions', help_text='Title for internal/admin reference.', max_length=255, null=True, verbose_name='Title'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='bib_number',
+            field=models.CharField(blank=True, max_length=10, verbose_name='Bib Number'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='dob',
+            field=models.DateField(blank=True, null=True, verbose_name='Date of Birth'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='email',
+            field=models.EmailField(max_length=254, verbose_name='Email'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='first_name',
+            field=models.CharField(max_length=100, verbose_name='First Name'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='hometown',
+            field=models.CharField(max_length=100, verbose_name='Hometown'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='last_name',
+            field=models.CharField(max_length=100, verbose_name='Last Name'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='package',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='event.racepackage', verbose_name='Package'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='phone',
+            field=models.CharField(max_length=20, verbose_name='Phone'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='pickup_point',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='athletes', to='event.pickuppoint', verbose_name='Pickup Point'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='race',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='event.race', verbose_name='Race'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='registration',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='athletes', to='event.registration', verbose_name='Registration'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='registration_date',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Registration Date'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='selected_options',
+            field=models.JSONField(blank=True, help_text='Package customization options selected by athlete (T-shirt size, etc).', null=True, verbose_name='Selected Options'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='sex',
+            field=models.CharField(choices=[('Male', 'Male'), ('Female', 'Female')], max_length=10, verbose_name='Sex'),
+        ),
+        migrations.AlterField(
+            model_name='athlete',
+            name='team',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Team'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='date',
+            field=models.DateField(verbose_name='Date'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='Description'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='images/event_images/', verbose_name='Image'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='is_available',
+            field=models.BooleanField(default=True, verbose_name='Is Available'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='location',
+            field=models.CharField(max_length=255, verbose_name='Location'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='max_participants',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Max Participants'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='name',
+            field=models.CharField(max_length=255, verbose_name='Name'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='registration_end_date',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Registration End Date'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='registration_start_date',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Registration Start Date'),
+        ),
+        migrations.AlterField(
+            model_name='packageoption',
+            name='name',
+            field=models.CharField(max_length=255, verbose_name='Option Name'),
+        ),
+        migrations.AlterField(
+            model_name='packageoption',
+            name='options_json',
+            field=models.JSONField(blank=True, default=list, verbose_name='Options (JSON)'),
+        ),
+        migrations.AlterField(
+            model_name='packageoption',
+            name='options_string',
+            field=models.CharField(blank=True, max_length=500, verbose_name='Options String'),
+        ),
+        migrations.AlterField(
+            model_name='packageoption',
+            name='package',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='event.racepackage', verbose_name='Package'),
+        ),
+        migrations.AlterField(
+            model_name='pickuppoint',
+            name='address',
+            field=models.TextField(verbose_name='Address'),
+        ),
+        migrations.AlterField(
+            model_name='pickuppoint',
+            name='name',
+            field=models.CharField(max_length=255, verbose_name='Name'),
+        ),
+        migrations.AlterField(
+            model_name='pickuppoint',
+            name='working_hours',
+            field=models.CharField(help_text='e.g. Mon–Fri 9am–5pm', max_length=255, verbose_name='Working Hours'),
+        ),
+        migrations.AlterField(
+            model_name='race',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='races', to='event.event', verbose_name='Event'),
+        ),
+        migrations.AlterField(
+            model_name='race',
+            name='max_participants',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Max Participants'),
+        ),
+        migrations.AlterField(
+            model_name='race',
+            name='name',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Name'),
+        ),
+        migrations.AlterField(
+            model_name='race',
+            name='race_km',
+            field=models.DecimalField(decimal_places=2, max_digits=5, verbose_name='Distance (km)'),
+        ),
+        migrations.AlterField(
+            model_name='race',
+            name='race_type',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='races', to='event.racetype', verbose_name='Race Type'),
+        ),
+        migrations.AlterField(
+            model_name='racepackage',
+            name='description',
+            field=models.TextField(verbose_name='Description'),
+        ),
+        migrations.AlterField(
+            model_name='racepackage',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='packages', to='event.event', verbose_name='Event'),
+        ),
+        migrations.AlterField(
+            model_name='racepackage',
+            name='name',
+            field=models.CharField(max_length=255, verbose_name='Name'),
+        ),
+        migrations.AlterField(
+            model_name='racetype',
+            name='description',
+            field=models.TextField(blank=True, verbose_name='Description'),
+        ),
+        migrations.AlterField(
+            model_name='racetype',
+            name='name',
+            field=models.CharField(max_length=50, verbose_name='Name'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='registrations', to='event.event', verbose_name='Event'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='payment',
+            field=models.OneToOneField(blank=True, help_text='Optional link to payment object (Viva, Stripe, etc).', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='registration', to='event.payment', verbose_name='Payment'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='payment_status',
+            field=models.CharField(choices=[('not_paid', 'Not Paid'), ('paid', 'Paid'), ('failed', 'Payment Failed')], default='not_paid', help_text='Payment status (paid, not paid, failed).', max_length=20, verbose_name='Payment Status'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', help_text='Current processing status of the registration.', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='total_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Total amount due for this registration.', max_digits=10, verbose_name='Total Amount'),
+        ),
+        migrations.AlterField(
+            model_name='registration',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Updated At'),
+        ),
+        migrations.AlterField(
+            model_name='termsandconditions',
+            name='content',
+            field=models.TextField(help_text='You can use basic HTML or markdown for formatting.', verbose_name='Content'),
+        ),
+        migrations.AlterField(
+            model_name='termsandconditions',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Created At'),
+        ),
+        migrations.AlterField(
+            model_name='termsandconditions',
+            name='event',
+            field=models.OneToOneField(help_text='Event this T&C version applies to.', on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='event.event', verbose_name='Event'),
+        ),
+        migrations.AlterField(
+            model_name='termsandconditions',
+            name='title',
+            field=models.CharField(default='Terms and Conditions', help_text='Title for internal/admin reference.', max_length=255, verbose_name='Title'),
+        ),
+        migrations.AlterField(
+            model_name='termsandconditions',
+            name='version',
+            field=models.CharField(default='1.0', help_text='Version string for tracking agreement history.', max_length=20, verbose_name='Version'),
+        ),
+        migrations.AddConstraint(
+            model_name='racepackage',
+            constraint=models.UniqueConstraint(fields=('race', 'name'), name='unique_package_per_race'),
+        ),
+        migrations.AddConstraint(
+            model_name='racepackage',
+            constraint=models.UniqueConstraint(fields=('race', 'name_en'), name='unique_package_per_race-name_en'),
+        ),
+        migrations.AddConstraint(
+            model_name='racepackage',
+            constraint=models.UniqueConstraint(fields=('race', 'name_el'), name='unique_package_per_race-name_el'),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='role',
+            field=models.ForeignKey(blank=True, help_text="The athlete's assigned role (e.g., Runner, Cyclist)", null=True, on_delete=django.db.models.deletion.SET_NULL, to='event.racerole'),
+        ),
+        migrations.AddField(
+            model_name='racetype',
+            name='roles',
+            field=models.ManyToManyField(blank=True, to='event.racerole'),
+        ),
+        migrations.AddField(
+            model_name='racespecialprice',
+            name='race',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='special_prices', to='event.race', verbose_name='Race'),
+        ),
+        migrations.AddField(
+            model_name='athlete',
+            name='special_price',
+            field=models.ForeignKey(blank=True, help_text='Race-level special price (discount).', null=True, on_delete=django.db.models.deletion.SET_NULL, to='event.racespecialprice', verbose_name='Special Price'),
+        ),
+        migrations.AddField(
+            model_name='timebasedprice',
+            name='race',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_based_prices', to='event.race', verbose_name='Race'),
+        ),
+        migrations.DeleteModel(
+            name='PackageSpecialPrice',
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0034_catch_up'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CapacityCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reserved', models.PositiveIntegerField(default=0, help_text='Seats paid for or held by registrations in checkout.', verbose_name='Reserved Seats')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='capacity_counters', to='event.event', verbose_name='Event')),
+                ('race', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='capacity_counters', to='event.race', verbose_name='Race')),
+            ],
+            options={
+                'verbose_name': 'Capacity Counter',
+                'verbose_name_plural': 'Capacity Counters',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('race__isnull', True)), fields=('event',), name='unique_event_capacity_counter'), models.UniqueConstraint(condition=models.Q(('race__isnull', False)), fields=('race',), name='unique_race_capacity_counter')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SeatReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seats', models.PositiveIntegerField(verbose_name='Seats')),
+                ('status', models.CharField(choices=[('held', 'Held'), ('confirmed', 'Confirmed'), ('released', 'Released')], default='held', max_length=10, verbose_name='Status')),
+                ('expires_at', models.DateTimeField(verbose_name='Expires At')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_reservations', to='event.race', verbose_name='Race')),
+                ('registration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_reservations', to='event.registration', verbose_name='Registration')),
+            ],
+            options={
+                'verbose_name': 'Seat Reservation',
+                'verbose_name_plural': 'Seat Reservations',
+                'indexes': [models.Index(condition=models.Q(('status', 'held')), fields=['expires_at'], name='seat_hold_expiry_idx')],
+                'constraints': [models.UniqueConstraint(fields=('registration', 'race'), name='unique_registration_race_reservation')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+from django.db import migrations, models
+
+from event.capacity import recount_paid_athletes
+
+
+def fill_paid_athletes(apps, schema_editor):
+    """Count the paid athletes of existing events and races (as recount)."""
+    recount_paid_athletes()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0035_seat_reservations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='paid_athletes',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Athletes with paid registrations (maintained counter).', verbose_name='Paid Athletes'),
+        ),
+        migrations.AddField(
+            model_name='race',
+            name='paid_athletes',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Athletes with paid registrations (maintained counter).', verbose_name='Paid Athletes'),
+        ),
+        migrations.RunPython(fill_paid_athletes, migrations.RunPython.noop),
+    ]
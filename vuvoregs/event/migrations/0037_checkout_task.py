@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0036_paid_athlete_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckoutTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('redirect_url', models.URLField(blank=True, max_length=500, verbose_name='Redirect URL')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('available_at', models.DateTimeField(help_text='The task is not picked up before this time (retry backoff).', verbose_name='Available At')),
+                ('locked_until', models.DateTimeField(blank=True, help_text='A running task whose lease ran out is picked up again.', null=True, verbose_name='Locked Until')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('payment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='checkout_task', to='event.payment', verbose_name='Payment')),
+            ],
+            options={
+                'verbose_name': 'Checkout Task',
+                'verbose_name_plural': 'Checkout Tasks',
+                'indexes': [models.Index(condition=models.Q(('status__in', ['pending', 'running'])), fields=['available_at'], name='checkout_task_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0037_checkout_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type_id', models.PositiveIntegerField(verbose_name='Event Type')),
+                ('transaction_id', models.CharField(blank=True, max_length=255, verbose_name='Transaction ID')),
+                ('order_code', models.CharField(blank=True, max_length=50, verbose_name='Order Code')),
+                ('payload', models.JSONField(verbose_name='Payload')),
+                ('received_at', models.DateTimeField(auto_now_add=True, verbose_name='Received At')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Processed At')),
+                ('outcome', models.CharField(blank=True, choices=[('applied', 'Applied'), ('ignored', 'Ignored'), ('unmatched', 'Payment not found')], max_length=10, verbose_name='Outcome')),
+            ],
+            options={
+                'verbose_name': 'Webhook Event',
+                'verbose_name_plural': 'Webhook Events',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['order_code'], name='payment_order_code_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['transaction_id'], name='payment_transaction_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='webhookevent',
+            constraint=models.UniqueConstraint(fields=('event_type_id', 'transaction_id'), name='unique_webhook_event'),
+        ),
+    ]
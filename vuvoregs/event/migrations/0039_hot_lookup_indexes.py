@@ -0,0 +1,70 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import F
+
+from event.pricing.windows import invalidate_window_index
+
+
+def fix_time_price_windows(apps, schema_editor):
+    """Make existing windows pass time_price_ends_after_start.
+
+    Windows entered backwards get their dates swapped. Zero-length windows
+    (end = start) never apply to a registration and are deleted.
+    """
+    TimeBasedPrice = apps.get_model('event', 'TimeBasedPrice')
+    windows = TimeBasedPrice.objects.using(schema_editor.connection.alias)
+    reversed_windows = list(windows.filter(end_date__lt=F('start_date')))
+    for window in reversed_windows:
+        window.start_date, window.end_date = window.end_date, window.start_date
+    windows.bulk_update(reversed_windows, ['start_date', 'end_date'])
+    empty = windows.filter(end_date=F('start_date'))
+    race_ids = {w.race_id for w in reversed_windows}
+    race_ids.update(empty.values_list('race_id', flat=True))
+    empty.delete()
+    for race_id in race_ids:
+        invalidate_window_index(race_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0038_webhook_event'),
+    ]
+
+    operations = [
+        migrations.RunPython(fix_time_price_windows, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='athlete',
+            index=models.Index(fields=['race', 'registration'], name='athlete_race_registration_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(django.db.models.functions.text.Upper('transaction_id'), name='payment_transaction_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='racepackage',
+            index=models.Index(fields=['race', 'visible_until'], name='package_race_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['event', 'created_at'], name='registration_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(fields=['payment_status'], name='registration_payment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registration',
+            index=models.Index(condition=models.Q(('payment_status', 'paid')), fields=['event'], name='registration_paid_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timebasedprice',
+            index=models.Index(fields=['race', 'start_date', 'end_date'], name='time_price_window_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='timebasedprice',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__gt', models.F('start_date'))), name='time_price_ends_after_start'),
+        ),
+    ]
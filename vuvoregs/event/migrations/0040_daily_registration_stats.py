@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:16
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+from event.rollups import rebuild
+
+
+def fill_daily_stats(apps, schema_editor):
+    """Roll up the existing registrations (as rebuild_registration_stats)."""
+    rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0039_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRegistrationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Day')),
+                ('registrations', models.PositiveIntegerField(default=0, verbose_name='Registrations')),
+                ('paid_registrations', models.PositiveIntegerField(default=0, verbose_name='Paid Registrations')),
+                ('athletes', models.PositiveIntegerField(default=0, verbose_name='Athletes')),
+                ('paid', models.PositiveIntegerField(default=0, help_text='Athletes of paid registrations.', verbose_name='Paid Athletes')),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Total amount of the paid registrations.', max_digits=12, verbose_name='Revenue')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='event.event', verbose_name='Event')),
+                ('race', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='event.race', verbose_name='Race')),
+            ],
+            options={
+                'verbose_name': 'Daily Registration Stats',
+                'verbose_name_plural': 'Daily Registration Stats',
+                'indexes': [models.Index(fields=['day'], name='daily_stats_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event', 'race', 'day'), name='unique_daily_race_stats')],
+            },
+        ),
+        migrations.RunPython(fill_daily_stats, migrations.RunPython.noop),
+    ]
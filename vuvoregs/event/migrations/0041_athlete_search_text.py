@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-17 04:00
+
+from django.db import migrations, models
+
+from event.search import update_documents
+
+
+def fill_search_text(apps, schema_editor):
+    """Fill the search documents of existing athletes (as rebuild_search_index)."""
+    Athlete = apps.get_model('event', 'Athlete')
+    update_documents(Athlete.objects.using(schema_editor.connection.alias))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0040_daily_registration_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='athlete',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, help_text='Names and email, accent- and case-folded, for search.', verbose_name='Search Text'),
+        ),
+        migrations.RunPython(fill_search_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from event.search.backends import get_backend
+
+
+def create_search_index(apps, schema_editor):
+    """Create the database's athlete search index, filled from search_text."""
+    connection = schema_editor.connection
+    get_backend(connection.alias).ensure_index(connection)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the athlete search index."""
+    connection = schema_editor.connection
+    get_backend(connection.alias).drop_index(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0041_athlete_search_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
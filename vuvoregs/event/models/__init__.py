@@ -1,13 +1,18 @@
 """Event models package.
 
-This package provides models for managing athletes,
-events, packages, payments, races, registrations, and terms and conditions.
+This package provides models for managing athletes, seat capacity,
+checkout tasks, events, packages, payments, races, registrations, daily
+registration rollups, terms and conditions, and payment webhook events.
 """
 
 from .athlete import *  # noqa: F401
+from .capacity import *  # noqa: F401
+from .checkout import *  # noqa: F401
 from .event import *  # noqa: F401
 from .package import *  # noqa: F401
 from .payment import *  # noqa: F401
 from .race import *  # noqa: F401
 from .registration import *  # noqa: F401
+from .stats import *  # noqa: F401
 from .terms import *  # noqa: F401
+from .webhook import *  # noqa: F401
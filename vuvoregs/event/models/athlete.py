@@ -9,10 +9,13 @@ import json
 
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from datetime import date
 
+from event.search.normalize import ATHLETE_SEARCH_FIELDS, athlete_search_text
+
+SEARCH_SOURCES = set(ATHLETE_SEARCH_FIELDS)
+
 
 class Athlete(models.Model):
     """Represents a single athlete participating in a race.
@@ -90,12 +93,25 @@ class Athlete(models.Model):
         verbose_name=_("Selected Options"),
     )
 
+    search_text = models.TextField(
+        _("Search Text"),
+        blank=True,
+        editable=False,
+        help_text=_("Names and email, accent- and case-folded, for search."),
+    )
+
     class Meta:
         """Metadata options for the Athlete model."""
 
         ordering = ["-registration__created_at"]
         verbose_name = _("Athlete")
         verbose_name_plural = _("Athletes")
+        # Per-race counts and totals join athletes to their registrations
+        indexes = [
+            models.Index(
+                fields=["race", "registration"], name="athlete_race_registration_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         """Return a string representation of the athlete."""
@@ -105,19 +121,22 @@ class Athlete(models.Model):
             return f"{self.first_name} {self.last_name}"
 
     def save(self, *args, **kwargs) -> None:
-        """Ensure selected options are a valid JSON dict before saving."""
+        """Ensure selected options are a valid JSON dict before saving.
+
+        Also refreshes the search text from the names and email.
+        """
         if not isinstance(self.selected_options, dict):
             self.selected_options = {}
         self.selected_options = json.loads(json.dumps(self.selected_options))
+        self.search_text = athlete_search_text(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & SEARCH_SOURCES:
+            kwargs["update_fields"] = {*update_fields, "search_text"}
         super().save(*args, **kwargs)
 
     def get_time_based_adjustment(self) -> Decimal:
         """Return the current time-based price adjustment for the athlete's race."""
-        now = timezone.now()
-        tbp = self.race.time_based_prices.filter(
-            start_date__lte=now, end_date__gte=now
-        ).first()
-        return tbp.price_adjustment if tbp else Decimal("0.00")
+        return self.race.get_current_price_adjustment()
 
     def is_minor(self) -> bool:
         """Return True if athlete is under 18 on the event date."""
@@ -168,7 +187,7 @@ class Athlete(models.Model):
     def get_base_price(self):
         """Return the base price used for this athlete (individual/team)."""
         is_team = self.registration.qualifies_for_team_discount(self.race)
-        return self.race.base_price_team if is_team else self.race.base_price_individual
+        return self.race.price_table.base_price(is_team)
 
     def get_total_price(self) -> Decimal:
         """Calculate and return the total price for the athlete's registration.
@@ -177,19 +196,11 @@ class Athlete(models.Model):
         time-based adjustment, and subtracting any applicable discounts.
         """
         is_team = self.registration.qualifies_for_team_discount(self.race)
-
-        base_price = (
-            self.race.base_price_team if is_team else self.race.base_price_individual
-        )
-        discount = (
-            self.special_price.discount_amount
-            if self.special_price
-            else Decimal("0.00")
+        return self.race.price_table.price(
+            package_id=self.package_id,
+            is_team=is_team,
+            special_price_id=self.special_price_id,
         )
-        package_adj = self.package.price_adjustment if self.package else Decimal("0.00")
-        time_adj = self.get_time_based_adjustment()
-
-        return base_price + package_adj + time_adj - discount
 
     def clean(self):
         """Validate that selected_options is a proper dict and required options are filled."""
@@ -207,13 +218,34 @@ class Athlete(models.Model):
         except models.ObjectDoesNotExist:
             return  # No valid package yet — skip validation
 
+        self.validate_selected_options(
+            self.selected_options, package.packageoption_set.all()
+        )
+
+        # ✅ Validate role if the race requires roles
+        if self.race and self.race.requires_roles():
+            self.validate_role(self.role_id, self.race.get_allowed_roles())
+
+    @staticmethod
+    def validate_selected_options(selected_options, package_options) -> None:
+        """Check selected options against the package's options.
+
+        Every option must have a non-blank selection, and selected values must
+        be among the option's allowed values. Takes loaded ``PackageOption``
+        rows, so bulk imports can validate without queries.
+
+        Raises:
+            ValidationError: If a selection is missing or not allowed.
+        """
+        package_options = list(package_options)
+
         # 🔍 Check for missing required options
-        required_options = [opt.name for opt in self.package.packageoption_set.all()]
+        required_options = [opt.name for opt in package_options]
         missing = [
             name
             for name in required_options
-            if name not in self.selected_options
-            or not any(v.strip() for v in self.selected_options[name])
+            if name not in selected_options
+            or not any(v.strip() for v in selected_options[name])
         ]
 
         if missing:
@@ -223,8 +255,8 @@ class Athlete(models.Model):
             )
 
         # 🔒 Validate selected values are among allowed options (if options_json is defined)
-        for option in self.package.packageoption_set.all():
-            selected = self.selected_options.get(option.name, [])
+        for option in package_options:
+            selected = selected_options.get(option.name, [])
             if not isinstance(selected, list):
                 selected = [selected]
             allowed = option.options_json
@@ -234,18 +266,17 @@ class Athlete(models.Model):
                         _(f"Invalid value '{value}' for option '{option.name}'.")
                     )
 
-        # ✅ Validate role if the race requires roles
-        if self.race and self.race.requires_roles():
-            allowed_ids = set(
-                self.race.get_allowed_roles().values_list("id", flat=True)
-            )
-            print(f"✅ Checking role: {self.role_id} against allowed: {allowed_ids}")
-            if self.role_id not in allowed_ids:
-                raise ValidationError({
-                    "role": _("Invalid role. Must be one of: %(roles)s.")
-                    % {
-                        "roles": ", ".join(
-                            str(r) for r in self.race.get_allowed_roles()
-                        )
-                    }
-                })
+    @staticmethod
+    def validate_role(role_id, allowed_roles) -> None:
+        """Check that a role is one of the race's allowed (loaded) roles.
+
+        Raises:
+            ValidationError: If the role is not allowed.
+        """
+        allowed_roles = list(allowed_roles)
+        allowed_ids = {role.id for role in allowed_roles}
+        if role_id not in allowed_ids:
+            raise ValidationError({
+                "role": _("Invalid role. Must be one of: %(roles)s.")
+                % {"roles": ", ".join(str(r) for r in allowed_roles)}
+            })
@@ -0,0 +1,126 @@
+"""Models for the event application.
+
+Defines models for seat capacity counters and per-registration seat
+reservations (holds).
+"""
+
+from django.db import models
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+
+class CapacityCounter(models.Model):
+    """Number of seats claimed for an event, or for one of its races.
+
+    The event-level row has no race. ``reserved`` counts seats that are paid
+    or held by a registration in checkout, so admission only has to compare
+    it against ``max_participants``.
+    """
+
+    event = models.ForeignKey(
+        "event.Event",
+        on_delete=models.CASCADE,
+        related_name="capacity_counters",
+        verbose_name=_("Event"),
+    )
+    race = models.ForeignKey(
+        "event.Race",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="capacity_counters",
+        verbose_name=_("Race"),
+    )
+    reserved = models.PositiveIntegerField(
+        _("Reserved Seats"),
+        default=0,
+        help_text=_("Seats paid for or held by registrations in checkout."),
+    )
+
+    class Meta:
+        """Metadata options for the CapacityCounter model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event"],
+                condition=Q(race__isnull=True),
+                name="unique_event_capacity_counter",
+            ),
+            models.UniqueConstraint(
+                fields=["race"],
+                condition=Q(race__isnull=False),
+                name="unique_race_capacity_counter",
+            ),
+        ]
+        verbose_name = _("Capacity Counter")
+        verbose_name_plural = _("Capacity Counters")
+
+    def __str__(self):
+        """Return a string representation of the counter."""
+        scope = f"race #{self.race_id}" if self.race_id else f"event #{self.event_id}"
+        return f"{scope}: {self.reserved} reserved"
+
+
+class SeatReservation(models.Model):
+    """Seats of one race claimed by a registration between sign-up and payment.
+
+    A team registration spanning several races has one reservation per race.
+    A reservation is ``held`` until it expires, is paid (``confirmed``) or
+    fails (``released``). Only held and confirmed seats count against
+    capacity.
+    """
+
+    HELD = "held"
+    CONFIRMED = "confirmed"
+    RELEASED = "released"
+
+    STATUS_CHOICES = [
+        (HELD, _("Held")),
+        (CONFIRMED, _("Confirmed")),
+        (RELEASED, _("Released")),
+    ]
+
+    registration = models.ForeignKey(
+        "event.Registration",
+        on_delete=models.CASCADE,
+        related_name="seat_reservations",
+        verbose_name=_("Registration"),
+    )
+    race = models.ForeignKey(
+        "event.Race",
+        on_delete=models.CASCADE,
+        related_name="seat_reservations",
+        verbose_name=_("Race"),
+    )
+    seats = models.PositiveIntegerField(_("Seats"))
+    status = models.CharField(
+        _("Status"), max_length=10, choices=STATUS_CHOICES, default=HELD
+    )
+    expires_at = models.DateTimeField(_("Expires At"))
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+
+    class Meta:
+        """Metadata options for the SeatReservation model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["registration", "race"],
+                name="unique_registration_race_reservation",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["expires_at"],
+                condition=Q(status="held"),
+                name="seat_hold_expiry_idx",
+            )
+        ]
+        verbose_name = _("Seat Reservation")
+        verbose_name_plural = _("Seat Reservations")
+
+    def __str__(self):
+        """Return a string representation of the reservation."""
+        return (
+            f"{self.seats} seat(s) of race #{self.race_id} for registration "
+            f"#{self.registration_id} ({self.status})"
+        )
@@ -0,0 +1,72 @@
+"""Models for the event application.
+
+Defines the database-backed queue of Smart Checkout orders waiting to be
+created by the checkout worker.
+"""
+
+from django.db import models
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+
+class CheckoutTask(models.Model):
+    """A payment whose provider order is created in the background.
+
+    The checkout view enqueues the task and sends the browser to a
+    "preparing checkout" page; the worker creates the order and stores the
+    provider's redirect URL, which the page picks up by polling.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (READY, _("Ready")),
+        (FAILED, _("Failed")),
+    ]
+
+    payment = models.OneToOneField(
+        "event.Payment",
+        on_delete=models.CASCADE,
+        related_name="checkout_task",
+        verbose_name=_("Payment"),
+    )
+    status = models.CharField(
+        _("Status"), max_length=10, choices=STATUS_CHOICES, default=PENDING
+    )
+    redirect_url = models.URLField(_("Redirect URL"), max_length=500, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    available_at = models.DateTimeField(
+        _("Available At"),
+        help_text=_("The task is not picked up before this time (retry backoff)."),
+    )
+    locked_until = models.DateTimeField(
+        _("Locked Until"),
+        null=True,
+        blank=True,
+        help_text=_("A running task whose lease ran out is picked up again."),
+    )
+    created_at = models.DateTimeField(_("Created At"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Updated At"), auto_now=True)
+
+    class Meta:
+        """Metadata options for the CheckoutTask model."""
+
+        indexes = [
+            models.Index(
+                fields=["available_at"],
+                condition=Q(status__in=["pending", "running"]),
+                name="checkout_task_queue_idx",
+            )
+        ]
+        verbose_name = _("Checkout Task")
+        verbose_name_plural = _("Checkout Tasks")
+
+    def __str__(self):
+        """Return a string representation of the task."""
+        return f"Checkout for payment #{self.payment_id} ({self.status})"
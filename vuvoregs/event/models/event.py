@@ -7,8 +7,18 @@ from collections import defaultdict
 
 from django.conf import settings
 from django.db import models
-from django.db.models import Count, F, Q
-from django.utils.functional import cached_property
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 
@@ -22,13 +32,6 @@ class EventManager(models.Manager):
         """Return events that are currently open for registration and not full."""
         return (
             self.get_queryset()
-            .annotate(
-                num_athletes=Count(
-                    "registrations__athletes",
-                    filter=Q(registrations__payment_status="paid"),
-                    distinct=True,
-                )
-            )
             .filter(
                 is_available=True,
                 date__gte=now().date(),
@@ -37,7 +40,59 @@ class EventManager(models.Manager):
             )
             .filter(
                 Q(max_participants__isnull=True)
-                | Q(num_athletes__lt=F("max_participants"))
+                | Q(paid_athletes__lt=F("max_participants"))
+            )
+        )
+
+    def for_listing(self):
+        """Return events annotated with everything the event cards display.
+
+        Adds ``race_count``, ``reserved_seats`` and ``registration_open`` (the
+        SQL equivalent of ``Event.is_registration_open``) so a whole page of
+        cards renders from a single query.
+        """
+        from .capacity import CapacityCounter
+        from .race import Race
+
+        now_ = now()
+        reserved = CapacityCounter.objects.filter(
+            event=OuterRef("pk"), race__isnull=True
+        ).values("reserved")[:1]
+        races = (
+            Race.objects.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        is_open = (
+            Q(is_available=True, date__gte=now_.date())
+            & (
+                Q(registration_start_date__isnull=True)
+                | Q(registration_start_date__lte=now_)
+            )
+            & (
+                Q(registration_end_date__isnull=True)
+                | Q(registration_end_date__gte=now_)
+            )
+            & (
+                Q(max_participants__isnull=True)
+                | Q(reserved_seats__lt=F("max_participants"))
+            )
+        )
+        return (
+            self.get_queryset()
+            .annotate(
+                race_count=Coalesce(Subquery(races), 0),
+                # Events without a counter yet have only paid athletes
+                reserved_seats=Coalesce(Subquery(reserved), F("paid_athletes")),
+            )
+            .annotate(
+                registration_open=Case(
+                    When(is_open, then=Value(True)),
+                    default=Value(False),
+                    output_field=BooleanField(),
+                )
             )
         )
 
@@ -86,6 +141,12 @@ class Event(models.Model):
         _("Registration End Date"), null=True, blank=True
     )
     is_available = models.BooleanField(_("Is Available"), default=True)
+    paid_athletes = models.PositiveIntegerField(
+        _("Paid Athletes"),
+        default=0,
+        editable=False,
+        help_text=_("Athletes with paid registrations (maintained counter)."),
+    )
 
     objects = EventManager()
 
@@ -93,8 +154,7 @@ class Event(models.Model):
         """Return a string representation of the event."""
         return self.name
 
-    @cached_property
-    def paid_athletes(self):
+    def get_paid_athletes(self):
         """Return all athletes who have fully paid their registration for this event."""
         return Athlete.objects.filter(
             registration__event=self,
@@ -104,7 +164,7 @@ class Event(models.Model):
     @property
     def paid_athlete_count(self):
         """Return the number of athletes with paid registrations."""
-        return self.paid_athletes.count()
+        return self.paid_athletes
 
     @property
     def available_slots_remaining(self):
@@ -125,17 +185,16 @@ class Event(models.Model):
             return False
         if self.registration_end_date and self.registration_end_date < now_:
             return False
-        if (
-            self.max_participants is not None
-            and self.paid_athlete_count >= self.max_participants
-        ):
-            return False
+        if self.max_participants is not None:
+            from event.capacity import has_room
+
+            return has_room(self)
         return True
 
     def get_paid_athletes_by_pickup_point(self):
         """Returns a dictionary of pickup_point → list of paid athletes."""
         result = defaultdict(list)
-        for athlete in self.paid_athletes.select_related("pickup_point"):
+        for athlete in self.get_paid_athletes().select_related("pickup_point"):
             if athlete.pickup_point:
                 result[athlete.pickup_point].append(athlete)
         return result
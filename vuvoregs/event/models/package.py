@@ -54,6 +54,12 @@ class RacePackage(models.Model):
                 fields=["race", "name"], name="unique_package_per_race"
             )
         ]
+        # get_visible_packages() filters a race's packages by visible_until
+        indexes = [
+            models.Index(
+                fields=["race", "visible_until"], name="package_race_visible_idx"
+            ),
+        ]
 
     def __str__(self):
         """Return a string representation of the race package."""
@@ -68,11 +74,7 @@ class RacePackage(models.Model):
         race = self.race
         if not race:
             return Decimal("0.00")
-        now = timezone.now()
-        for tbp in race.time_based_prices.all():
-            if tbp.start_date <= now <= tbp.end_date:
-                return tbp.price_adjustment
-        return Decimal("0.00")
+        return race.get_current_price_adjustment()
 
     def get_final_price(self, is_team: bool = False) -> Decimal:
         """Return the final price of this package including.
@@ -85,15 +87,11 @@ class RacePackage(models.Model):
         if not race:
             return Decimal("0.00")
 
-        if is_team and race.has_team_discount():
-            base = race.base_price_team
-        else:
-            base = race.base_price_individual
-
+        table = race.price_table
         return (
-            base
-            + (self.price_adjustment or Decimal("0.00"))
-            + self.get_active_time_adjustment()
+            table.base_price(is_team)
+            + Decimal(self.price_adjustment or Decimal("0.00"))
+            + table.time_adjustment()
         )
 
     def set_display_price(self, race):
@@ -6,6 +6,7 @@ Defines models for Payment processing and redirects.
 import json
 
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
@@ -26,6 +27,17 @@ class Payment(BasePayment):
         verbose_name=_("Order Code"),
     )
 
+    class Meta(BasePayment.Meta):
+        """Metadata options for the Payment model."""
+
+        # Webhooks and redirects look payments up by these provider references
+        indexes = [
+            models.Index(fields=["order_code"], name="payment_order_code_idx"),
+            models.Index(fields=["transaction_id"], name="payment_transaction_idx"),
+            # Viva may send the transaction id in either case on the redirect
+            models.Index(Upper("transaction_id"), name="payment_transaction_upper_idx"),
+        ]
+
     def get_registration_id(self) -> int | None:
         """Extract the registration ID from extra_data JSON."""
         try:
@@ -7,30 +7,24 @@ to calculate pricing, discounts, and availability.
 
 from decimal import Decimal
 
+from django.core.exceptions import ValidationError
 from django.db import models
-from django.db.models import Count, F, Q
+from django.db.models import F, Q
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
+from event.pricing import build_price_table, get_window_index
+
 
 class RaceManager(models.Manager):
     """Custom manager for the Race model."""
 
     def available(self):
         """Return races that are open for registration and not full."""
-        return (
-            self.get_queryset()
-            .annotate(
-                num_athletes=Count(
-                    "athlete",
-                    filter=Q(athlete__registration__payment_status="paid"),
-                    distinct=True,
-                )
-            )
-            .filter(
-                Q(max_participants__isnull=True)
-                | Q(num_athletes__lt=F("max_participants"))
-            )
+        return self.get_queryset().filter(
+            Q(max_participants__isnull=True)
+            | Q(paid_athletes__lt=F("max_participants"))
         )
 
 
@@ -90,6 +84,12 @@ class Race(models.Model):
         blank=True,
         help_text=_("Optional override for this specific race."),
     )
+    paid_athletes = models.PositiveIntegerField(
+        _("Paid Athletes"),
+        default=0,
+        editable=False,
+        help_text=_("Athletes with paid registrations (maintained counter)."),
+    )
 
     objects = RaceManager()
 
@@ -104,12 +104,30 @@ class Race(models.Model):
         """Return True if the race can currently accept registrations."""
         if not self.event.is_registration_open():
             return False
+        if self.max_participants is None:
+            return True
+
+        from event.capacity import has_room
+
+        return has_room(self.event, self)
+
+    @cached_property
+    def price_table(self):
+        """Return the compiled price table for this race.
+
+        Built once per instance; every pricing method below reads from it.
+        """
+        return build_price_table(self)
 
-        current_paid = self.athlete_set.filter(
-            registration__payment_status="paid"
-        ).count()
+    @property
+    def window_index(self):
+        """Return the time-based pricing window index of this race.
 
-        return self.max_participants is None or current_paid < self.max_participants
+        Reuses the price table's index if compiled, otherwise reads the
+        shared cache without loading packages or special prices.
+        """
+        table = self.__dict__.get("price_table")
+        return table.windows if table else get_window_index(self.pk)
 
     def has_team_discount(self) -> bool:
         """Return True if team pricing is enabled."""
@@ -123,31 +141,21 @@ class Race(models.Model):
 
     def get_current_price_adjustment(self) -> Decimal:
         """Return any time-based price adjustment active right now."""
-        now = timezone.now()
-        current_window = self.time_based_prices.filter(
-            start_date__lte=now, end_date__gte=now
-        ).first()
-        return current_window.price_adjustment if current_window else Decimal("0.00")
+        window = self.window_index.active_at()
+        return window.adjustment if window else Decimal("0.00")
 
     def get_pricing_label(self) -> str | None:
         """Return the label of the active time-based pricing window."""
-        now = timezone.now()
-        tbp = self.time_based_prices.filter(
-            start_date__lte=now, end_date__gte=now
-        ).first()
-        return tbp.label if tbp else None
+        window = self.window_index.active_at()
+        return window.label if window else None
 
     def get_effective_base_price(self, is_team: bool = False) -> Decimal:
         """Return the base price depending on whether it's an individual or team.
 
         Does not include package or option adjustments — just base race price.
         """
-        base = (
-            self.base_price_team
-            if is_team and self.has_team_discount()
-            else self.base_price_individual
-        )
-        return base + self.get_current_price_adjustment()
+        table = self.price_table
+        return table.base_price(is_team) + table.time_adjustment()
 
     def get_priced_packages(self):
         """Return visible packages sorted by individual price, with display price attached."""  # noqa: E501
@@ -169,22 +177,22 @@ class Race(models.Model):
 
     def get_packages_with_prices(self):
         """Return all visible packages for this race with individual/team pricing and discounts."""
+        table = self.price_table
+        now = timezone.now()
+        time_adj = table.time_adjustment(now)
+        has_team = table.has_team_discount
+        special_prices = self.special_prices.all()
         results = []
 
-        for package in self.get_visible_packages():
-            individual_price = package.get_final_price(is_team=False)
-            team_price = (
-                package.get_final_price(is_team=True)
-                if self.has_team_discount()
-                else None
-            )
-            # ✅ Fix: Query from self.special_prices instead of package
-            special_prices = self.special_prices.all()
-
+        for package in self.packages.all():
+            if not package.is_visible_now():
+                continue
+            package.race = self
+            adjustment = table.package_adjustment(package.pk) + time_adj
             results.append({
                 "package": package,
-                "individual_price": individual_price,
-                "team_price": team_price,
+                "individual_price": table.base_price(False) + adjustment,
+                "team_price": table.base_price(True) + adjustment if has_team else None,
                 "special_prices": special_prices,
             })
 
@@ -254,6 +262,17 @@ class TimeBasedPrice(models.Model):
         ordering = ["start_date"]
         verbose_name = _("Time-Based Price")
         verbose_name_plural = _("Time-Based Prices")
+        indexes = [
+            models.Index(
+                fields=["race", "start_date", "end_date"], name="time_price_window_idx"
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(end_date__gt=F("start_date")),
+                name="time_price_ends_after_start",
+            ),
+        ]
 
     def __str__(self):
         """Return a string representation of the time-based price.
@@ -264,3 +283,11 @@ class TimeBasedPrice(models.Model):
             f"{self.label}: €{self.price_adjustment:+.2f} "
             f"({self.start_date.date()}–{self.end_date.date()})"
         )
+
+    def clean(self):
+        """Validate that the window ends after it starts."""
+        super().clean()
+        if self.start_date and self.end_date and self.end_date <= self.start_date:
+            raise ValidationError(
+                {"end_date": _("The end date must be after the start date.")}
+            )
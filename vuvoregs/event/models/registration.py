@@ -6,6 +6,7 @@ Defines models for registration records and payment tracking.
 from decimal import Decimal
 
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 
@@ -92,6 +93,23 @@ class Registration(models.Model):
         verbose_name=_("Payment"),
     )
 
+    class Meta:
+        """Metadata options for the Registration model."""
+
+        indexes = [
+            # Dashboards list and chart an event's registrations by date
+            models.Index(
+                fields=["event", "created_at"], name="registration_event_created_idx"
+            ),
+            models.Index(fields=["payment_status"], name="registration_payment_idx"),
+            # Capacity and paid-athlete counts only look at paid registrations
+            models.Index(
+                fields=["event"],
+                condition=Q(payment_status="paid"),
+                name="registration_paid_event_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         """Return a string summary for debugging and admin display."""
         date_str = (
@@ -100,8 +118,14 @@ class Registration(models.Model):
         return f"Registration {self.id or 'unsaved'} – {self.status} on {date_str}"
 
     def calculate_total_amount(self) -> Decimal:
-        """Calculate total amount for this registration by summing all athlete-level totals."""  # noqa: E501
-        return sum(athlete.get_total_price() for athlete in self.athletes.all())
+        """Calculate total amount for this registration by summing all athlete-level totals.
+
+        All athletes are priced together from their races' price tables, so
+        the cost does not grow with the number of athletes.
+        """  # noqa: E501
+        from event.pricing import registration_total
+
+        return registration_total(self)
 
     def update_total_amount(self) -> None:
         """Updates the stored total_amount based on current athlete values."""
@@ -113,29 +137,28 @@ class Registration(models.Model):
         return self.payment_status == "paid"
 
     def mark_paid(self) -> None:
-        """Set the registration as paid and completed. Also sets agreed T&Cs if available."""
+        """Set the registration (and its payment) as paid and completed.
+
+        Also sets agreed T&Cs if available, confirms the held seats and counts
+        the athletes as paid on the event and races. A no-op if already paid.
+        """
+        from event.payments.transitions import PAID, apply_transition
+
+        if apply_transition(PAID, registration=self):
+            self.refresh_from_db(fields=["agrees_to_terms", "agreed_to_terms"])
         self.payment_status = "paid"
         self.status = "completed"
 
-        # Automatically accept terms if available
-        if self.event and hasattr(self.event, "terms"):
-            self.agrees_to_terms = True
-            self.agreed_to_terms = self.event.terms
-
-        self.save(
-            update_fields=[
-                "payment_status",
-                "status",
-                "agrees_to_terms",
-                "agreed_to_terms",
-            ]
-        )
-
     def mark_failed(self) -> None:
-        """Set the registration status as failed."""
+        """Set the registration (and its payment) as failed and release its seats.
+
+        Athletes previously counted as paid are taken off the counters.
+        """
+        from event.payments.transitions import FAILED, apply_transition
+
+        apply_transition(FAILED, registration=self)
         self.payment_status = "failed"
         self.status = "failed"
-        self.save(update_fields=["payment_status", "status"])
 
     def qualifies_for_team_discount(self, race) -> bool:
         """Return True if the registration has enough athletes to trigger a team discount."""
@@ -0,0 +1,73 @@
+"""Models for the event application.
+
+Defines the daily registration rollups read by the dashboards.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class DailyRegistrationStats(models.Model):
+    """Registrations, athletes and revenue of one race on one day.
+
+    The day is the (local) day the registrations were created. Athletes
+    count under their own race; a registration, and its revenue once paid,
+    counts under one race only (the lowest race ID among its athletes), so
+    summing the rows of an event counts every registration once. Maintained
+    by ``event.rollups``.
+    """
+
+    event = models.ForeignKey(
+        "event.Event",
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name=_("Event"),
+    )
+    race = models.ForeignKey(
+        "event.Race",
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name=_("Race"),
+    )
+    day = models.DateField(_("Day"))
+    registrations = models.PositiveIntegerField(_("Registrations"), default=0)
+    paid_registrations = models.PositiveIntegerField(
+        _("Paid Registrations"), default=0
+    )
+    athletes = models.PositiveIntegerField(_("Athletes"), default=0)
+    paid = models.PositiveIntegerField(
+        _("Paid Athletes"),
+        default=0,
+        help_text=_("Athletes of paid registrations."),
+    )
+    revenue = models.DecimalField(
+        _("Revenue"),
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        help_text=_("Total amount of the paid registrations."),
+    )
+
+    class Meta:
+        """Metadata options for the DailyRegistrationStats model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event", "race", "day"], name="unique_daily_race_stats"
+            ),
+        ]
+        indexes = [
+            # The dashboard home sums every event's recent days
+            models.Index(fields=["day"], name="daily_stats_day_idx"),
+        ]
+        verbose_name = _("Daily Registration Stats")
+        verbose_name_plural = _("Daily Registration Stats")
+
+    def __str__(self):
+        """Return a string representation of the rollup row."""
+        return (
+            f"race #{self.race_id} on {self.day}: "
+            f"{self.athletes} athletes ({self.paid} paid)"
+        )
@@ -0,0 +1,52 @@
+"""Models for the event application.
+
+Defines the append-only log of payment provider webhook notifications.
+"""
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class WebhookEvent(models.Model):
+    """A raw webhook notification, stored once per (event type, transaction).
+
+    The unique key makes provider retries cheap no-ops: a notification is
+    applied only the first time it is stored (or again if it could not be
+    matched to a payment yet).
+    """
+
+    APPLIED = "applied"
+    IGNORED = "ignored"
+    UNMATCHED = "unmatched"
+
+    OUTCOME_CHOICES = [
+        (APPLIED, _("Applied")),
+        (IGNORED, _("Ignored")),
+        (UNMATCHED, _("Payment not found")),
+    ]
+
+    event_type_id = models.PositiveIntegerField(_("Event Type"))
+    transaction_id = models.CharField(_("Transaction ID"), max_length=255, blank=True)
+    order_code = models.CharField(_("Order Code"), max_length=50, blank=True)
+    payload = models.JSONField(_("Payload"))
+    received_at = models.DateTimeField(_("Received At"), auto_now_add=True)
+    processed_at = models.DateTimeField(_("Processed At"), null=True, blank=True)
+    outcome = models.CharField(
+        _("Outcome"), max_length=10, choices=OUTCOME_CHOICES, blank=True
+    )
+
+    class Meta:
+        """Metadata options for the WebhookEvent model."""
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["event_type_id", "transaction_id"],
+                name="unique_webhook_event",
+            )
+        ]
+        verbose_name = _("Webhook Event")
+        verbose_name_plural = _("Webhook Events")
+
+    def __str__(self):
+        """Return a string representation of the notification."""
+        return f"Webhook {self.event_type_id} for {self.transaction_id or '?'}"
@@ -0,0 +1,157 @@
+"""Database-backed queue that creates provider orders off the request thread.
+
+``create_payment`` enqueues a ``CheckoutTask`` and returns immediately; the
+``run_checkout_worker`` command claims tasks and runs the provider's
+``get_form()`` (the token and order calls). The browser polls
+``checkout_status`` until the redirect URL is stored.
+
+Tasks are claimed with a compare-and-set update, so several workers can
+share the queue without a broker or row locks. A claimed task holds a lease;
+if its worker dies, the task is picked up again once the lease runs out. A
+worker only records its outcome while it still holds the lease.
+"""
+
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from event.models import CheckoutTask
+from event.payments.http import REQUEST_TIMEOUT
+from event.payments.smart_checkout import PAYMENT_TIMEOUT
+from payments import RedirectNeeded
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+# Longer than the slowest run: a token and an order call, each up to the
+# connect + read timeout, so a live worker never loses its task.
+LEASE_SECONDS = 2 * sum(REQUEST_TIMEOUT) + 30
+# Seconds to wait before retry n (1-based) of a failed order call.
+RETRY_BACKOFF = (2, 10)
+
+
+def async_checkout_enabled() -> bool:
+    """Return True if checkout orders go through the background queue."""
+    return getattr(settings, "ASYNC_CHECKOUT", False)
+
+
+def enqueue_checkout(payment) -> CheckoutTask:
+    """Queue the creation of a payment's provider order.
+
+    Idempotent for a queued task and for an order that is still open. A
+    failed task, or a ready one whose order has expired (after the
+    checkout's ``PAYMENT_TIMEOUT``), is queued again with a fresh set of
+    attempts.
+    """
+    now = timezone.now()
+    task, created = CheckoutTask.objects.get_or_create(
+        payment=payment, defaults={"available_at": now}
+    )
+    order_expired = (
+        task.status == CheckoutTask.READY
+        and task.updated_at <= now - timedelta(seconds=PAYMENT_TIMEOUT)
+    )
+    if not created and (task.status == CheckoutTask.FAILED or order_expired):
+        task.status = CheckoutTask.PENDING
+        task.attempts = 0
+        task.error = ""
+        task.redirect_url = ""
+        task.available_at = now
+        task.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "error",
+                "redirect_url",
+                "available_at",
+                "updated_at",
+            ]
+        )
+    return task
+
+
+def claim_next_task(now=None) -> CheckoutTask | None:
+    """Claim the oldest task that is due, or None if the queue is empty."""
+    now = now or timezone.now()
+    due = CheckoutTask.objects.filter(
+        Q(status=CheckoutTask.PENDING, available_at__lte=now)
+        | Q(status=CheckoutTask.RUNNING, locked_until__lt=now)
+    ).order_by("available_at")
+
+    for task in due.only("pk", "status", "locked_until")[:10]:
+        claimed = CheckoutTask.objects.filter(
+            pk=task.pk, status=task.status, locked_until=task.locked_until
+        ).update(
+            status=CheckoutTask.RUNNING,
+            locked_until=now + timedelta(seconds=LEASE_SECONDS),
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return CheckoutTask.objects.select_related("payment").get(pk=task.pk)
+    return None
+
+
+def run_task(task: CheckoutTask) -> CheckoutTask:
+    """Create the provider order of a claimed task and record the outcome.
+
+    The outcome is dropped if the lease ran out and another worker claimed
+    the task meanwhile; that worker's outcome stands.
+    """
+    lease = task.locked_until
+    try:
+        task.payment.get_form()
+    except RedirectNeeded as redirect_to:
+        task.status = CheckoutTask.READY
+        task.redirect_url = str(redirect_to)
+        task.error = ""
+    except Exception as e:
+        logger.warning("Checkout for payment %s failed: %s", task.payment_id, e)
+        task.error = str(e)
+        if task.attempts < MAX_ATTEMPTS:
+            delay = RETRY_BACKOFF[min(task.attempts, len(RETRY_BACKOFF)) - 1]
+            task.status = CheckoutTask.PENDING
+            task.available_at = timezone.now() + timedelta(seconds=delay)
+        else:
+            task.status = CheckoutTask.FAILED
+    else:
+        task.status = CheckoutTask.FAILED
+        task.error = "The payment provider did not return a checkout URL."
+
+    task.locked_until = None
+    task.updated_at = timezone.now()
+    recorded = CheckoutTask.objects.filter(
+        pk=task.pk, status=CheckoutTask.RUNNING, locked_until=lease
+    ).update(
+        status=task.status,
+        redirect_url=task.redirect_url,
+        error=task.error,
+        available_at=task.available_at,
+        locked_until=None,
+        updated_at=task.updated_at,
+    )
+    if not recorded:
+        logger.warning(
+            "Checkout for payment %s lost its lease; outcome dropped.", task.payment_id
+        )
+        task.refresh_from_db()
+    return task
+
+
+def process_pending(limit: int | None = None) -> int:
+    """Run due tasks until the queue is empty (or ``limit`` is reached).
+
+    Returns:
+        int: The number of tasks run.
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        task = claim_next_task()
+        if task is None:
+            break
+        run_task(task)
+        processed += 1
+    return processed
@@ -0,0 +1,151 @@
+"""Shared HTTP plumbing for payment providers.
+
+- ``get_session()`` returns one process-wide ``requests.Session`` so calls to
+  the provider reuse pooled keep-alive connections (no TLS handshake per
+  checkout).
+- ``TokenCache`` keeps OAuth2 access tokens until shortly before they
+  expire, behind a lock so concurrent threads fetch a new token only once.
+- ``timed()`` records how long each outbound call takes; ``call_timings()``
+  exposes the numbers, and the time is added to the measured request (see
+  ``event.perf``).
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from event.perf.recorder import record_outbound
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout in seconds for every outbound provider call.
+REQUEST_TIMEOUT = (5, 30)
+POOL_MAXSIZE = 10
+# Refresh a token this many seconds before the provider says it expires.
+TOKEN_EXPIRY_MARGIN = 60
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def reset_session() -> None:
+    """Close and drop the shared session (e.g. after a fork)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+@dataclass
+class CallTiming:
+    """Aggregated durations, in seconds, of one kind of outbound call."""
+
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    last: float = 0.0
+
+    @property
+    def average(self) -> float:
+        """Return the mean duration of the recorded calls."""
+        return self.total / self.count if self.count else 0.0
+
+
+_timings: dict[str, CallTiming] = {}
+_timings_lock = threading.Lock()
+
+
+@contextmanager
+def timed(name: str):
+    """Record the duration (and failure) of the wrapped call under ``name``."""
+    start = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        with _timings_lock:
+            timing = _timings.setdefault(name, CallTiming())
+            timing.count += 1
+            timing.errors += failed
+            timing.total += elapsed
+            timing.max = max(timing.max, elapsed)
+            timing.last = elapsed
+        record_outbound(elapsed)
+        logger.debug("%s took %.1f ms", name, elapsed * 1000)
+
+
+def call_timings() -> dict[str, CallTiming]:
+    """Return a snapshot of the recorded call timings, by call name."""
+    with _timings_lock:
+        return {name: CallTiming(**vars(t)) for name, t in _timings.items()}
+
+
+def reset_call_timings() -> None:
+    """Forget every recorded timing."""
+    with _timings_lock:
+        _timings.clear()
+
+
+class TokenCache:
+    """Thread-safe cache of OAuth2 access tokens, keyed by credentials.
+
+    ``get(key, fetch)`` returns the cached token while it is valid. When it
+    is missing or about to expire, exactly one caller runs ``fetch()`` (which
+    must return ``(token, expires_in)``); the others wait for its result.
+    """
+
+    def __init__(self, margin: int = TOKEN_EXPIRY_MARGIN):
+        """Create an empty cache refreshing ``margin`` seconds before expiry."""
+        self.margin = margin
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def _valid(self, key):
+        entry = self._tokens.get(key)
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def get(self, key, fetch) -> str:
+        """Return a valid token for ``key``, fetching a new one if needed."""
+        token = self._valid(key)
+        if token:
+            return token
+        with self._lock:
+            token = self._valid(key)
+            if token:
+                return token
+            token, expires_in = fetch()
+            ttl = max(int(expires_in) - self.margin, 0)
+            self._tokens[key] = (token, time.monotonic() + ttl)
+            return token
+
+    def invalidate(self, key) -> None:
+        """Drop the token for ``key`` (e.g. after a 401)."""
+        with self._lock:
+            self._tokens.pop(key, None)
@@ -6,6 +6,16 @@ from payments import PaymentStatus, RedirectNeeded
 from payments.core import BasicProvider
 import json
 
+from event.payments.http import REQUEST_TIMEOUT, TokenCache, get_session, timed
+
+logger = logging.getLogger(__name__)
+
+# Seconds the buyer has to complete the Smart Checkout order.
+PAYMENT_TIMEOUT = 300
+
+# Access tokens are shared by every provider instance of the process.
+_token_cache = TokenCache()
+
 
 class VivaSmartCheckoutProvider(BasicProvider):
     """Viva Wallet Smart Checkout provider for django-payments (correct full flow)."""
@@ -18,29 +28,44 @@ class VivaSmartCheckoutProvider(BasicProvider):
         client_secret,
         source_code,
         sandbox=True,
+        accounts_url=None,
+        api_url=None,
+        checkout_url=None,
         **kwargs,
     ):
+        """Configure credentials and endpoints.
+
+        ``accounts_url``, ``api_url`` and ``checkout_url`` override the Viva
+        endpoints picked by ``sandbox`` (e.g. to point at a local stub).
+        """
         self.merchant_id = merchant_id
         self.api_key = api_key
         self.client_id = client_id
         self.client_secret = client_secret
         self.source_code = source_code
         self.sandbox = sandbox
-        self.base_url = (
+        self.base_url = accounts_url or (
             "https://demo-accounts.vivapayments.com"
             if sandbox
             else "https://accounts.vivapayments.com"
         )
-        self.checkout_base_url = (
+        self.api_url = api_url or (
+            "https://demo-api.vivapayments.com"
+            if sandbox
+            else "https://api.vivapayments.com"
+        )
+        self.checkout_base_url = checkout_url or (
             "https://demo.vivapayments.com/web/checkout"
             if sandbox
             else "https://www.vivapayments.com/web/checkout"
         )
         super().__init__(**kwargs)
 
-    def get_token(self):
-        """
-        Step 1: Authenticate via OAuth2 to get access token.
+    def fetch_token(self):
+        """Run the OAuth2 client_credentials exchange.
+
+        Returns:
+            tuple: ``(access_token, expires_in)``.
         """
         url = f"{self.base_url}/connect/token"
         data = {
@@ -49,20 +74,29 @@ class VivaSmartCheckoutProvider(BasicProvider):
             "client_secret": self.client_secret,
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        response = requests.post(url, data=data, headers=headers)
-        response.raise_for_status()
-        return response.json()["access_token"]
+        with timed("viva.token"):
+            response = get_session().post(
+                url, data=data, headers=headers, timeout=REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+        body = response.json()
+        return body["access_token"], body.get("expires_in", 3600)
 
-    def create_order(self, payment):
-        logger = logging.getLogger(__name__)
-        """Step 2: Create the payment order and get orderCode."""
+    @property
+    def token_key(self):
+        """Key of this provider's credentials in the token cache."""
+        return (self.base_url, self.client_id)
 
-        token = self.get_token()
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json",
-        }
+    def get_token(self):
+        """
+        Step 1: Authenticate via OAuth2 to get access token.
+
+        The token is cached per process until shortly before it expires.
+        """
+        return _token_cache.get(self.token_key, self.fetch_token)
 
+    def create_order(self, payment):
+        """Step 2: Create the payment order and get orderCode."""
         amount_in_cents = int(payment.total * 100)
         data = {
             "amount": amount_in_cents,
@@ -72,30 +106,48 @@ class VivaSmartCheckoutProvider(BasicProvider):
                 "phone": str(payment.billing_phone) if payment.billing_phone else "",
                 "fullName": f"{payment.billing_first_name} {payment.billing_last_name}",
             },
-            "paymentTimeout": 300,
+            "paymentTimeout": PAYMENT_TIMEOUT,
             "preauth": False,
             "sourceCode": self.source_code,
             "merchantTrns": f"reg-{payment.id}",
         }
 
-        url = (
-            "https://demo-api.vivapayments.com/checkout/v2/orders"
-            if self.sandbox
-            else "https://api.vivapayments.com/checkout/v2/orders"
-        )
-        response = requests.post(url, json=data, headers=headers)
+        url = f"{self.api_url}/checkout/v2/orders"
+        response = self._post_order(url, data)
         if not response.ok:
-            print("❌ Viva order error:", response.text)  # ✅ SHOW the actual error
-            response.raise_for_status()
+            logger.warning(
+                "Viva order for payment %s failed (%s): %s",
+                payment.id,
+                response.status_code,
+                response.text,
+            )
         response.raise_for_status()
-        print("📦 Viva order response:", response.json())  # ✅ Add this here
+        order_code = response.json()["orderCode"]
+        logger.debug("Viva order %s created for payment %s", order_code, payment.id)
+
+        return order_code
+
+    def _send_order(self, url, data) -> requests.Response:
+        headers = {
+            "Authorization": f"Bearer {self.get_token()}",
+            "Content-Type": "application/json",
+        }
+        with timed("viva.order"):
+            return get_session().post(
+                url, json=data, headers=headers, timeout=REQUEST_TIMEOUT
+            )
 
-        return response.json()["orderCode"]
+    def _post_order(self, url, data) -> requests.Response:
+        """POST the order with a cached token, retrying once if it was revoked."""
+        response = self._send_order(url, data)
+        if response.status_code == 401:
+            _token_cache.invalidate(self.token_key)
+            response = self._send_order(url, data)
+        return response
 
     def get_redirect_url(self, payment):
         """Step 3: Build redirect URL to Viva Smart Checkout."""
         order_code = self.create_order(payment)
-        print("💡 Saving order_code:", order_code)
 
         # ✅ Save only order_code here — transaction_id comes from webhook/redirect
         payment.order_code = str(order_code)
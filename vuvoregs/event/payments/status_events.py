@@ -0,0 +1,83 @@
+"""Wake-ups for browsers waiting on a payment's status.
+
+The pending page long-polls ``wait_transaction_status``, which parks the
+request until the webhook settles the transaction (or a heartbeat timeout
+passes) instead of querying the database every few seconds.
+
+``notify_status`` is the publish side. It stores a new version of the
+transaction in the shared cache, so waiters in every worker process see it,
+and wakes waiters of the current process at once. Waiters check the cache
+once per ``CHECK_INTERVAL``; the database is only read before and after
+waiting.
+"""
+
+import asyncio
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Seconds between cache checks of a parked request.
+CHECK_INTERVAL = 1.0
+# Seconds a status version is kept; longer than any checkout.
+VERSION_TIMEOUT = 30 * 60
+
+_waiters: dict[str, set] = {}
+_waiters_lock = threading.Lock()
+
+
+def long_poll_timeout() -> float:
+    """Return the longest time, in seconds, a status request is parked."""
+    return getattr(settings, "PAYMENT_STATUS_LONG_POLL_TIMEOUT", 25)
+
+
+def status_key(transaction_id) -> str:
+    """Return the cache key holding the status version of a transaction."""
+    return f"payments:status:{transaction_id}:version"
+
+
+def notify_status(transaction_id) -> None:
+    """Wake everyone waiting on a transaction whose status has changed."""
+    if not transaction_id:
+        return
+    cache.set(status_key(transaction_id), time.time_ns(), VERSION_TIMEOUT)
+    with _waiters_lock:
+        waiters = list(_waiters.get(transaction_id, ()))
+    for loop, event in waiters:
+        loop.call_soon_threadsafe(event.set)
+
+
+async def status_version(transaction_id):
+    """Return the current status version of a transaction (None if unset)."""
+    return await cache.aget(status_key(transaction_id))
+
+
+async def wait_for_status_change(transaction_id, seen, timeout: float) -> bool:
+    """Wait until the transaction's version differs from ``seen``.
+
+    Returns:
+        bool: True if the status changed, False if ``timeout`` passed first.
+    """
+    loop = asyncio.get_running_loop()
+    waiter = (loop, asyncio.Event())
+    with _waiters_lock:
+        _waiters.setdefault(transaction_id, set()).add(waiter)
+
+    deadline = loop.time() + timeout
+    try:
+        while await status_version(transaction_id) == seen:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(waiter[1].wait(), min(remaining, CHECK_INTERVAL))
+            except TimeoutError:
+                pass
+        return True
+    finally:
+        with _waiters_lock:
+            waiters = _waiters.get(transaction_id)
+            waiters.discard(waiter)
+            if not waiters:
+                del _waiters[transaction_id]
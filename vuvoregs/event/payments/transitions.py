@@ -0,0 +1,145 @@
+"""Payment state machine shared by every path that settles a payment.
+
+The Viva redirect, the webhook, the admin actions and free registrations
+all move a payment and its registration to ``paid`` or ``failed`` through
+``apply_transition``. Each move is a compare-and-set ``UPDATE`` guarded by
+the states it may start from, so when the redirect and the webhook arrive
+together exactly one of them wins and the other is a no-op. The winner
+alone runs the side effects (paid counters, seat reservations, dashboard
+rollups), in the same transaction as the status change.
+"""
+
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Case, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from event.capacity import adjust_paid_athletes, confirm_seats, release_seats
+from event.models import Payment, Registration, TermsAndConditions
+from event.rollups import adjust_paid
+from payments import PaymentStatus
+
+
+@dataclass(frozen=True)
+class Transition:
+    """A move of a registration (and its payment) to a new state."""
+
+    name: str
+    payment_status: str
+    registration_payment_status: str
+    registration_status: str
+    # Registration payment statuses the move may start from.
+    allowed_from: tuple[str, ...]
+
+    @property
+    def is_paid(self) -> bool:
+        """Return True if the move ends in ``paid``."""
+        return self.registration_payment_status == "paid"
+
+
+PAID = Transition(
+    name="paid",
+    payment_status=PaymentStatus.CONFIRMED,
+    registration_payment_status="paid",
+    registration_status="completed",
+    allowed_from=("not_paid", "failed"),
+)
+FAILED = Transition(
+    name="failed",
+    payment_status=PaymentStatus.ERROR,
+    registration_payment_status="failed",
+    registration_status="failed",
+    allowed_from=("not_paid", "paid"),
+)
+
+
+def _registration_changes(transition: Transition) -> dict:
+    changes = {
+        "payment_status": transition.registration_payment_status,
+        "status": transition.registration_status,
+    }
+    if transition.is_paid:
+        # A paid registration has accepted its event's terms, if there are any
+        terms = TermsAndConditions.objects.filter(event=OuterRef("event_id"))
+        changes["agreed_to_terms"] = Coalesce(
+            Subquery(terms.values("pk")[:1]), F("agreed_to_terms")
+        )
+        changes["agrees_to_terms"] = Case(
+            When(Exists(terms), then=Value(True)), default=F("agrees_to_terms")
+        )
+    return changes
+
+
+def _move_registration(registrations, transition: Transition) -> str | None:
+    """Compare-and-set the registration to the transition's target state.
+
+    The row is locked while its current status is read, then moved with one
+    ``UPDATE`` guarded by ``allowed_from``. Must run inside a transaction.
+
+    Returns:
+        str | None: The payment status it moved from, or None if it was
+        already in the target state (or there is no registration).
+    """
+    current = (
+        registrations.select_for_update()
+        .filter(payment_status__in=transition.allowed_from)
+        .values_list("pk", "payment_status")
+        .first()
+    )
+    if current is None:
+        return None
+    pk, source = current
+    moved = Registration.objects.filter(
+        pk=pk, payment_status__in=transition.allowed_from
+    ).update(**_registration_changes(transition))
+    return source if moved else None
+
+
+def apply_transition(
+    transition: Transition,
+    *,
+    registration=None,
+    payment_id=None,
+    transaction_id: str | None = None,
+) -> bool:
+    """Move a payment and its registration to a new state, once.
+
+    Pass the ``registration`` or, when only the payment is known, its
+    ``payment_id``. ``transaction_id`` is stored on the payment if given.
+
+    Returns:
+        bool: True if this call changed the payment or the registration.
+    """
+    if registration is not None:
+        payment_id = registration.payment_id
+        registrations = Registration.objects.filter(pk=registration.pk)
+    else:
+        registrations = Registration.objects.filter(payment_id=payment_id)
+
+    with transaction.atomic():
+        payment_changed = 0
+        if payment_id is not None:
+            changes = {"status": transition.payment_status}
+            stale = ~Q(status=transition.payment_status)
+            if transaction_id:
+                changes["transaction_id"] = transaction_id
+                stale |= ~Q(transaction_id=transaction_id)
+            payment_changed = (
+                Payment.objects.filter(pk=payment_id).filter(stale).update(**changes)
+            )
+
+        source = _move_registration(registrations, transition)
+        if source is None:
+            return bool(payment_changed)
+
+        if registration is None:
+            registration = registrations.only("pk", "event_id").get()
+        delta = int(transition.is_paid) - int(source == "paid")
+        adjust_paid_athletes(registration, delta)
+        adjust_paid(registration, delta)
+        if transition.is_paid:
+            confirm_seats(registration)
+        else:
+            release_seats(registration)
+    return True
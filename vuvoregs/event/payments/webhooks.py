@@ -0,0 +1,122 @@
+"""Idempotent ingestion of Viva Wallet webhook notifications.
+
+Every notification is first stored in ``WebhookEvent`` under its unique
+(EventTypeId, TransactionId) key and committed, so it is acknowledged even
+if applying it fails (``process_webhook_events`` replays those). Provider
+retries hit the unique key and are answered without touching payments.
+
+Applying an event goes through the payment state machine
+(``event.payments.transitions``) in one transaction with the event's
+outcome, so the paid counters and seat reservations move only if the
+registration row actually changed.
+"""
+
+from functools import partial
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from event.models import Payment, WebhookEvent
+from event.payments.status_events import notify_status
+from event.payments.transitions import FAILED, PAID, apply_transition
+
+logger = logging.getLogger(__name__)
+
+PAYMENT_SUCCEEDED = 1796
+PAYMENT_FAILED = 1798
+
+TRANSITIONS = {PAYMENT_SUCCEEDED: PAID, PAYMENT_FAILED: FAILED}
+
+
+def store_event(payload: dict) -> tuple[WebhookEvent, bool]:
+    """Append a notification to the log.
+
+    Returns:
+        tuple: ``(event, created)``; ``created`` is False for a retry.
+    """
+    data = payload.get("EventData") or {}
+    key = {
+        "event_type_id": payload.get("EventTypeId") or 0,
+        "transaction_id": str(data.get("TransactionId") or ""),
+    }
+    try:
+        with transaction.atomic():
+            event = WebhookEvent.objects.create(
+                **key,
+                order_code=str(data.get("OrderCode") or ""),
+                payload=payload,
+            )
+        return event, True
+    except IntegrityError:
+        return WebhookEvent.objects.get(**key), False
+
+
+def apply_event(event: WebhookEvent) -> str:
+    """Apply a stored notification to its payment and registration.
+
+    Returns:
+        str: The event's outcome (``WebhookEvent.APPLIED`` etc.).
+    """
+    transition = TRANSITIONS.get(event.event_type_id)
+
+    with transaction.atomic():
+        payment_id = (
+            Payment.objects.filter(order_code=event.order_code)
+            .values_list("pk", flat=True)
+            .first()
+            if event.order_code
+            else None
+        )
+        if payment_id is None:
+            outcome = WebhookEvent.UNMATCHED
+        elif transition is None:
+            outcome = WebhookEvent.IGNORED
+        else:
+            apply_transition(
+                transition,
+                payment_id=payment_id,
+                transaction_id=event.transaction_id,
+            )
+            outcome = WebhookEvent.APPLIED
+            # Wake browsers parked on the pending page
+            transaction.on_commit(partial(notify_status, event.transaction_id))
+
+        WebhookEvent.objects.filter(pk=event.pk).update(
+            outcome=outcome, processed_at=timezone.now()
+        )
+
+    event.outcome = outcome
+    logger.info(
+        "Webhook %s for %s: %s", event.event_type_id, event.transaction_id, outcome
+    )
+    return outcome
+
+
+def ingest(payload: dict) -> tuple[WebhookEvent, str | None]:
+    """Store a notification and apply it unless it was already applied.
+
+    Returns:
+        tuple: ``(event, outcome)``; ``outcome`` is None for a duplicate.
+    """
+    event, created = store_event(payload)
+    if not created and event.outcome in (WebhookEvent.APPLIED, WebhookEvent.IGNORED):
+        return event, None
+    return event, apply_event(event)
+
+
+def process_webhook_events() -> int:
+    """Apply stored notifications that were never applied or not yet matched.
+
+    Returns:
+        int: The number of events applied.
+    """
+    pending = WebhookEvent.objects.filter(
+        Q(processed_at__isnull=True) | Q(outcome=WebhookEvent.UNMATCHED)
+    ).order_by("received_at")
+    applied = 0
+    for event in pending.iterator():
+        if apply_event(event) == WebhookEvent.APPLIED:
+            applied += 1
+    return applied
@@ -0,0 +1,15 @@
+"""Request instrumentation for the event application.
+
+``PerfMiddleware`` measures a sample of requests (wall time, SQL queries
+and their repeats, outbound provider calls), logs them on ``event.perf``
+and keeps recent samples per view for the ``/dashboard/perf/`` page.
+"""
+
+from .middleware import PerfMiddleware, sample_rate  # noqa: F401
+from .recorder import (  # noqa: F401
+    RequestRecord,
+    current_record,
+    fingerprint,
+    record_outbound,
+)
+from .store import Sample, ViewStats, percentile, reset, view_stats  # noqa: F401
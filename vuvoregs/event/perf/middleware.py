@@ -0,0 +1,141 @@
+"""Sampling middleware measuring each view's time, queries and outbound calls.
+
+A share of requests (``PERF_SAMPLE_RATE``) is measured; the others only
+pay for one random number. For a measured request the middleware records:
+
+- the wall time of the view (until the response is returned, so not the
+  streaming of a streamed body),
+- the number and total time of SQL queries, and the most repeated query
+  shape (an N+1 loop shows up as one shape run many times),
+- the number and time of outbound provider calls (``payments.http.timed``).
+
+Each measured request is logged on ``event.perf`` with the numbers in
+``extra["perf"]`` (a warning when it is slow or repeats a query
+``PERF_REPEATED_QUERY_THRESHOLD`` times or more) and stored for the
+``/dashboard/perf/`` page.
+
+Async views are timed too, but their queries run in worker threads on
+other connections and are not counted.
+"""
+
+from contextlib import ExitStack
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .recorder import QueryCounter, start_record, stop_record
+from .store import Sample, add_sample
+
+logger = logging.getLogger("event.perf")
+
+
+def sample_rate() -> float:
+    """Return the share of requests measured (0 disables measuring)."""
+    return getattr(settings, "PERF_SAMPLE_RATE", 0.1)
+
+
+def _sampled() -> bool:
+    rate = sample_rate()
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+class PerfMiddleware:
+    """Measure a sample of requests; see the module docstring."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """Wrap ``get_response`` (sync or async)."""
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Serve the request, measuring it if it is sampled."""
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not _sampled():
+            return self.get_response(request)
+
+        record, token = start_record()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QueryCounter(record)))
+                start = time.perf_counter()
+                response = self.get_response(request)
+                elapsed = time.perf_counter() - start
+        finally:
+            stop_record(token)
+        self._finish(request, response, record, elapsed)
+        return response
+
+    async def __acall__(self, request):
+        """Serve an async request, timing it if it is sampled."""
+        if not _sampled():
+            return await self.get_response(request)
+
+        record, token = start_record()
+        try:
+            start = time.perf_counter()
+            response = await self.get_response(request)
+            elapsed = time.perf_counter() - start
+        finally:
+            stop_record(token)
+        self._finish(request, response, record, elapsed)
+        return response
+
+    def _finish(self, request, response, record, elapsed):
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        repeated_sql, repeated_count = record.repeated_query()
+        if repeated_count < 2:
+            repeated_sql, repeated_count = "", 0
+        sample = Sample(
+            wall_ms=round(elapsed * 1000, 2),
+            queries=record.queries,
+            sql_ms=round(record.sql_time * 1000, 2),
+            http_ms=round(record.http_time * 1000, 2),
+            status=response.status_code,
+            repeated_count=repeated_count,
+            repeated_sql=repeated_sql,
+        )
+        add_sample(view, sample)
+
+        slow = sample.wall_ms >= getattr(settings, "PERF_SLOW_REQUEST_MS", 1000)
+        repeated = repeated_count >= getattr(
+            settings, "PERF_REPEATED_QUERY_THRESHOLD", 5
+        )
+        logger.log(
+            logging.WARNING if slow or repeated else logging.INFO,
+            "%s %s %s %.1fms queries=%d sql=%.1fms http=%d/%.1fms repeated=%d",
+            request.method,
+            view,
+            sample.status,
+            sample.wall_ms,
+            sample.queries,
+            sample.sql_ms,
+            record.http_calls,
+            sample.http_ms,
+            repeated_count,
+            extra={
+                "perf": {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": view,
+                    "status": sample.status,
+                    "wall_ms": sample.wall_ms,
+                    "queries": sample.queries,
+                    "sql_ms": sample.sql_ms,
+                    "http_calls": record.http_calls,
+                    "http_ms": sample.http_ms,
+                    "repeated_count": repeated_count,
+                    "repeated_sql": repeated_sql,
+                }
+            },
+        )
@@ -0,0 +1,89 @@
+"""Measurements of one request: SQL queries and outbound HTTP calls.
+
+The middleware makes a ``RequestRecord`` current for the request. While it
+is, ``QueryCounter`` (a database execute wrapper) counts and times every
+query, and ``record_outbound()`` (called by ``payments.http.timed``) adds
+the time spent waiting on the payment provider.
+
+Queries are grouped by fingerprint: Django passes parameters separately,
+so the SQL text is already the shape of the query; only ``IN`` lists of
+different lengths are folded together. The same shape run many times in
+one request is the mark of an N+1 loop.
+"""
+
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import re
+import time
+
+# Longest SQL kept in logs and on the dashboard.
+FINGERPRINT_LENGTH = 200
+
+_IN_LIST = re.compile(r"\((?:%s, )+%s\)")
+_current: ContextVar["RequestRecord | None"] = ContextVar("perf_record", default=None)
+
+
+def fingerprint(sql: str) -> str:
+    """Return the shape of a query, the same for every parameter value."""
+    return _IN_LIST.sub("(%s, ...)", sql)
+
+
+@dataclass
+class RequestRecord:
+    """What one request spent, in seconds, on queries and outbound calls."""
+
+    queries: int = 0
+    sql_time: float = 0.0
+    http_calls: int = 0
+    http_time: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    def repeated_query(self) -> tuple[str, int]:
+        """Return the most repeated query shape and its count (``("", 0)`` if none)."""
+        if not self.fingerprints:
+            return "", 0
+        sql, count = self.fingerprints.most_common(1)[0]
+        return sql[:FINGERPRINT_LENGTH], count
+
+
+class QueryCounter:
+    """Database execute wrapper adding every query to a ``RequestRecord``."""
+
+    def __init__(self, record: RequestRecord):
+        """Count the queries into ``record``."""
+        self.record = record
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run the query and record its duration and fingerprint."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record.queries += 1
+            self.record.sql_time += time.perf_counter() - start
+            self.record.fingerprints[fingerprint(sql)] += 1
+
+
+def current_record() -> RequestRecord | None:
+    """Return the record of the request being measured, if any."""
+    return _current.get()
+
+
+def start_record() -> tuple[RequestRecord, object]:
+    """Make a new record current; pass the token to ``stop_record()``."""
+    record = RequestRecord()
+    return record, _current.set(record)
+
+
+def stop_record(token) -> None:
+    """Restore the record that was current before ``start_record()``."""
+    _current.reset(token)
+
+
+def record_outbound(elapsed: float) -> None:
+    """Add an outbound call of ``elapsed`` seconds to the current request."""
+    record = _current.get()
+    if record is not None:
+        record.http_calls += 1
+        record.http_time += elapsed
@@ -0,0 +1,117 @@
+"""Recent request samples per view, kept in the shared cache.
+
+Every worker appends its samples to the same cache entries, so the
+dashboard sees the whole deployment (with a shared ``CACHE_URL``). Only
+the last ``PERF_MAX_SAMPLES`` samples of a view are kept. Appends are not
+atomic: under heavy concurrency a sample can be lost, which sampling
+tolerates anyway.
+"""
+
+from dataclasses import dataclass
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+
+VIEWS_KEY = "perf:views"
+# Seconds samples are kept without new traffic.
+SAMPLES_TIMEOUT = 7 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One measured request (times in milliseconds)."""
+
+    wall_ms: float
+    queries: int
+    sql_ms: float
+    http_ms: float
+    status: int
+    repeated_count: int = 0
+    repeated_sql: str = ""
+
+
+@dataclass(frozen=True)
+class ViewStats:
+    """Percentiles and averages of a view's recent samples."""
+
+    view: str
+    samples: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    avg_queries: float
+    max_queries: int
+    avg_sql_ms: float
+    avg_http_ms: float
+    errors: int
+    repeated_count: int
+    repeated_sql: str
+
+
+def max_samples() -> int:
+    """Return how many recent samples are kept per view."""
+    return getattr(settings, "PERF_MAX_SAMPLES", 500)
+
+
+def samples_key(view: str) -> str:
+    """Return the cache key holding the samples of a view."""
+    return f"perf:samples:{view}"
+
+
+def add_sample(view: str, sample: Sample) -> None:
+    """Append a sample to the view's recent samples."""
+    samples = cache.get(samples_key(view), [])
+    samples.append(sample)
+    cache.set(samples_key(view), samples[-max_samples() :], SAMPLES_TIMEOUT)
+
+    views = cache.get(VIEWS_KEY, set())
+    if view not in views:
+        cache.set(VIEWS_KEY, views | {view}, SAMPLES_TIMEOUT)
+
+
+def percentile(values, p: float) -> float:
+    """Return the ``p``-th percentile (nearest rank) of ``values``."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _stats(view, samples) -> ViewStats:
+    walls = [s.wall_ms for s in samples]
+    worst = max(samples, key=lambda s: s.repeated_count)
+    count = len(samples)
+    return ViewStats(
+        view=view,
+        samples=count,
+        p50_ms=percentile(walls, 50),
+        p95_ms=percentile(walls, 95),
+        p99_ms=percentile(walls, 99),
+        avg_queries=sum(s.queries for s in samples) / count,
+        max_queries=max(s.queries for s in samples),
+        avg_sql_ms=sum(s.sql_ms for s in samples) / count,
+        avg_http_ms=sum(s.http_ms for s in samples) / count,
+        errors=sum(1 for s in samples if s.status >= 500),
+        repeated_count=worst.repeated_count,
+        repeated_sql=worst.repeated_sql,
+    )
+
+
+def view_stats() -> list[ViewStats]:
+    """Return the stats of every sampled view, slowest (p95) first."""
+    views = sorted(cache.get(VIEWS_KEY, set()))
+    stored = cache.get_many([samples_key(view) for view in views])
+    stats = [
+        _stats(view, stored[samples_key(view)])
+        for view in views
+        if stored.get(samples_key(view))
+    ]
+    return sorted(stats, key=lambda s: s.p95_ms, reverse=True)
+
+
+def reset() -> None:
+    """Forget every sample."""
+    views = cache.get(VIEWS_KEY, set())
+    cache.delete_many([samples_key(view) for view in views] + [VIEWS_KEY])
@@ -0,0 +1,20 @@
+"""Pricing package for the event application.
+
+Compiles a race's full price matrix into an immutable in-memory table so
+that prices can be looked up without further database queries.
+"""
+
+from .cards import RaceCard, build_race_cards  # noqa: F401
+from .engine import (  # noqa: F401
+    PriceTable,
+    build_price_table,
+    load_price_tables,
+)
+from .totals import price_athletes, registration_total  # noqa: F401
+from .windows import (  # noqa: F401
+    PriceWindow,
+    TimeWindowIndex,
+    get_window_index,
+    get_window_indexes,
+    invalidate_window_index,
+)
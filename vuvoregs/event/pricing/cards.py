@@ -0,0 +1,40 @@
+"""View models for the race cards and package table of an event.
+
+Everything a race card shows (race type, active pricing label, visible
+packages with their prices, special prices and the "from €X" headline) is
+computed here from one prefetch pass, so the templates never reach back
+into the database.
+"""
+
+from dataclasses import dataclass
+from decimal import Decimal
+
+from .engine import load_price_tables
+
+
+@dataclass(frozen=True)
+class RaceCard:
+    """Display data for one race of an event."""
+
+    race: object
+    pricing_label: str | None
+    packages: tuple
+    from_price: Decimal | None
+
+    @classmethod
+    def from_race(cls, race) -> "RaceCard":
+        """Build a card from a race whose price table is already loaded."""
+        packages = tuple(race.get_packages_with_prices())
+        return cls(
+            race=race,
+            pricing_label=race.get_pricing_label(),
+            packages=packages,
+            # Packages are sorted by individual price, cheapest first
+            from_price=packages[0]["individual_price"] if packages else None,
+        )
+
+
+def build_race_cards(event) -> list[RaceCard]:
+    """Return a card for every race of an event, in one prefetch pass."""
+    races = load_price_tables(event.races.select_related("race_type"))
+    return [RaceCard.from_race(race) for race in races]
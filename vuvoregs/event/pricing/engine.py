@@ -0,0 +1,145 @@
+"""Compiled, in-memory pricing for a single race.
+
+A ``PriceTable`` is built once from a race's base prices, its packages,
+its ``TimeBasedPrice`` windows and its ``RaceSpecialPrice`` rows. After that,
+every price shown or charged for the race is answered from memory:
+
+- package / special price lookups are dictionary hits (O(1))
+- the active time window is found by bisection (O(log n)) in the race's
+  cached ``TimeWindowIndex``
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.db.models import prefetch_related_objects
+
+from .windows import (
+    EMPTY_INDEX,
+    PriceWindow,
+    TimeWindowIndex,
+    get_window_index,
+    get_window_indexes,
+)
+
+ZERO = Decimal("0.00")
+
+PRICING_RELATIONS = ("packages", "special_prices")
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    """Immutable price matrix for one race.
+
+    Lookups take the package, team flag, special price and timestamp and
+    never touch the database.
+    """
+
+    race_id: int
+    base_individual: Decimal
+    base_team: Decimal
+    team_threshold: int | None
+    package_adjustments: MappingProxyType
+    special_discounts: MappingProxyType
+    windows: TimeWindowIndex = EMPTY_INDEX
+
+    @classmethod
+    def compile(cls, race, packages, specials, windows) -> "PriceTable":
+        """Build a table from a race, its loaded rows and its window index."""
+        return cls(
+            race_id=race.pk,
+            base_individual=race.base_price_individual,
+            base_team=race.base_price_team,
+            team_threshold=race.team_discount_threshold,
+            package_adjustments=MappingProxyType({
+                p.pk: Decimal(p.price_adjustment or ZERO) for p in packages
+            }),
+            special_discounts=MappingProxyType({
+                s.pk: s.discount_amount for s in specials
+            }),
+            windows=windows,
+        )
+
+    @property
+    def has_team_discount(self) -> bool:
+        """Return True if team pricing is enabled for the race."""
+        return bool(self.team_threshold and self.base_team > ZERO)
+
+    def window_at(self, when: datetime | None = None) -> PriceWindow | None:
+        """Return the time window active at ``when`` (defaults to now)."""
+        return self.windows.active_at(when)
+
+    def time_adjustment(self, when: datetime | None = None) -> Decimal:
+        """Return the time-based adjustment active at ``when``."""
+        window = self.window_at(when)
+        return window.adjustment if window else ZERO
+
+    def label_at(self, when: datetime | None = None) -> str | None:
+        """Return the label of the time window active at ``when``."""
+        window = self.window_at(when)
+        return window.label if window else None
+
+    def base_price(self, is_team: bool = False) -> Decimal:
+        """Return the race base price, without any adjustments."""
+        if is_team and self.has_team_discount:
+            return self.base_team
+        return self.base_individual
+
+    def package_adjustment(self, package_id: int | None) -> Decimal:
+        """Return the price adjustment of a package of this race."""
+        return self.package_adjustments.get(package_id, ZERO)
+
+    def special_discount(self, special_price_id: int | None) -> Decimal:
+        """Return the discount of a special price of this race."""
+        return self.special_discounts.get(special_price_id, ZERO)
+
+    def price(
+        self,
+        package_id: int | None = None,
+        is_team: bool = False,
+        special_price_id: int | None = None,
+        when: datetime | None = None,
+    ) -> Decimal:
+        """Return the final price for one athlete.
+
+        base (individual/team) + package adjustment + time-based adjustment
+        − special price discount.
+        """
+        return (
+            self.base_price(is_team)
+            + self.package_adjustment(package_id)
+            + self.time_adjustment(when)
+            - self.special_discount(special_price_id)
+        )
+
+
+def build_price_table(race, windows=None) -> PriceTable:
+    """Build the price table for a race.
+
+    Uses prefetched ``packages`` and ``special_prices`` when the race was
+    loaded with them; otherwise loads each relation once. Windows come from
+    the shared window index cache unless given.
+    """
+    return PriceTable.compile(
+        race,
+        packages=race.packages.all(),
+        specials=race.special_prices.all(),
+        windows=windows if windows is not None else get_window_index(race.pk),
+    )
+
+
+def load_price_tables(races):
+    """Attach a compiled price table to every race in a single prefetch pass.
+
+    Returns the races as a list so callers can iterate them again for free.
+    """
+    races = list(races)
+    prefetch_related_objects(races, *PRICING_RELATIONS)
+    indexes = get_window_indexes(race.pk for race in races)
+    for race in races:
+        race.__dict__["price_table"] = build_price_table(
+            race, windows=indexes.get(race.pk, EMPTY_INDEX)
+        )
+    return races
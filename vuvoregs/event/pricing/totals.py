@@ -0,0 +1,75 @@
+"""Batched pricing of a registration's athletes.
+
+``Athlete.get_total_price()`` prices one athlete at a time: it counts the
+team size and reaches for the race, package and price rows on every call.
+Here every athlete of a registration (or of an import) is priced from one
+snapshot: the races' price tables are loaded in a single prefetch pass and
+team sizes are counted once per race, in memory.
+"""
+
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+
+from .engine import ZERO, load_price_tables
+
+
+def _price_tables(athletes) -> dict:
+    """Return ``{race_id: PriceTable}`` for the races of ``athletes``.
+
+    Tables already attached to the athletes' races are reused; the others
+    are loaded together.
+    """
+    from event.models import Race  # event.models imports this package
+
+    tables = {}
+    for athlete in athletes:
+        race = athlete.race if type(athlete).race.is_cached(athlete) else None
+        if race is not None and "price_table" in race.__dict__:
+            tables[race.pk] = race.price_table
+    missing = {athlete.race_id for athlete in athletes} - tables.keys()
+    if missing:
+        for race in load_price_tables(Race.objects.filter(pk__in=missing)):
+            tables[race.pk] = race.price_table
+    return tables
+
+
+def price_athletes(athletes, when: datetime | None = None) -> list[Decimal]:
+    """Return the price of each athlete, in order.
+
+    The athletes are taken as one registration: a race's team price applies
+    when enough of them run that race. Only ``race_id``, ``package_id`` and
+    ``special_price_id`` are read from each athlete, so they may be unsaved.
+    """
+    athletes = list(athletes)
+    tables = _price_tables(athletes)
+    team_sizes = Counter(athlete.race_id for athlete in athletes)
+
+    prices = []
+    for athlete in athletes:
+        table = tables[athlete.race_id]
+        is_team = bool(
+            table.team_threshold and team_sizes[athlete.race_id] >= table.team_threshold
+        )
+        prices.append(
+            table.price(
+                package_id=athlete.package_id,
+                is_team=is_team,
+                special_price_id=athlete.special_price_id,
+                when=when,
+            )
+        )
+    return prices
+
+
+def registration_total(registration, athletes=None) -> Decimal:
+    """Return the amount due for a registration's athletes.
+
+    Pass ``athletes`` if they are already loaded; otherwise only the columns
+    pricing needs are read.
+    """
+    if athletes is None:
+        athletes = registration.athletes.order_by().only(
+            "pk", "registration", "race", "package", "special_price"
+        )
+    return sum(price_athletes(athletes), ZERO)
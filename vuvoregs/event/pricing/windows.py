@@ -0,0 +1,166 @@
+"""Sorted interval index of a race's ``TimeBasedPrice`` windows.
+
+The index is compiled once per race, stored in the shared Django cache and
+answers "which window is active at time t" by bisection.
+
+Invalidation is versioned: every race has a version key in the cache that
+``post_save``/``post_delete`` signals on ``TimeBasedPrice`` bump. Index
+entries are stored under the current version, so a bump makes every worker
+process that shares the cache rebuild on its next lookup.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from event.caching import bump_version, get_versions, invalidate_version
+
+WINDOW_INDEX_TIMEOUT = 60 * 60 * 24
+
+
+@dataclass(frozen=True)
+class PriceWindow:
+    """A time-based pricing window (e.g. Early Bird) for a race."""
+
+    label: str
+    start: datetime
+    end: datetime
+    adjustment: Decimal
+
+
+@dataclass(frozen=True)
+class TimeWindowIndex:
+    """Immutable, bisectable timeline of a race's pricing windows.
+
+    Windows are closed intervals. The timeline is split at every window
+    boundary; each boundary point and each open gap between two points is
+    resolved ahead of time to the window that applies there. When windows
+    overlap, the one with the earliest start wins (the same row the ordered
+    ``.filter(...).first()`` query used to return).
+    """
+
+    windows: tuple = ()
+    points: tuple = ()
+    at_point: tuple = ()
+    between: tuple = ()
+
+    @classmethod
+    def from_rows(cls, rows) -> "TimeWindowIndex":
+        """Compile an index from ``TimeBasedPrice`` rows."""
+        ordered = sorted(rows, key=lambda w: (w.start_date, w.pk or 0))
+        windows = tuple(
+            PriceWindow(
+                label=w.label,
+                start=w.start_date,
+                end=w.end_date,
+                adjustment=w.price_adjustment,
+            )
+            for w in ordered
+        )
+        points = tuple(sorted({w.start for w in windows} | {w.end for w in windows}))
+
+        def first_covering(lo, hi):
+            for idx, window in enumerate(windows):
+                if window.start <= lo and window.end >= hi:
+                    return idx
+            return None
+
+        return cls(
+            windows=windows,
+            points=points,
+            at_point=tuple(first_covering(p, p) for p in points),
+            between=tuple(
+                first_covering(points[i], points[i + 1])
+                for i in range(len(points) - 1)
+            ),
+        )
+
+    def active_at(self, when: datetime | None = None) -> PriceWindow | None:
+        """Return the window active at ``when`` (defaults to now)."""
+        if not self.points:
+            return None
+        when = when or timezone.now()
+        idx = bisect_left(self.points, when)
+        if idx < len(self.points) and self.points[idx] == when:
+            slot = self.at_point[idx]
+        elif 0 < idx < len(self.points):
+            slot = self.between[idx - 1]
+        else:
+            return None
+        return self.windows[slot] if slot is not None else None
+
+
+EMPTY_INDEX = TimeWindowIndex()
+
+
+def _version_key(race_id) -> str:
+    return f"pricing:windows:{race_id}:version"
+
+
+def _index_key(race_id, version) -> str:
+    return f"pricing:windows:{race_id}:v{version}"
+
+
+def _current_versions(race_ids) -> dict:
+    """Return the cached index version of every race, creating missing ones."""
+    keys = {race_id: _version_key(race_id) for race_id in race_ids}
+    found = get_versions(keys.values())
+    return {race_id: found[key] for race_id, key in keys.items()}
+
+
+def get_window_indexes(race_ids) -> dict:
+    """Return ``{race_id: TimeWindowIndex}`` for several races.
+
+    Costs two cache round-trips, plus one query for all races whose index is
+    not cached under the current version.
+    """
+    from event.models import TimeBasedPrice
+
+    race_ids = {race_id for race_id in race_ids if race_id is not None}
+    if not race_ids:
+        return {}
+
+    keys = {
+        race_id: _index_key(race_id, version)
+        for race_id, version in _current_versions(race_ids).items()
+    }
+    cached = cache.get_many(keys.values())
+    indexes = {race_id: cached[key] for race_id, key in keys.items() if key in cached}
+
+    missing = race_ids - indexes.keys()
+    if missing:
+        rows = defaultdict(list)
+        for tbp in TimeBasedPrice.objects.filter(race_id__in=missing):
+            rows[tbp.race_id].append(tbp)
+        built = {
+            race_id: TimeWindowIndex.from_rows(rows[race_id]) for race_id in missing
+        }
+        cache.set_many(
+            {keys[race_id]: index for race_id, index in built.items()},
+            WINDOW_INDEX_TIMEOUT,
+        )
+        indexes.update(built)
+
+    return indexes
+
+
+def get_window_index(race_id) -> TimeWindowIndex:
+    """Return the window index of a single race."""
+    if race_id is None:
+        return EMPTY_INDEX
+    return get_window_indexes([race_id])[race_id]
+
+
+def bump_window_version(race_id) -> None:
+    """Invalidate the cached window index of a race for all processes."""
+    bump_version(_version_key(race_id))
+
+
+def invalidate_window_index(race_id) -> None:
+    """Invalidate now and again after commit (see ``invalidate_version``)."""
+    invalidate_version(_version_key(race_id))
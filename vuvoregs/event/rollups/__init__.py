@@ -0,0 +1,14 @@
+"""Rollups package for the event application.
+
+Maintains per-race daily registration counts and revenue so that the
+dashboards read a few precomputed rows instead of grouping registrations
+by date on every request.
+"""
+
+from .daily import (  # noqa: F401
+    add_registration,
+    adjust_paid,
+    rebuild,
+    remove_registration,
+)
+from .series import INTERVALS, chart_series, period_start  # noqa: F401
@@ -0,0 +1,181 @@
+"""Maintained ``DailyRegistrationStats`` rows.
+
+The dashboards read one small row per race and day instead of grouping
+``Athlete`` joined to ``Registration`` by date on every load. The rows are
+adjusted as registrations happen:
+
+- ``add_registration`` once a registration and its athletes are saved
+  (registration form, team import);
+- ``adjust_paid`` in the transaction that moves a registration into or out
+  of ``paid`` (see ``event.payments.transitions``);
+- ``remove_registration`` before a registration is deleted.
+
+Editing athletes afterwards (e.g. moving one to another race in the admin)
+is not tracked; ``rebuild`` recomputes the rows from the source tables
+(``manage.py rebuild_registration_stats``).
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from event.models import Athlete, DailyRegistrationStats, Registration
+
+BATCH_SIZE = 1000
+ZERO = Decimal("0.00")
+
+
+def _day(created_at):
+    """Return the local day of a registration's creation time."""
+    if timezone.is_aware(created_at):
+        return timezone.localdate(created_at)
+    return created_at.date()
+
+
+def _add(event_id, race_id, day, **deltas) -> None:
+    """Add ``deltas`` to the counters of a row, creating it if needed."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows = DailyRegistrationStats.objects.filter(
+        event_id=event_id, race_id=race_id, day=day
+    )
+    changes = {
+        field: Greatest(F(field) + delta, Value(ZERO if field == "revenue" else 0))
+        for field, delta in deltas.items()
+    }
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            DailyRegistrationStats.objects.create(
+                event_id=event_id,
+                race_id=race_id,
+                day=day,
+                **{field: max(delta, 0) for field, delta in deltas.items()},
+            )
+    except IntegrityError:
+        rows.update(**changes)  # Created concurrently by another request
+
+
+def _apply(registration_id, sign: int, registered: bool, paid: bool) -> None:
+    """Add (``sign=1``) or take off (``-1``) a registration's contribution.
+
+    ``registered`` covers the registration and athlete counts, ``paid`` the
+    paid counts and the revenue.
+    """
+    registration = (
+        Registration.objects.filter(pk=registration_id)
+        .values("event_id", "created_at", "total_amount")
+        .first()
+    )
+    if registration is None:
+        return
+    per_race = dict(
+        Athlete.objects.filter(registration_id=registration_id)
+        .order_by()
+        .values("race_id")
+        .annotate(athletes=Count("id"))
+        .values_list("race_id", "athletes")
+    )
+    if not per_race:
+        return
+    primary = min(per_race)
+    day = _day(registration["created_at"])
+    for race_id, athletes in per_race.items():
+        deltas = {}
+        if registered:
+            deltas["athletes"] = sign * athletes
+            deltas["registrations"] = sign * (race_id == primary)
+        if paid:
+            deltas["paid"] = sign * athletes
+            if race_id == primary:
+                deltas["paid_registrations"] = sign
+                deltas["revenue"] = sign * registration["total_amount"]
+        _add(registration["event_id"], race_id, day, **deltas)
+
+
+def add_registration(registration) -> None:
+    """Count a new registration and its athletes (and payment, if paid)."""
+    _apply(registration.pk, 1, registered=True, paid=registration.is_paid())
+
+
+def adjust_paid(registration, delta: int) -> None:
+    """Count (``delta=1``) or uncount (``-1``) a registration as paid."""
+    if delta:
+        _apply(registration.pk, delta, registered=False, paid=True)
+
+
+def remove_registration(registration) -> None:
+    """Take a registration about to be deleted off the rollups."""
+    _apply(registration.pk, -1, registered=True, paid=registration.is_paid())
+
+
+def rebuild(events=None) -> int:
+    """Recompute the rows (of ``events``, or of every event) from scratch.
+
+    Returns:
+        int: The number of rows written.
+    """
+    athletes = Athlete.objects.order_by()
+    registrations = Registration.objects.order_by()
+    stats = DailyRegistrationStats.objects.all()
+    if events is not None:
+        event_ids = [event.pk for event in events]
+        athletes = athletes.filter(registration__event_id__in=event_ids)
+        registrations = registrations.filter(event_id__in=event_ids)
+        stats = stats.filter(event_id__in=event_ids)
+
+    rows = defaultdict(dict)
+    paid = Q(registration__payment_status="paid")
+    per_race = (
+        athletes.annotate(day=TruncDate("registration__created_at"))
+        .values("registration__event_id", "race_id", "day")
+        .annotate(athletes=Count("pk"), paid=Count("pk", filter=paid))
+    )
+    for row in per_race:
+        key = (row["registration__event_id"], row["race_id"], row["day"])
+        rows[key].update(athletes=row["athletes"], paid=row["paid"])
+
+    # A registration counts under the lowest race ID among its athletes
+    primary = (
+        Athlete.objects.filter(registration=OuterRef("pk"))
+        .order_by("race_id")
+        .values("race_id")[:1]
+    )
+    paid = Q(payment_status="paid")
+    per_registration = (
+        registrations.annotate(primary_race=Subquery(primary))
+        .filter(primary_race__isnull=False)
+        .annotate(day=TruncDate("created_at"))
+        .values("event_id", "primary_race", "day")
+        .annotate(
+            registrations=Count("pk"),
+            paid_registrations=Count("pk", filter=paid),
+            revenue=Sum("total_amount", filter=paid),
+        )
+    )
+    for row in per_registration:
+        key = (row["event_id"], row["primary_race"], row["day"])
+        rows[key].update(
+            registrations=row["registrations"],
+            paid_registrations=row["paid_registrations"],
+            revenue=row["revenue"] or ZERO,
+        )
+
+    with transaction.atomic():
+        stats.delete()
+        DailyRegistrationStats.objects.bulk_create(
+            [
+                DailyRegistrationStats(
+                    event_id=event_id, race_id=race_id, day=day, **counts
+                )
+                for (event_id, race_id, day), counts in rows.items()
+            ],
+            batch_size=BATCH_SIZE,
+        )
+    return len(rows)
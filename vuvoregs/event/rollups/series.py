@@ -0,0 +1,40 @@
+"""Chart series derived from daily rollup rows.
+
+Weekly and monthly series group the daily rows in Python (weeks start on
+Monday, like ``TruncWeek``), so every interval is answered from the same
+few rows.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+INTERVALS = ("daily", "weekly", "monthly")
+
+
+def period_start(day, interval: str):
+    """Return the first day of the ``interval`` period containing ``day``."""
+    if interval == "weekly":
+        return day - timedelta(days=day.weekday())
+    if interval == "monthly":
+        return day.replace(day=1)
+    return day
+
+
+def chart_series(
+    rows, interval: str = "daily", cumulative: bool = False
+) -> tuple[list[str], list[int]]:
+    """Return the labels and counts of ``(day, count)`` pairs per period.
+
+    Periods without rows are left out. With ``cumulative``, each count is
+    the running total up to its period.
+    """
+    totals = defaultdict(int)
+    for day, count in rows:
+        totals[period_start(day, interval)] += count
+
+    labels, counts, running = [], [], 0
+    for start in sorted(totals):
+        running += totals[start]
+        labels.append(start.strftime("%Y-%m-%d"))
+        counts.append(running if cumulative else totals[start])
+    return labels, counts
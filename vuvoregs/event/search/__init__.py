@@ -0,0 +1,22 @@
+"""Search package for the event application.
+
+Keeps a search document per athlete (names and email, accent- and
+case-folded, Greek transliterated to Latin) and searches it through the
+database's full-text index: FTS5 on SQLite, a trigram index on
+PostgreSQL.
+"""
+
+from .index import (  # noqa: F401
+    ensure_index,
+    index_athletes,
+    rebuild,
+    unindex_athletes,
+    update_documents,
+)
+from .normalize import (  # noqa: F401
+    athlete_search_text,
+    normalize,
+    split_words,
+    transliterate,
+)
+from .query import search_athletes, search_words  # noqa: F401
@@ -0,0 +1,156 @@
+"""Database-specific indexes over the athlete search document.
+
+``Athlete.search_text`` holds the document on every database. On top of
+it:
+
+- SQLite keeps an FTS5 table (``event_athlete_search``, rowid = athlete
+  id) that the signal handlers update row by row; queries are FTS prefix
+  matches.
+- PostgreSQL indexes the column itself with a ``pg_trgm`` GIN index, which
+  serves the word-prefix ``LIKE`` conditions, so there is nothing to sync.
+- Other databases run the ``LIKE`` conditions unindexed.
+
+The indexes are not models: migration ``0042_athlete_search_index`` runs
+``ensure_index``. Databases built without migrations (tests, benchmarks)
+call it themselves.
+"""
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "event_athlete_search"
+TRIGRAM_INDEX = "athlete_search_trgm_idx"
+
+
+def _athlete_table() -> str:
+    from event.models import Athlete  # The model imports this package
+
+    return Athlete._meta.db_table
+
+
+class LikeBackend:
+    """Word-prefix ``LIKE`` conditions on the search column."""
+
+    def ensure_index(self, connection) -> None:
+        """Create the index structures, if the backend has any."""
+
+    def drop_index(self, connection) -> None:
+        """Drop the index structures, if the backend has any."""
+
+    def index(self, connection, rows) -> None:
+        """Store ``(athlete id, document)`` rows in the index."""
+
+    def remove(self, connection, pks) -> None:
+        """Drop athletes from the index."""
+
+    def rebuild(self, connection) -> None:
+        """Refill the index from the search column."""
+
+    def match(self, word) -> Q:
+        """Return the condition for a document word starting with ``word``."""
+        return Q(search_text__startswith=word) | Q(search_text__contains=f" {word}")
+
+    def filter(self, queryset, words):
+        """Keep the athletes with a word starting with every one of ``words``."""
+        for word in words:
+            queryset = queryset.filter(self.match(word))
+        return queryset
+
+
+class PostgresBackend(LikeBackend):
+    """``LIKE`` conditions served by a trigram index on the search column."""
+
+    def ensure_index(self, connection) -> None:
+        """Create the pg_trgm extension and the trigram index."""
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {_athlete_table()} "
+                "USING gin (search_text gin_trgm_ops)"
+            )
+
+    def drop_index(self, connection) -> None:
+        """Drop the trigram index (the extension may serve others)."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class SqliteFTSBackend(LikeBackend):
+    """An FTS5 table mirroring the search column."""
+
+    def ensure_index(self, connection) -> None:
+        """Create the FTS5 table, filled from the search column if new."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [FTS_TABLE],
+            )
+            if cursor.fetchone():
+                return
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(document, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        self.rebuild(connection)
+
+    def drop_index(self, connection) -> None:
+        """Drop the FTS5 table."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+    def index(self, connection, rows) -> None:
+        """Insert or replace the documents of ``(athlete id, document)`` rows."""
+        rows = list(rows)
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, document) "
+                    "VALUES (%s, %s)",
+                    rows,
+                )
+
+    def remove(self, connection, pks) -> None:
+        """Delete the documents of the athletes."""
+        pks = list(pks)
+        if pks:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [[pk] for pk in pks]
+                )
+
+    def rebuild(self, connection) -> None:
+        """Copy every athlete's search column into the FTS table."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, document) "
+                f"SELECT id, search_text FROM {_athlete_table()}"
+            )
+
+    def _matching(self, words) -> Q:
+        match = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+        return Q(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+
+    def match(self, word) -> Q:
+        """Return the condition for a document word starting with ``word``."""
+        return self._matching([word])
+
+    def filter(self, queryset, words):
+        """Keep the athletes whose document matches every word as a prefix."""
+        if not words:
+            return queryset
+        return queryset.filter(self._matching(words))
+
+
+_BACKENDS = {"sqlite": SqliteFTSBackend(), "postgresql": PostgresBackend()}
+_DEFAULT = LikeBackend()
+
+
+def get_backend(using="default") -> LikeBackend:
+    """Return the search backend of a database connection."""
+    return _BACKENDS.get(connections[using].vendor, _DEFAULT)
@@ -0,0 +1,91 @@
+"""Keeping the athlete search document and index in sync.
+
+``Athlete.save()`` recomputes the document (``search_text``) and the
+``post_save``/``post_delete`` handlers in ``event.signals`` pass it to the
+database's index. Bulk writes send no signals, so the team import and the
+seeder call ``index_athletes`` themselves. Anything else (raw updates,
+rows written before the index existed) is fixed by ``rebuild``
+(``manage.py rebuild_search_index``). The migration that added the
+column fills it with the same ``update_documents``.
+"""
+
+from django.db import connections, router
+
+from .backends import get_backend
+from .normalize import ATHLETE_SEARCH_FIELDS, athlete_search_text
+
+BATCH_SIZE = 1000
+
+
+def _athlete_db():
+    """Return the search backend and connection of the athletes' database."""
+    from event.models import Athlete  # The model imports this package
+
+    using = router.db_for_write(Athlete)
+    return get_backend(using), connections[using]
+
+
+def ensure_index(using="default") -> None:
+    """Create the database's search index if it does not exist yet."""
+    get_backend(using).ensure_index(connections[using])
+
+
+def index_athletes(athletes) -> None:
+    """Store the (already computed) documents of saved athletes in the index."""
+    backend, connection = _athlete_db()
+    backend.index(connection, [(a.pk, a.search_text) for a in athletes])
+
+
+def unindex_athletes(pks) -> None:
+    """Remove deleted athletes from the index."""
+    backend, connection = _athlete_db()
+    backend.remove(connection, pks)
+
+
+def update_documents(athletes, batch_size: int = BATCH_SIZE) -> int:
+    """Recompute and store the documents of an athlete queryset.
+
+    Works on the historical model of a migration as well.
+
+    Returns:
+        int: The number of athletes whose document changed.
+    """
+    manager = athletes.model._default_manager.db_manager(athletes.db)
+    athletes = athletes.order_by("pk").only(
+        "pk", "search_text", *ATHLETE_SEARCH_FIELDS
+    )
+
+    changed = []
+    updated = 0
+    for athlete in athletes.iterator(chunk_size=batch_size):
+        text = athlete_search_text(athlete)
+        if text != athlete.search_text:
+            athlete.search_text = text
+            changed.append(athlete)
+        if len(changed) >= batch_size:
+            manager.bulk_update(changed, ["search_text"])
+            updated += len(changed)
+            changed = []
+    if changed:
+        manager.bulk_update(changed, ["search_text"])
+        updated += len(changed)
+    return updated
+
+
+def rebuild(events=None, batch_size: int = BATCH_SIZE) -> int:
+    """Recompute the documents of athletes (of ``events``, or all) and reindex.
+
+    Returns:
+        int: The number of athletes whose document changed.
+    """
+    from event.models import Athlete  # The model imports this package
+
+    athletes = Athlete.objects.all()
+    if events is not None:
+        athletes = athletes.filter(registration__event__in=events)
+    updated = update_documents(athletes, batch_size)
+
+    backend, connection = _athlete_db()
+    backend.ensure_index(connection)
+    backend.rebuild(connection)
+    return updated
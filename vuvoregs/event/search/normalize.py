@@ -0,0 +1,109 @@
+"""The athlete search document and query normalization.
+
+Names and emails are folded to one form before they are stored or
+searched: compatibility-decomposed, stripped of accents, case-folded and
+Greek letters transliterated to Latin (ELOT 743, the scheme of Greek
+passports). "Ανδρέας", "ΑΝΔΡΕΑΣ" and "Andreas" all become "andreas", so a
+name typed in either script finds the athlete.
+
+Documents and queries are then split into words here, on everything but
+letters and digits, the way SQLite's FTS5 ``unicode61`` tokenizer splits
+them. The stored document holds only those words, so every backend sees
+the same words and matches the same athletes.
+"""
+
+import re
+import unicodedata
+
+# Athlete fields the search document is built from.
+ATHLETE_SEARCH_FIELDS = ("first_name", "last_name", "email")
+
+_SPACES = re.compile(r"\s+")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Letters after which αυ/ευ/ηυ sound (and are written) "f" rather than "v".
+_VOICELESS = set("θκξπστφχψ")
+_DIGRAPHS = {
+    "ου": "ou",
+    "γγ": "ng",
+    "γκ": "gk",
+    "γξ": "nx",
+    "γχ": "nch",
+}
+_LETTERS = {
+    "α": "a",
+    "β": "v",
+    "γ": "g",
+    "δ": "d",
+    "ε": "e",
+    "ζ": "z",
+    "η": "i",
+    "θ": "th",
+    "ι": "i",
+    "κ": "k",
+    "λ": "l",
+    "μ": "m",
+    "ν": "n",
+    "ξ": "x",
+    "ο": "o",
+    "π": "p",
+    "ρ": "r",
+    "σ": "s",
+    "ς": "s",
+    "τ": "t",
+    "υ": "y",
+    "φ": "f",
+    "χ": "ch",
+    "ψ": "ps",
+    "ω": "o",
+}
+
+
+def fold(text) -> str:
+    """Return ``text`` without accents, case-folded, on single spaces."""
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _SPACES.sub(" ", stripped.casefold()).strip()
+
+
+def transliterate(text: str) -> str:
+    """Transliterate the (folded) Greek letters of ``text`` to Latin."""
+    out = []
+    i = 0
+    while i < len(text):
+        pair = text[i : i + 2]
+        if pair in ("αυ", "ευ", "ηυ"):
+            following = text[i + 2 : i + 3]
+            voiceless = not following.isalpha() or following in _VOICELESS
+            out.append(_LETTERS[pair[0]] + ("f" if voiceless else "v"))
+            i += 2
+        elif pair == "μπ":
+            word_start = i == 0 or not text[i - 1].isalpha()
+            out.append("b" if word_start else "mp")
+            i += 2
+        elif pair in _DIGRAPHS:
+            out.append(_DIGRAPHS[pair])
+            i += 2
+        else:
+            out.append(_LETTERS.get(text[i], text[i]))
+            i += 1
+    return "".join(out)
+
+
+def normalize(text) -> str:
+    """Return the searchable form of ``text`` (folded, in Latin letters)."""
+    return transliterate(fold(text))
+
+
+def split_words(text) -> list[str]:
+    """Return the words of ``text`` in searchable form."""
+    return [word for word in _SEPARATORS.split(normalize(text)) if word]
+
+
+def athlete_search_text(athlete) -> str:
+    """Return the search document of an athlete: names and email, normalized."""
+    return " ".join(
+        split_words(
+            " ".join(str(getattr(athlete, f) or "") for f in ATHLETE_SEARCH_FIELDS)
+        )
+    )
@@ -0,0 +1,37 @@
+"""Athlete search through the database's search index."""
+
+from functools import reduce
+from operator import and_, or_
+
+from django.db.models import Q
+
+from .backends import get_backend
+from .normalize import split_words
+
+
+def search_words(query: str) -> list[str]:
+    """Return the normalized words of a search query."""
+    return split_words(query)
+
+
+def search_athletes(queryset, query: str, fields=()):
+    """Filter athletes to those with a word starting with every query word.
+
+    Accents, case and script do not matter: ``"ανδρ papad"`` finds
+    "Andreas Papadopoulos" and "Ανδρέας Παπαδόπουλος". A query term may
+    instead be contained, as typed, in one of ``fields`` (lookups such as
+    ``"race__name"``), which are not part of the search document.
+    """
+    backend = get_backend(queryset.db)
+    if not fields:
+        words = search_words(query)
+        return backend.filter(queryset, words) if words else queryset
+
+    for term in query.split():
+        words = search_words(term)
+        if not words:
+            continue
+        indexed = reduce(and_, (backend.match(word) for word in words))
+        contained = reduce(or_, (Q(**{f"{f}__icontains": term}) for f in fields))
+        queryset = queryset.filter(indexed | contained)
+    return queryset
@@ -0,0 +1,85 @@
+"""Signal handlers for the event application.
+
+Keeps derived, cached data in sync with the models it is computed from.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from event.caching import invalidate_event
+from event.capacity import adjust_paid_athletes, release_seats
+from event.models import (
+    Athlete,
+    Event,
+    Race,
+    RacePackage,
+    RaceSpecialPrice,
+    Registration,
+    TimeBasedPrice,
+)
+from event.pricing import invalidate_window_index
+from event.rollups import remove_registration
+from event.search import index_athletes, unindex_athletes
+
+
+def _invalidate_race_pages(race_id):
+    event_ids = Race.objects.filter(pk=race_id).values_list("event_id", flat=True)
+    for event_id in event_ids:
+        invalidate_event(event_id)
+
+
+@receiver(post_save, sender=TimeBasedPrice)
+@receiver(post_delete, sender=TimeBasedPrice)
+def time_based_price_changed(sender, instance, **kwargs):
+    """Invalidate the race's cached pricing window index and pages."""
+    invalidate_window_index(instance.race_id)
+    _invalidate_race_pages(instance.race_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_changed(sender, instance, **kwargs):
+    """Invalidate the cached event cards and race pages of the event."""
+    invalidate_event(instance.pk)
+
+
+@receiver(post_save, sender=Race)
+@receiver(post_delete, sender=Race)
+@receiver(post_save, sender=RacePackage)
+@receiver(post_delete, sender=RacePackage)
+def race_changed(sender, instance, **kwargs):
+    """Invalidate the cached pages of the race's (or package's) event."""
+    invalidate_event(instance.event_id)
+
+
+@receiver(post_save, sender=RaceSpecialPrice)
+@receiver(post_delete, sender=RaceSpecialPrice)
+def special_price_changed(sender, instance, **kwargs):
+    """Invalidate the cached price table of the race's event."""
+    _invalidate_race_pages(instance.race_id)
+
+
+@receiver(pre_delete, sender=Registration)
+def registration_deleted(sender, instance, **kwargs):
+    """Give the registration's seats back before its reservation cascades.
+
+    A paid registration also takes its athletes off the paid counters. The
+    registration leaves the dashboard rollups too.
+    """
+    release_seats(instance)
+    if instance.payment_status == "paid":
+        adjust_paid_athletes(instance, -1)
+    remove_registration(instance)
+
+
+@receiver(post_save, sender=Athlete)
+def athlete_saved(sender, instance, **kwargs):
+    """Store the athlete's search document in the search index."""
+    index_athletes([instance])
+
+
+@receiver(post_delete, sender=Athlete)
+def athlete_deleted(sender, instance, **kwargs):
+    """Remove the athlete from the search index."""
+    unindex_athletes([instance.pk])
+
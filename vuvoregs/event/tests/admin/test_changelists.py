@@ -0,0 +1,66 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from event.tests.factories.athlete_factory import (
+    AthleteFactory,
+    RaceSpecialPriceFactory,
+)
+from event.tests.factories.payment_factory import PaymentFactory
+from event.tests.factories.pickup_point_factory import PickupPointFactory
+
+# Queries a changelist page may issue, whatever the number of rows
+QUERY_BUDGET = 15
+
+CHANGELISTS = (
+    "admin:event_athlete_changelist",
+    "admin:event_registration_changelist",
+    "admin:event_race_changelist",
+    "admin:event_racepackage_changelist",
+    "admin:event_pickuppoint_changelist",
+)
+
+
+def _athletes(count):
+    """Athletes of distinct races, each with every relation filled in."""
+    for _ in range(count):
+        athlete = AthleteFactory()
+        athlete.pickup_point = PickupPointFactory(event=athlete.race.event)
+        athlete.special_price = RaceSpecialPriceFactory(race=athlete.race)
+        athlete.save()
+        athlete.registration.payment = PaymentFactory()
+        athlete.registration.save()
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", CHANGELISTS)
+def test_changelist_queries_do_not_grow_with_rows(admin_client, name):
+    """Should load a page of 2 or 20 rows and their filters alike."""
+    url = reverse(name)
+    _athletes(2)
+    few = _count_queries(admin_client, url)
+    _athletes(18)
+    many = _count_queries(admin_client, url)
+
+    assert many == few
+    assert many <= QUERY_BUDGET
+
+
+@pytest.mark.django_db
+def test_registration_list_counts_athletes_in_sql(admin_client):
+    """Should show each registration's athlete count from the annotation."""
+    athlete = AthleteFactory()
+    AthleteFactory(registration=athlete.registration, race=athlete.race)
+
+    response = admin_client.get(reverse("admin:event_registration_changelist"))
+
+    (registration,) = response.context["cl"].result_list
+    assert registration.athlete_count == 2
@@ -0,0 +1,43 @@
+import pytest
+
+from event.benchmarks import SCENARIOS, compare, run_suite
+
+
+def _results(queries=10, min_ms=20.0):
+    return {
+        "results": {
+            "20": {"confirm_registration": {"min_ms": min_ms, "queries": queries}}
+        }
+    }
+
+
+def test_more_queries_is_a_regression():
+    """Should report a scenario that makes more queries than the baseline."""
+    regressions = compare(_results(queries=12), _results(queries=10))
+
+    assert [(r.scenario, r.metric) for r in regressions] == [
+        ("confirm_registration", "queries")
+    ]
+
+
+def test_latency_is_only_compared_on_request():
+    """Should ignore slower runs unless latency is checked, then allow noise."""
+    slower = _results(min_ms=50.0)
+
+    assert compare(slower, _results()) == []
+    assert [r.metric for r in compare(slower, _results(), latency=True)] == ["min_ms"]
+    assert compare(_results(min_ms=18.0), _results(min_ms=10.0), latency=True) == []
+    assert compare(_results(min_ms=4.0), _results(min_ms=1.0), latency=True) == []
+
+
+@pytest.mark.django_db
+def test_every_scenario_runs_on_seeded_data():
+    """Should seed, run every scenario and record its queries."""
+    logged = []
+
+    results = run_suite([6], repeat=1, log=lambda *args: logged.append(args))
+
+    measured = results["results"]["6"]
+    assert set(measured) == {scenario.name for scenario in SCENARIOS}
+    assert all(result["queries"] > 0 for result in measured.values())
+    assert len(logged) == len(SCENARIOS)
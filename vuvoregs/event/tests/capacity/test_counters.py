@@ -0,0 +1,77 @@
+from django.core.management import call_command
+import pytest
+
+from event.models import Event, Race
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.registration_factory import RegistrationFactory
+
+
+def _registration(race, athletes=2):
+    registration = RegistrationFactory(event=race.event)
+    AthleteFactory.create_batch(athletes, race=race, registration=registration)
+    return registration
+
+
+@pytest.mark.django_db
+def test_mark_paid_counts_athletes_once():
+    """Should add the athletes to the event and race counters only once."""
+    race = RaceFactory()
+    registration = _registration(race)
+
+    registration.mark_paid()
+    registration.mark_paid()
+
+    race.refresh_from_db()
+    race.event.refresh_from_db()
+    assert race.paid_athletes == 2
+    assert race.event.paid_athlete_count == 2
+
+
+@pytest.mark.django_db
+def test_mark_failed_after_paid_decrements():
+    """Should take a refunded registration off the counters."""
+    race = RaceFactory()
+    registration = _registration(race)
+    registration.mark_paid()
+
+    registration.mark_failed()
+
+    assert Race.objects.get(pk=race.pk).paid_athletes == 0
+    assert Event.objects.get(pk=race.event_id).paid_athletes == 0
+
+
+@pytest.mark.django_db
+def test_deleting_paid_registration_decrements():
+    """Should take a deleted paid registration off the counters."""
+    race = RaceFactory()
+    registration = _registration(race, athletes=3)
+    registration.mark_paid()
+
+    registration.delete()
+
+    assert Event.objects.get(pk=race.event_id).paid_athletes == 0
+
+
+@pytest.mark.django_db
+def test_available_uses_counters():
+    """Should hide full events and races without aggregating athletes."""
+    race = RaceFactory(max_participants=2, event__max_participants=2)
+    _registration(race).mark_paid()
+
+    assert race.event not in Event.objects.available()
+    assert race not in Race.objects.available()
+
+
+@pytest.mark.django_db
+def test_recount_command_repairs_drift():
+    """Should rebuild counters from paid registrations."""
+    race = RaceFactory()
+    _registration(race).mark_paid()
+    Event.objects.update(paid_athletes=40)
+    Race.objects.update(paid_athletes=0)
+
+    call_command("recount")
+
+    assert Event.objects.get(pk=race.event_id).paid_athletes == 2
+    assert Race.objects.get(pk=race.pk).paid_athletes == 2
@@ -0,0 +1,202 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.timezone import now
+import pytest
+
+from event.capacity import (
+    CapacityExceeded,
+    confirm_seats,
+    has_room,
+    release_expired_holds,
+    release_seats,
+    reserve_seats,
+    reserve_seats_by_race,
+    reserved_seats,
+)
+from event.models import Registration, SeatReservation
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.payment_factory import PaymentFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.registration_factory import RegistrationFactory
+from event.tests.factories.terms_factory import TermsAndConditionsFactory
+
+
+@pytest.mark.django_db
+def test_reserve_blocks_oversell():
+    """Should refuse a hold that would exceed the race capacity."""
+    race = RaceFactory(max_participants=3)
+    reserve_seats(RegistrationFactory(event=race.event), race, 2)
+
+    with pytest.raises(CapacityExceeded):
+        reserve_seats(RegistrationFactory(event=race.event), race, 2)
+
+    assert reserved_seats(race.event, race) == 2
+    assert has_room(race.event, race, seats=1)
+    assert not has_room(race.event, race, seats=2)
+
+
+@pytest.mark.django_db
+def test_event_limit_spans_races():
+    """Should count holds of every race against the event capacity."""
+    race = RaceFactory(event__max_participants=2)
+    other = RaceFactory(event=race.event)
+    reserve_seats(RegistrationFactory(event=race.event), race, 2)
+
+    with pytest.raises(CapacityExceeded):
+        reserve_seats(RegistrationFactory(event=race.event), other, 1)
+
+
+@pytest.mark.django_db
+def test_team_hold_checks_event_total_once():
+    """Should refuse races that fit one by one but overfill the event together."""
+    race = RaceFactory(event__max_participants=3)
+    other = RaceFactory(event=race.event)
+    registration = RegistrationFactory(event=race.event)
+
+    with pytest.raises(CapacityExceeded):
+        reserve_seats_by_race(registration, {race: 2, other: 2})
+
+    assert reserved_seats(race.event) == 0
+    assert not registration.seat_reservations.exists()
+
+    reserve_seats_by_race(registration, {race: 2, other: 1})
+    assert reserved_seats(race.event) == 3
+    assert reserved_seats(race.event, other) == 1
+
+
+@pytest.mark.django_db
+def test_expired_holds_are_swept_on_demand():
+    """Should reclaim seats of expired holds when the race is full."""
+    race = RaceFactory(max_participants=2)
+    stale = RegistrationFactory(event=race.event)
+    reserve_seats(stale, race, 2, timeout=timedelta(seconds=-1))
+
+    reserve_seats(RegistrationFactory(event=race.event), race, 2)
+
+    assert stale.seat_reservations.get().status == SeatReservation.RELEASED
+    assert reserved_seats(race.event, race) == 2
+
+
+@pytest.mark.django_db
+def test_release_expired_holds_keeps_live_and_paid_seats():
+    """Should only release holds that are past their expiry."""
+    race = RaceFactory()
+    live = RegistrationFactory(event=race.event)
+    paid = RegistrationFactory(event=race.event)
+    reserve_seats(live, race, 1)
+    reserve_seats(paid, race, 1, timeout=timedelta(seconds=-1))
+    confirm_seats(paid)
+
+    assert release_expired_holds(now=now() + timedelta(hours=1)) == 1
+    assert reserved_seats(race.event) == 1
+
+
+@pytest.mark.django_db
+def test_confirm_and_release_are_idempotent():
+    """Should count each registration's seats once, however often called."""
+    race = RaceFactory()
+    registration = RegistrationFactory(event=race.event)
+    reserve_seats(registration, race, 2)
+
+    confirm_seats(registration)
+    confirm_seats(registration)
+    assert reserved_seats(race.event, race) == 2
+
+    release_seats(registration)
+    release_seats(registration)
+    assert reserved_seats(race.event, race) == 0
+
+
+@pytest.mark.django_db
+def test_late_payment_reclaims_released_seats():
+    """Should re-count seats when a payment confirms after the hold lapsed."""
+    race = RaceFactory(max_participants=1)
+    registration = RegistrationFactory(event=race.event)
+    reserve_seats(registration, race, 1)
+    release_seats(registration)
+
+    confirm_seats(registration)
+
+    assert reserved_seats(race.event, race) == 1
+    assert not race.is_open()
+
+
+@pytest.mark.django_db
+def test_confirm_without_hold_counts_each_race():
+    """Should claim paid seats in the races the athletes actually run."""
+    race = RaceFactory()
+    other = RaceFactory(event=race.event)
+    registration = RegistrationFactory(event=race.event)
+    AthleteFactory.create_batch(2, registration=registration, race=race)
+    AthleteFactory(registration=registration, race=other)
+
+    confirm_seats(registration)
+    release_seats(registration)
+    confirm_seats(registration)
+
+    assert reserved_seats(race.event, race) == 2
+    assert reserved_seats(race.event, other) == 1
+    assert reserved_seats(race.event) == 3
+
+
+@pytest.mark.django_db
+def test_deleting_registration_frees_seats():
+    """Should give seats back when a held registration is deleted."""
+    race = RaceFactory()
+    registration = RegistrationFactory(event=race.event)
+    reserve_seats(registration, race, 3)
+
+    registration.delete()
+
+    assert reserved_seats(race.event, race) == 0
+
+
+@pytest.mark.django_db
+def test_registration_view_refuses_when_full(client):
+    """Should not create a registration once the race is sold out."""
+    race = RaceFactory(max_participants=1)
+    package = RacePackageFactory(race=race)
+    reserve_seats(RegistrationFactory(event=race.event), race, 1)
+
+    form_data = {
+        "athlete-TOTAL_FORMS": "1",
+        "athlete-INITIAL_FORMS": "0",
+        "athlete-MIN_NUM_FORMS": "0",
+        "athlete-MAX_NUM_FORMS": "1000",
+        "athlete-0-first_name": "Anna",
+        "athlete-0-last_name": "Runner",
+        "athlete-0-email": "anna@example.com",
+        "athlete-0-phone": "123456789",
+        "athlete-0-sex": "Female",
+        "athlete-0-hometown": "Athens",
+        "athlete-0-package": str(package.id),
+    }
+    response = client.post(reverse("registration", args=[race.id]), data=form_data)
+
+    assert response.status_code == 302
+    assert Registration.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_checkout_retry_rechecks_released_hold(client):
+    """Should not resend a buyer to checkout once their released seats are sold."""
+    race = RaceFactory(max_participants=1)
+    TermsAndConditionsFactory(event=race.event)
+    registration = RegistrationFactory(
+        event=race.event, total_amount=20, payment=PaymentFactory()
+    )
+    reserve_seats(registration, race, 1)
+    release_seats(registration)
+    reserve_seats(RegistrationFactory(event=race.event), race, 1)
+
+    response = client.post(
+        reverse("create_payment", args=[registration.pk]), {"agrees_to_terms": "on"}
+    )
+
+    assert response["Location"] == reverse(
+        "event:race_list", kwargs={"event_id": race.event_id}
+    )
+    assert registration.seat_reservations.get().status == SeatReservation.RELEASED
+    assert reserved_seats(race.event, race) == 1
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+from dashboard.columns import event_option_keys
+from dashboard.pagination import decode_cursor, encode_cursor
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from event.models import PackageOption, Registration
+from event.rollups import rebuild
+from event.tests.factories import RegistrationFactory
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+@pytest.fixture
+def athletes():
+    """Seven athletes of one race, each registered a minute apart (oldest first)."""
+    race = RaceFactory()
+    start = timezone.now() - timedelta(hours=1)
+    created = []
+    for number in range(7):
+        registration = RegistrationFactory(event=race.event)
+        Registration.objects.filter(pk=registration.pk).update(
+            created_at=start + timedelta(minutes=number)
+        )
+        created.append(
+            AthleteFactory(
+                race=race, registration=registration, last_name=f"Runner{number}"
+            )
+        )
+    return created
+
+
+def _page(client, event, **params):
+    response = client.get(
+        reverse("dashboard:registrations"),
+        {"event": event.pk, "per_page": 10, **params},
+    )
+    assert response.status_code == 200
+    return response.context["athletes"]
+
+
+def test_cursor_round_trip():
+    """Should decode the creation time and id a cursor was made from."""
+    created_at = timezone.now()
+
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    assert decode_cursor("not-a-cursor") is None
+
+
+@pytest.mark.django_db
+def test_pages_follow_cursors(admin_client, athletes):
+    """Should walk the list newest first without skipping or repeating rows."""
+    event = athletes[0].race.event
+    newest_first = [a.pk for a in reversed(athletes)]
+
+    first = _page(admin_client, event, per_page=3)
+    second = _page(admin_client, event, per_page=3, after=first.next_cursor)
+    third = _page(admin_client, event, per_page=3, after=second.next_cursor)
+
+    assert [a.pk for a in first] == newest_first[:3]
+    assert [a.pk for a in second] == newest_first[3:6]
+    assert [a.pk for a in third] == newest_first[6:]
+    assert not first.has_previous and not third.has_next
+
+    back = _page(admin_client, event, per_page=3, before=third.previous_cursor)
+    assert [a.pk for a in back] == newest_first[3:6]
+    assert back.has_previous and back.has_next
+
+
+@pytest.mark.django_db
+def test_search_matches_word_prefixes(admin_client, athletes):
+    """Should find athletes by the start of any word, ignoring case and accents."""
+    event = athletes[0].race.event
+    athletes[2].first_name = "Ανδρέας"
+    athletes[2].save(update_fields=["first_name"])
+
+    assert [a.pk for a in _page(admin_client, event, search="ΑΝΔΡΕ")] == [
+        athletes[2].pk
+    ]
+    assert [a.pk for a in _page(admin_client, event, search="runner3")] == [
+        athletes[3].pk
+    ]
+    assert list(_page(admin_client, event, search="unner")) == []
+
+
+@pytest.mark.django_db
+def test_total_athletes_follows_the_filters(admin_client, athletes):
+    """Should count the listed athletes, not the whole event, when filtering."""
+    event = athletes[0].race.event
+    rebuild()
+
+    def total(**params):
+        response = admin_client.get(
+            reverse("dashboard:registrations"), {"event": event.pk, **params}
+        )
+        return response.context["total_athletes"]
+
+    assert total() == 7
+    assert total(race=athletes[0].race_id) == 7
+    assert total(search="runner3") == 1
+    assert total(package=athletes[0].package_id) == 1
+
+
+@pytest.mark.django_db
+def test_option_columns_follow_package_changes(athletes):
+    """Should cache an event's option names until an option changes."""
+    package = athletes[0].package
+    event_id = package.event_id
+    PackageOption.objects.create(package=package, name="T-shirt")
+
+    assert event_option_keys(event_id) == ["T-shirt"]
+
+    PackageOption.objects.create(package=package, name="Meal")
+    assert event_option_keys(event_id) == ["Meal", "T-shirt"]
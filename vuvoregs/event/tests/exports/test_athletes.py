@@ -0,0 +1,86 @@
+import csv
+from io import BytesIO, StringIO
+
+from django.urls import reverse
+from openpyxl import load_workbook
+import pytest
+
+from event.exports import athlete_rows, export_athletes, option_names
+from event.models import Athlete, PackageOption
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+def _read_csv(response):
+    content = b"".join(response.streaming_content).decode("utf-8-sig")
+    return list(csv.reader(StringIO(content), delimiter=";"))
+
+
+@pytest.fixture
+def athletes():
+    """Two athletes of one race, one with a T-shirt size chosen."""
+    race = RaceFactory()
+    first = AthleteFactory(race=race, selected_options={"Size": ["M"]})
+    AthleteFactory(race=race, package=first.package, first_name="Jane")
+    PackageOption.objects.create(package=first.package, name="Size")
+    return Athlete.objects.filter(race=race)
+
+
+@pytest.mark.django_db
+def test_rows_are_read_in_one_query(athletes, django_assert_num_queries):
+    """Should join related names instead of querying per athlete."""
+    AthleteFactory.create_batch(5, race=athletes.first().race)
+
+    with django_assert_num_queries(1):
+        rows = list(athlete_rows(athletes, ["id", "race", "package", "pickup_point"]))
+
+    assert len(rows) == 8
+    assert rows[0] == ["id", "race", "package", "pickup_point"]
+
+
+@pytest.mark.django_db
+def test_csv_flattens_package_options(athletes):
+    """Should stream a CSV with one column per package option."""
+    response = export_athletes(
+        athletes,
+        filename="export",
+        columns=["first_name", "dob"],
+        options=option_names(athletes),
+    )
+
+    assert response.streaming
+    assert _read_csv(response) == [
+        ["first_name", "dob", "Size"],
+        ["John", "", "M"],
+        ["Jane", "", ""],
+    ]
+
+
+@pytest.mark.django_db
+def test_xlsx_export(athletes):
+    """Should stream a workbook with the same rows."""
+    response = export_athletes(
+        athletes, filename="export", fmt="xlsx", columns=["first_name"]
+    )
+
+    sheet = load_workbook(BytesIO(b"".join(response.streaming_content))).active
+    assert [row for row in sheet.iter_rows(values_only=True)] == [
+        ("first_name",),
+        ("John",),
+        ("Jane",),
+    ]
+
+
+@pytest.mark.django_db
+def test_export_view_streams_selected_columns(admin_client, athletes):
+    """Should stream the chosen columns of the event's athletes."""
+    event = athletes.first().race.event
+
+    response = admin_client.post(
+        reverse("event_admin:export-athletes"),
+        {"event": event.pk, "format": "csv", "columns": ["last_name", "race"]},
+    )
+
+    rows = _read_csv(response)
+    assert rows[0] == ["last_name", "race"]
+    assert len(rows) == 3
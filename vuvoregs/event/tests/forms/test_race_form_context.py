@@ -0,0 +1,89 @@
+from django.db import connection
+from django.http import QueryDict
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+
+from event.forms import RaceFormContext, athlete_formset_factory
+from event.tests.factories.athlete_factory import RaceSpecialPriceFactory
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.pickup_point_factory import PickupPointFactory
+from event.tests.factories.race_factory import RaceFactory, RaceRoleFactory
+
+
+def _race(min_participants, roles=()):
+    """A race with two packages, special prices and pickup points."""
+    race = RaceFactory(
+        race_type__min_participants=min_participants, race_type__roles=list(roles)
+    )
+    for _ in range(2):
+        RacePackageFactory(race=race).packageoption_set.create(
+            name="Size", options_json=["S", "M"]
+        )
+        RaceSpecialPriceFactory(race=race)
+        PickupPointFactory(event=race.event)
+    return race
+
+
+def _formset_data(race, count):
+    package = race.packages.first()
+    data = QueryDict(mutable=True)
+    data.update({
+        "athlete-TOTAL_FORMS": str(count),
+        "athlete-INITIAL_FORMS": "0",
+        "athlete-MIN_NUM_FORMS": "0",
+        "athlete-MAX_NUM_FORMS": "1000",
+    })
+    for i in range(count):
+        data.update({
+            f"athlete-{i}-first_name": f"Runner {i}",
+            f"athlete-{i}-last_name": "Test",
+            f"athlete-{i}-email": f"runner{i}@example.com",
+            f"athlete-{i}-phone": "123456",
+            f"athlete-{i}-sex": "Female",
+            f"athlete-{i}-hometown": "Athens",
+            f"athlete-{i}-package": str(package.pk),
+            f"athlete-{i}-pickup_point": str(race.event.pickup_points.first().pk),
+            f"athlete-{i}-option-1": "M",
+            f"athlete-{i}-option-1-name": "Size",
+        })
+    return data
+
+
+def _count_queries(func):
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_registration_page_queries_do_not_grow_with_forms(client):
+    """Should render 1 or 50 athlete forms with the same queries."""
+    roles = [RaceRoleFactory(name="Runner"), RaceRoleFactory(name="Cyclist")]
+    one, fifty = _race(1, roles), _race(50, roles)
+
+    def render(race):
+        response = client.get(reverse("registration", args=[race.pk]))
+        assert response.status_code == 200
+        assert len(response.context["formset"].forms) == race.min_participants
+
+    assert _count_queries(lambda: render(fifty)) == _count_queries(
+        lambda: render(one)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [1, 50])
+def test_formset_validates_without_queries(count):
+    """Should clean every form from the shared context."""
+    race = _race(1)
+    context = RaceFormContext.load(race)
+    FormSet = athlete_formset_factory(race)
+    data = _formset_data(race, count)
+
+    def validate():
+        formset = FormSet(data=data, prefix="athlete", context=context)
+        formset.setRequest(object())
+        assert formset.is_valid(), formset.errors
+
+    assert _count_queries(validate) == 0
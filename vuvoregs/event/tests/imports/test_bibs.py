@@ -0,0 +1,117 @@
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+import pytest
+
+from event.imports import import_bibs
+from event.models import Athlete
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+def _csv(*rows, bom=False):
+    text = "id;bib_number\n" + "".join(f"{pk};{bib}\n" for pk, bib in rows)
+    return BytesIO(("﻿" if bom else "").encode() + text.encode())
+
+
+def _bibs():
+    return dict(Athlete.objects.values_list("pk", "bib_number"))
+
+
+@pytest.mark.django_db
+def test_import_updates_bibs_in_chunks(django_assert_max_num_queries):
+    """Should read each chunk with one query and write with bulk_update."""
+    race = RaceFactory()
+    athletes = AthleteFactory.create_batch(5, race=race)
+    file = _csv(*[(a.pk, f"{i + 100}") for i, a in enumerate(athletes)], bom=True)
+
+    # 3 chunk reads, 1 read of taken bibs, 3 update batches, savepoint
+    with django_assert_max_num_queries(9):
+        result = import_bibs(file, chunk_size=2)
+
+    assert result.errors == []
+    assert len(result.changes) == 5
+    assert _bibs() == {a.pk: f"{i + 100}" for i, a in enumerate(athletes)}
+
+
+@pytest.mark.django_db
+def test_import_reports_rejected_rows():
+    """Should skip unknown IDs and bibs taken within the event, by line."""
+    race = RaceFactory()
+    first, second, third = AthleteFactory.create_batch(3, race=race)
+    AthleteFactory(race=race, bib_number="7")
+
+    result = import_bibs(
+        _csv(
+            (first.pk, "1"), (second.pk, "1"), (third.pk, "7"), (99999, "2"), ("x", "3")
+        )
+    )
+
+    assert [(e.line, e.message) for e in result.errors] == [
+        (3, "Bib number is already assigned on line 2."),
+        (4, f"Bib number is already used by athlete {third.pk + 1}."),
+        (5, "No athlete with this ID."),
+        (6, "Invalid athlete ID."),
+    ]
+    assert Athlete.objects.get(pk=first.pk).bib_number == "1"
+    assert Athlete.objects.get(pk=second.pk).bib_number == ""
+
+
+@pytest.mark.django_db
+def test_bibs_are_unique_per_event_only():
+    """Should allow the same bib in two different events."""
+    one, other = AthleteFactory(), AthleteFactory(bib_number="5")
+
+    result = import_bibs(_csv((one.pk, "5")))
+
+    assert result.errors == []
+    assert Athlete.objects.get(pk=one.pk).bib_number == "5"
+    assert Athlete.objects.get(pk=other.pk).bib_number == "5"
+
+
+@pytest.mark.django_db
+def test_dry_run_reports_changes_without_saving():
+    """Should list old and new bibs and leave the athletes untouched."""
+    athlete = AthleteFactory(bib_number="1")
+    unchanged = AthleteFactory(race=athlete.race, bib_number="2")
+
+    result = import_bibs(_csv((athlete.pk, "10"), (unchanged.pk, "2")), dry_run=True)
+
+    assert [(c.athlete_id, c.old, c.new) for c in result.changes] == [
+        (athlete.pk, "1", "10")
+    ]
+    assert result.unchanged == 1
+    assert Athlete.objects.get(pk=athlete.pk).bib_number == "1"
+
+
+@pytest.mark.django_db
+def test_preview_renders_changes(admin_client):
+    """Should render the preview instead of redirecting."""
+    athlete = AthleteFactory()
+    upload = SimpleUploadedFile("bibs.csv", _csv((athlete.pk, "42")).getvalue())
+
+    response = admin_client.post(
+        reverse("event_admin:import-bibs"), {"csv_file": upload, "dry_run": "on"}
+    )
+
+    assert response.status_code == 200
+    assert response.context["result"].changes[0].new == "42"
+    assert Athlete.objects.get(pk=athlete.pk).bib_number == ""
+
+
+@pytest.mark.django_db
+def test_rejected_row_keeps_its_old_bib_taken():
+    """Should not hand out the bib an athlete keeps because their row failed."""
+    race = RaceFactory()
+    holder = AthleteFactory(race=race, bib_number="1")
+    moving = AthleteFactory(race=race, bib_number="2")
+    new = AthleteFactory(race=race)
+
+    result = import_bibs(_csv((moving.pk, "1"), (new.pk, "2")))
+
+    assert [(e.line, e.message) for e in result.errors] == [
+        (2, f"Bib number is already used by athlete {holder.pk}."),
+        (3, f"Bib number is already used by athlete {moving.pk}."),
+    ]
+    assert _bibs() == {holder.pk: "1", moving.pk: "2", new.pk: ""}
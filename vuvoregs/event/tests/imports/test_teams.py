@@ -0,0 +1,213 @@
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from openpyxl import Workbook
+import pytest
+
+from event.capacity import reserved_seats
+from event.imports import import_team
+from event.models import Athlete, PackageOption, Registration
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.pickup_point_factory import PickupPointFactory
+from event.tests.factories.race_factory import (
+    RaceFactory,
+    RaceRoleFactory,
+    RaceTypeFactory,
+)
+
+HEADER = [
+    "race_name",
+    "package_name",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "sex",
+    "hometown",
+    "dob",
+    "pickup_point",
+    "Size",
+]
+
+
+def _sheet(*rows, header=HEADER):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    file = BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    return file
+
+
+def _row(race, package, first_name="Anna", size="M", **overrides):
+    values = {
+        "race_name": race.name,
+        "package_name": package.name,
+        "first_name": first_name,
+        "last_name": "Runner",
+        "email": "anna@example.com",
+        "phone": 6900000000,
+        "sex": "female",
+        "hometown": "Athens",
+        "dob": "15/04/1990",
+        "pickup_point": "",
+        "Size": size,
+        **overrides,
+    }
+    return [values[name] for name in HEADER]
+
+
+@pytest.fixture
+def package():
+    """A package (+5.00) with a required T-shirt size, in a 20/15 race."""
+    package = RacePackageFactory(race=RaceFactory())
+    PackageOption.objects.create(package=package, name="Size", options_json=["M", "L"])
+    return package
+
+
+@pytest.mark.django_db
+def test_team_is_registered_with_team_prices(package, django_assert_max_num_queries):
+    """Should create one registration, bulk-create athletes and price them."""
+    race = package.race
+    point = PickupPointFactory(event=race.event, name="Stadium")
+    rows = [_row(race, package, first_name=f"A{i}") for i in range(30)]
+    rows[0] = _row(race, package, pickup_point="stadium")
+
+    # Per race, not per row: lookups, capacity counters (seeded on first
+    # use) and the seat hold
+    with django_assert_max_num_queries(45):
+        result = import_team(_sheet(*rows), race.event)
+
+    assert result.errors == []
+    registration = Registration.objects.get()
+    assert result.registration == registration
+    # Team price (15.00) + package adjustment (5.00), 30 athletes
+    assert registration.total_amount == Decimal("600.00")
+    athletes = Athlete.objects.filter(registration=registration)
+    assert athletes.count() == 30
+    first = athletes.get(first_name="Anna")
+    assert first.pickup_point == point
+    assert first.sex == "Female"
+    assert first.phone == "6900000000"
+    assert first.selected_options == {"Size": ["M"]}
+    assert str(first.dob) == "1990-04-15"
+
+
+@pytest.mark.django_db
+def test_rejected_rows_are_reported_and_nothing_is_saved(package):
+    """Should report every rejected row by number and save nothing."""
+    race = package.race
+
+    result = import_team(
+        _sheet(
+            _row(race, package),
+            _row(race, package, race_name="Nope"),
+            _row(race, package, size="XXL"),
+            _row(race, package, email="not-an-email"),
+        ),
+        race.event,
+    )
+
+    assert [str(error) for error in result.errors] == [
+        "Row 3: Unknown race 'Nope'.",
+        "Row 4: Invalid value 'XXL' for option 'Size'.",
+        "Row 5: email: Enter a valid email address.",
+    ]
+    assert not Registration.objects.exists()
+    assert not Athlete.objects.exists()
+
+
+@pytest.mark.django_db
+def test_team_holds_its_seats_per_race(package):
+    """Should hold the team's seats in each race it runs."""
+    race = package.race
+    other = RacePackageFactory(race=RaceFactory(event=race.event), name="Basic")
+    rows = [_row(race, package), _row(race, package), _row(other.race, other)]
+
+    result = import_team(_sheet(*rows), race.event)
+
+    assert result.errors == []
+    assert reserved_seats(race.event, race) == 2
+    assert reserved_seats(race.event, other.race) == 1
+    assert result.registration.seat_reservations.count() == 2
+
+
+@pytest.mark.django_db
+def test_team_cannot_overfill_the_event_across_races(package):
+    """Should refuse a team whose races fit one by one but not together."""
+    race = package.race
+    race.event.max_participants = 2
+    race.event.save()
+    other = RacePackageFactory(race=RaceFactory(event=race.event), name="Basic")
+    rows = [_row(race, package), _row(race, package), _row(other.race, other)]
+
+    result = import_team(_sheet(*rows), race.event)
+
+    assert [str(error) for error in result.errors] == [
+        f"Not enough places left in '{race.event.name}'."
+    ]
+    assert not Registration.objects.exists()
+    assert reserved_seats(race.event) == 0
+
+
+@pytest.mark.django_db
+def test_roles_are_checked_against_the_race_type():
+    """Should require one of the race type's roles."""
+    swimmer = RaceRoleFactory(name="Swimmer")
+    race = RaceFactory(race_type=RaceTypeFactory(roles=[swimmer]))
+    package = RacePackageFactory(race=race)
+    header = [name for name in HEADER if name != "Size"] + ["role"]
+
+    def row(role):
+        return _row(race, package)[: len(header) - 1] + [role]
+
+    result = import_team(_sheet(row("swimmer"), row(""), header=header), race.event)
+
+    assert [error.row for error in result.errors] == [3]
+    assert "Invalid role" in result.errors[0].message
+
+
+@pytest.mark.django_db
+def test_missing_columns_are_reported(package):
+    """Should reject a sheet without the required columns."""
+    result = import_team(_sheet(header=["first_name"]), package.race.event)
+
+    assert str(result.errors[0]).startswith("Missing columns: race_name")
+
+
+@pytest.mark.django_db
+def test_upload_view_redirects_to_registration(admin_client, package):
+    """Should open the new registration in the admin."""
+    race = package.race
+    upload = SimpleUploadedFile("team.xlsx", _sheet(_row(race, package)).getvalue())
+
+    response = admin_client.post(
+        reverse("event_admin:import-team"),
+        {"event": race.event.pk, "excel_file": upload},
+    )
+
+    registration = Registration.objects.get()
+    assert response.url == reverse(
+        "admin:event_registration_change", args=[registration.pk]
+    )
+
+
+@pytest.mark.django_db
+def test_upload_view_requires_staff(client, package):
+    """Should send anonymous visitors to the admin login and save nothing."""
+    race = package.race
+    upload = SimpleUploadedFile("team.xlsx", _sheet(_row(race, package)).getvalue())
+
+    response = client.post(
+        reverse("event_admin:import-team"),
+        {"event": race.event.pk, "excel_file": upload},
+    )
+
+    assert response.status_code == 302
+    assert reverse("admin:login") in response.url
+    assert not Registration.objects.exists()
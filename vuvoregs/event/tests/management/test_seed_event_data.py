@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_delete, pre_delete
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from event.models import Athlete, Event, Payment, Registration
+from event.search import search_athletes
+
+
+def _seed(**options):
+    call_command("seed_event_data", stdout=StringIO(), **options)
+    return list(
+        Athlete.objects.order_by("pk").values_list(
+            "first_name", "race__name", "package__name", "selected_options"
+        )
+    )
+
+
+@pytest.fixture
+def staff_user(db):
+    """A staff user to organize the seeded events."""
+    return get_user_model().objects.create_user("staff@example.com", is_staff=True)
+
+
+@pytest.mark.django_db
+def test_seeds_requested_volume(staff_user):
+    """Should create every athlete with a registration and a payment."""
+    _seed(events=2, athletes_per_race=7, paid_ratio=0.5, seed=1, batch_size=4)
+
+    races = sum(event.races.count() for event in Event.objects.all())
+    assert Event.objects.count() == 2
+    assert Athlete.objects.count() == 7 * races
+    assert Payment.objects.count() == Registration.objects.count()
+    assert not Registration.objects.filter(payment__isnull=True).exists()
+    assert Athlete.objects.exclude(selected_options={}).exists()
+
+
+@pytest.mark.django_db
+def test_paid_registrations_are_counted(staff_user):
+    """Should mark paid registrations and sync the paid-athlete counters."""
+    _seed(events=1, athletes_per_race=10, paid_ratio=1, seed=3)
+
+    event = Event.objects.get()
+    assert not Registration.objects.exclude(payment_status="paid").exists()
+    assert event.paid_athletes == Athlete.objects.count()
+
+
+@pytest.mark.django_db
+def test_same_seed_gives_same_data(staff_user):
+    """Should generate identical rows for the same seed."""
+    first = _seed(events=1, athletes_per_race=6, seed=7)
+    second = _seed(events=1, athletes_per_race=6, seed=7)
+
+    assert first == second
+
+
+@pytest.mark.django_db
+def test_registrations_are_backdated_without_touching_the_model(staff_user):
+    """Should spread created_at over the registration window."""
+    _seed(events=1, athletes_per_race=8, seed=2)
+
+    event = Event.objects.get()
+    created = Registration.objects.values_list("created_at", flat=True)
+    assert all(moment >= event.registration_start_date for moment in created)
+    assert len(set(created)) > 1
+    assert Registration._meta.get_field("created_at").auto_now_add
+
+
+@pytest.mark.django_db
+def test_clear_deletes_in_bulk_and_restores_the_handlers(staff_user):
+    """Should clear without per-row handlers and leave them connected."""
+    _seed(events=1, athletes_per_race=5, seed=4)
+    old = Athlete.objects.first()
+
+    with CaptureQueriesContext(connection) as queries:
+        _seed(events=1, athletes_per_race=5, seed=5)
+
+    athlete_deletes = [
+        q["sql"]
+        for q in queries.captured_queries
+        if q["sql"].startswith('DELETE FROM "event_athlete"')
+    ]
+    # One DELETE of the whole table, none row by row
+    assert 'DELETE FROM "event_athlete"' in athlete_deletes
+    assert not any('"event_athlete"."id"' in sql for sql in athlete_deletes)
+    assert not search_athletes(Athlete.objects.all(), old.email).exists()
+    assert pre_delete.has_listeners(Registration)
+    assert post_delete.has_listeners(Athlete)
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.urls import reverse
+from django.utils.timezone import now
+import pytest
+
+from event.models import Payment, TimeBasedPrice
+from event.tests.factories import PaymentFactory, RegistrationFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.time_based_price_factory import TimeBasedPriceFactory
+
+
+@pytest.mark.django_db
+def test_payment_success_matches_transaction_id_in_any_case(client):
+    """Should find the payment whatever the case of the redirect's id."""
+    registration = RegistrationFactory()
+    payment = PaymentFactory(transaction_id="abc-123-def")
+    registration.payment = payment
+    registration.save()
+
+    response = client.get(reverse("viva_payment_success", args=["ABC-123-DEF"]))
+
+    assert response.status_code == 302
+    assert Payment.objects.get(pk=payment.pk).status == "confirmed"
+
+
+@pytest.mark.django_db
+def test_time_based_price_must_end_after_start():
+    """Should reject a time window that ends before it starts."""
+    start = now()
+    with pytest.raises(IntegrityError):
+        TimeBasedPriceFactory(start_date=start, end_date=start - timedelta(days=1))
+
+
+@pytest.mark.django_db
+def test_time_based_price_clean_reports_end_date():
+    """Should report a window that does not end after it starts on its end date."""
+    start = now()
+    window = TimeBasedPriceFactory.build(
+        race=RaceFactory(), start_date=start, end_date=start
+    )
+
+    with pytest.raises(ValidationError) as error:
+        window.full_clean()
+
+    assert error.value.message_dict == {
+        "end_date": ["The end date must be after the start date."]
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite pragma")
+def test_migration_fixes_windows_that_end_before_start():
+    """Should swap backwards windows and drop empty ones before the check."""
+    migration = import_module("event.migrations.0039_hot_lookup_indexes")
+    start = now()
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA ignore_check_constraints = ON")
+    try:
+        backwards = TimeBasedPriceFactory(
+            start_date=start, end_date=start - timedelta(days=1)
+        )
+        TimeBasedPriceFactory(race=backwards.race, start_date=start, end_date=start)
+        valid = TimeBasedPriceFactory(race=backwards.race)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA ignore_check_constraints = OFF")
+
+    migration.fix_time_price_windows(apps, SimpleNamespace(connection=connection))
+
+    assert list(TimeBasedPrice.objects.order_by("pk")) == [backwards, valid]
+    backwards.refresh_from_db()
+    assert backwards.start_date == start - timedelta(days=1)
+    assert backwards.end_date == start
+
+
+@pytest.mark.django_db(transaction=True)
+def test_explain_hot_queries_restores_indexes():
+    """Should print both plans and leave the dropped indexes in place."""
+    RaceFactory()
+    out = StringIO()
+
+    call_command("explain_hot_queries", "--compare", "--repeat=1", stdout=out)
+
+    assert "=== without indexes ===" in out.getvalue()
+    assert "=== with indexes ===" in out.getvalue()
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Payment._meta.db_table
+        )
+    assert "payment_transaction_upper_idx" in constraints
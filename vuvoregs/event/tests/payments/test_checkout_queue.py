@@ -0,0 +1,194 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings as django_settings
+from django.urls import reverse
+from django.utils import timezone
+import pytest
+
+from event.models import CheckoutTask
+from event.payments.checkout_queue import (
+    LEASE_SECONDS,
+    claim_next_task,
+    process_pending,
+    run_task,
+)
+from event.payments.http import REQUEST_TIMEOUT
+from event.payments.smart_checkout import PAYMENT_TIMEOUT
+from event.tests.factories import (
+    CityFactory,
+    RegistrationFactory,
+    TermsAndConditionsFactory,
+)
+from event.tests.payments.viva_stub import VivaStubServer
+from payments.core import PROVIDER_CACHE
+
+
+@pytest.fixture
+def viva_stub(settings):
+    """Point the viva variant at a local stub and turn on async checkout."""
+    server = VivaStubServer().start()
+    handler, config = django_settings.PAYMENT_VARIANTS["viva"]
+    settings.PAYMENT_VARIANTS = {
+        **django_settings.PAYMENT_VARIANTS,
+        "viva": (
+            handler,
+            {
+                **config,
+                "accounts_url": server.url,
+                "api_url": server.url,
+                "checkout_url": f"{server.url}/web/checkout",
+            },
+        ),
+    }
+    settings.ASYNC_CHECKOUT = True
+    PROVIDER_CACHE.pop("viva", None)  # Providers are built once per variant
+    yield server
+    PROVIDER_CACHE.pop("viva", None)
+    server.stop()
+
+
+@pytest.fixture
+def registration():
+    """A registration ready to pay, with event terms."""
+    registration = RegistrationFactory(total_amount=Decimal("25.00"))
+    TermsAndConditionsFactory(event=registration.event)
+    return registration
+
+
+@pytest.fixture
+def start_checkout(client):
+    """Submit the billing form of a registration."""
+    city = CityFactory()
+    data = {
+        "agrees_to_terms": "on",
+        "billing_first_name": "Anna",
+        "billing_last_name": "Runner",
+        "billing_address_1": "1 Street",
+        "billing_address_2": "",
+        "billing_postcode": "11111",
+        "billing_country": str(city.country_id),
+        "billing_region": str(city.region_id),
+        "billing_city": str(city.id),
+        "billing_email": "anna@example.com",
+        "billing_phone": "1234567890",
+    }
+    return lambda registration: client.post(
+        reverse("create_payment", args=[registration.id]), data=data
+    )
+
+
+@pytest.mark.django_db
+def test_checkout_is_created_by_the_worker(
+    client, viva_stub, registration, start_checkout
+):
+    """Should answer without calling Viva and hand over once the order exists."""
+    response = start_checkout(registration)
+
+    assert response.url == reverse("checkout_pending", args=[registration.id])
+    assert viva_stub.requests == []
+    status_url = reverse("checkout_status", args=[registration.id])
+    assert client.get(status_url).json() == {"status": "pending"}
+
+    assert process_pending() == 1
+
+    data = client.get(status_url).json()
+    assert data["status"] == "ready"
+    assert data["redirect_url"].startswith(f"{viva_stub.url}/web/checkout?ref=")
+    pending = client.get(reverse("checkout_pending", args=[registration.id]))
+    assert pending.url == data["redirect_url"]
+
+
+@pytest.mark.django_db
+def test_failed_order_is_retried_then_reported(
+    client, viva_stub, registration, start_checkout
+):
+    """Should back off after a failure and give up after the last attempt."""
+    viva_stub.fail_orders = 10
+    start_checkout(registration)
+
+    assert process_pending() == 1
+    task = CheckoutTask.objects.get()
+    assert task.status == CheckoutTask.PENDING
+    assert "500" in task.error
+    assert claim_next_task() is None  # Backing off
+
+    CheckoutTask.objects.update(available_at=task.created_at)
+    process_pending()
+    CheckoutTask.objects.update(available_at=task.created_at)
+    process_pending()
+
+    assert CheckoutTask.objects.get().status == CheckoutTask.FAILED
+    status_url = reverse("checkout_status", args=[registration.id])
+    assert client.get(status_url).json() == {"status": "failed"}
+
+
+@pytest.mark.django_db
+def test_resubmitting_requeues_a_failed_checkout(
+    viva_stub, registration, start_checkout
+):
+    """Should reuse the payment and queue the order again."""
+    viva_stub.fail_orders = 3
+    start_checkout(registration)
+    CheckoutTask.objects.update(status=CheckoutTask.FAILED, attempts=3)
+
+    start_checkout(registration)
+    process_pending()
+
+    assert CheckoutTask.objects.get().status == CheckoutTask.PENDING
+    assert registration.__class__.objects.get().payment_id is not None
+
+
+@pytest.mark.django_db
+def test_task_is_claimed_once(viva_stub, registration, start_checkout):
+    """Should not let two workers claim the same task."""
+    start_checkout(registration)
+
+    assert claim_next_task() is not None
+    assert claim_next_task() is None
+
+
+@pytest.mark.django_db
+def test_resubmitting_requeues_an_expired_order(
+    viva_stub, registration, start_checkout
+):
+    """Should create a new order once the stored one has timed out."""
+    start_checkout(registration)
+    process_pending()
+    expired_url = CheckoutTask.objects.get().redirect_url
+
+    start_checkout(registration)
+    assert CheckoutTask.objects.get().status == CheckoutTask.READY  # Still open
+
+    CheckoutTask.objects.update(
+        updated_at=timezone.now() - timedelta(seconds=PAYMENT_TIMEOUT + 1)
+    )
+    start_checkout(registration)
+    task = CheckoutTask.objects.get()
+    assert task.status == CheckoutTask.PENDING
+    assert task.redirect_url == ""
+
+    process_pending()
+    task.refresh_from_db()
+    assert task.status == CheckoutTask.READY
+    assert task.redirect_url != expired_url
+
+
+@pytest.mark.django_db
+def test_outcome_is_dropped_after_losing_the_lease(
+    viva_stub, registration, start_checkout
+):
+    """Should keep the outcome of the worker that holds the lease."""
+    assert LEASE_SECONDS > 2 * sum(REQUEST_TIMEOUT)
+    start_checkout(registration)
+    task = claim_next_task()
+    # The lease ran out and another worker claimed the task
+    CheckoutTask.objects.update(
+        locked_until=timezone.now() + timedelta(seconds=LEASE_SECONDS)
+    )
+
+    run_task(task)
+
+    task = CheckoutTask.objects.get()
+    assert task.status == CheckoutTask.RUNNING
+    assert task.redirect_url == ""
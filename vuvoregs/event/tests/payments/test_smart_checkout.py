@@ -0,0 +1,110 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from event.payments import http
+from event.payments.smart_checkout import VivaSmartCheckoutProvider, _token_cache
+
+
+def _response(status=200, **body):
+    return MagicMock(status_code=status, ok=status < 400, json=lambda: body)
+
+
+@pytest.fixture
+def provider():
+    """A sandbox provider with no cached token and no recorded timings."""
+    _token_cache.invalidate(("https://demo-accounts.vivapayments.com", "client"))
+    http.reset_call_timings()
+    return VivaSmartCheckoutProvider(
+        merchant_id="m",
+        api_key="k",
+        client_id="client",
+        client_secret="secret",
+        source_code="1234",
+    )
+
+
+@pytest.fixture
+def session():
+    """Replace the shared HTTP session with a mock."""
+    fake = MagicMock()
+    with patch("event.payments.smart_checkout.get_session", return_value=fake):
+        yield fake
+
+
+def _payment(pk=1):
+    return SimpleNamespace(
+        id=pk,
+        total=Decimal("25.00"),
+        billing_email="a@example.com",
+        billing_phone="",
+        billing_first_name="Anna",
+        billing_last_name="Runner",
+    )
+
+
+def test_token_is_reused_across_orders(provider, session):
+    """Should run one token exchange for several orders on one session."""
+    session.post.side_effect = [
+        _response(access_token="tok", expires_in=3600),
+        _response(orderCode=1),
+        _response(orderCode=2),
+    ]
+
+    assert provider.create_order(_payment(1)) == 1
+    assert provider.create_order(_payment(2)) == 2
+
+    token_calls = [c for c in session.post.call_args_list if "connect/token" in c[0][0]]
+    assert len(token_calls) == 1
+    timings = http.call_timings()
+    assert timings["viva.token"].count == 1
+    assert timings["viva.order"].count == 2
+
+
+def test_expired_token_is_refreshed(provider, session):
+    """Should fetch a new token once the cached one is within the margin."""
+    session.post.side_effect = [
+        _response(access_token="old", expires_in=30),
+        _response(access_token="new", expires_in=3600),
+    ]
+
+    assert provider.get_token() == "old"
+    assert provider.get_token() == "new"
+
+
+def test_revoked_token_is_retried_once(provider, session):
+    """Should drop a rejected token and retry the order with a fresh one."""
+    session.post.side_effect = [
+        _response(access_token="revoked", expires_in=3600),
+        _response(status=401),
+        _response(access_token="fresh", expires_in=3600),
+        _response(orderCode=7),
+    ]
+
+    assert provider.create_order(_payment()) == 7
+    assert session.post.call_args[1]["headers"]["Authorization"] == "Bearer fresh"
+
+
+def test_concurrent_callers_fetch_one_token(provider):
+    """Should not stampede the token endpoint from concurrent threads."""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "tok", 3600
+
+    with patch.object(provider, "fetch_token", side_effect=fetch):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            tokens = list(pool.map(lambda _: provider.get_token(), range(32)))
+
+    assert set(tokens) == {"tok"}
+    assert len(calls) == 1
+
+
+def test_session_is_shared():
+    """Should hand out one pooled session per process."""
+    http.reset_session()
+    assert http.get_session() is http.get_session()
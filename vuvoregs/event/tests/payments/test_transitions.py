@@ -0,0 +1,96 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from event.models import Event, Payment
+from event.payments.transitions import FAILED, PAID, apply_transition
+from event.tests.factories import (
+    PaymentFactory,
+    RegistrationFactory,
+    TermsAndConditionsFactory,
+)
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+@pytest.fixture
+def registration():
+    """A pending registration with two athletes and a payment."""
+    race = RaceFactory()
+    registration = RegistrationFactory(event=race.event)
+    AthleteFactory.create_batch(2, race=race, registration=registration)
+    registration.payment = PaymentFactory()
+    registration.save(update_fields=["payment"])
+    return registration
+
+
+@pytest.mark.django_db
+def test_concurrent_settlements_apply_once(registration):
+    """Should let only the first of the redirect and the webhook win."""
+    assert apply_transition(PAID, payment_id=registration.payment_id) is True
+    assert apply_transition(PAID, registration=registration) is False
+
+    registration.refresh_from_db()
+    assert registration.payment_status == "paid"
+    assert registration.status == "completed"
+    assert registration.payment.status == "confirmed"
+    assert Event.objects.get(pk=registration.event_id).paid_athletes == 2
+
+
+@pytest.mark.django_db
+def test_paid_accepts_event_terms(registration):
+    """Should record the event's terms on the paid registration."""
+    terms = TermsAndConditionsFactory(event=registration.event)
+
+    registration.mark_paid()
+
+    assert registration.agrees_to_terms is True
+    assert registration.agreed_to_terms == terms
+
+
+@pytest.mark.django_db
+def test_failure_after_payment_is_taken_off_the_counters(registration):
+    """Should move paid → failed once and decrement the counters."""
+    apply_transition(PAID, registration=registration)
+
+    assert apply_transition(FAILED, payment_id=registration.payment_id) is True
+    assert apply_transition(FAILED, payment_id=registration.payment_id) is False
+
+    assert Payment.objects.get(pk=registration.payment_id).status == "error"
+    assert Event.objects.get(pk=registration.event_id).paid_athletes == 0
+
+
+@pytest.mark.django_db
+def test_repeated_transition_does_not_write(registration):
+    """Should answer a settled payment without any further writes."""
+    apply_transition(PAID, registration=registration)
+
+    with CaptureQueriesContext(connection) as queries:
+        apply_transition(PAID, payment_id=registration.payment_id)
+
+    writes = [
+        q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")
+    ]
+    # The payment's compare-and-set matches no rows; nothing else runs
+    assert all("WHERE" in sql for sql in writes)
+    assert not any('"event_registration"' in sql for sql in writes)
+    assert not any("paid_athletes" in sql for sql in writes)
+    assert not any("seatreservation" in sql for sql in writes)
+
+
+@pytest.mark.django_db
+def test_registration_moves_with_one_update(registration):
+    """Should move from any allowed state with a single guarded UPDATE."""
+    apply_transition(FAILED, registration=registration)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert apply_transition(PAID, registration=registration) is True
+
+    moves = [
+        q["sql"]
+        for q in queries.captured_queries
+        if q["sql"].startswith('UPDATE "event_registration"')
+    ]
+    assert len(moves) == 1
+    assert '"payment_status" IN' in moves[0]
+    assert Event.objects.get(pk=registration.event_id).paid_athletes == 2
@@ -0,0 +1,89 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from event.models import Event, Race, WebhookEvent
+from event.payments.webhooks import PAYMENT_FAILED, PAYMENT_SUCCEEDED, ingest
+from event.tests.factories import PaymentFactory, RegistrationFactory
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+def _payload(event_type, order_code, transaction_id="TX-1"):
+    return {
+        "EventTypeId": event_type,
+        "EventData": {"TransactionId": transaction_id, "OrderCode": order_code},
+    }
+
+
+@pytest.fixture
+def registration():
+    """A pending registration with two athletes and a Viva payment."""
+    race = RaceFactory()
+    registration = RegistrationFactory(event=race.event)
+    AthleteFactory.create_batch(2, race=race, registration=registration)
+    registration.payment = PaymentFactory(order_code="ORD-1")
+    registration.save(update_fields=["payment"])
+    return registration
+
+
+@pytest.mark.django_db
+def test_retried_notification_is_applied_once(registration):
+    """Should count the athletes once when Viva retries a notification."""
+    payload = _payload(PAYMENT_SUCCEEDED, "ORD-1")
+
+    _, outcome = ingest(payload)
+    _, retry = ingest(payload)
+
+    assert outcome == WebhookEvent.APPLIED
+    assert retry is None
+    assert WebhookEvent.objects.count() == 1
+    registration.refresh_from_db()
+    assert registration.payment_status == "paid"
+    assert registration.payment.status == "confirmed"
+    assert registration.payment.transaction_id == "TX-1"
+    assert Event.objects.get(pk=registration.event_id).paid_athletes == 2
+
+
+@pytest.mark.django_db
+def test_retry_is_answered_without_touching_payments(registration):
+    """Should answer a duplicate with a couple of indexed lookups."""
+    payload = _payload(PAYMENT_SUCCEEDED, "ORD-1")
+    ingest(payload)
+
+    with CaptureQueriesContext(connection) as queries:
+        ingest(payload)
+
+    assert not any("event_payment" in q["sql"] for q in queries.captured_queries)
+    assert len(queries) <= 5  # savepoint, insert, rollback, select
+
+
+@pytest.mark.django_db
+def test_failure_after_success_decrements(registration):
+    """Should take a refunded registration off the paid counters."""
+    ingest(_payload(PAYMENT_SUCCEEDED, "ORD-1"))
+
+    ingest(_payload(PAYMENT_FAILED, "ORD-1", transaction_id="TX-2"))
+
+    registration.refresh_from_db()
+    assert registration.payment_status == "failed"
+    race = registration.athletes.first().race
+    assert Race.objects.get(pk=race.pk).paid_athletes == 0
+
+
+@pytest.mark.django_db
+def test_unmatched_notification_is_replayed():
+    """Should apply a notification that arrived before its payment existed."""
+    event, outcome = ingest(_payload(PAYMENT_SUCCEEDED, "ORD-LATE"))
+    assert outcome == WebhookEvent.UNMATCHED
+
+    registration = RegistrationFactory()
+    registration.payment = PaymentFactory(order_code="ORD-LATE")
+    registration.save(update_fields=["payment"])
+    call_command("process_webhook_events")
+
+    event.refresh_from_db()
+    registration.refresh_from_db()
+    assert event.outcome == WebhookEvent.APPLIED
+    assert registration.payment_status == "paid"
@@ -0,0 +1,80 @@
+"""Local stand-in for the Viva Wallet accounts and checkout APIs.
+
+Serves ``POST /connect/token`` and ``POST /checkout/v2/orders`` over real
+HTTP on localhost, so the provider's session, token cache and worker code
+paths run end to end without reaching Viva.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+
+class VivaStubServer:
+    """Threaded HTTP server answering like the Viva sandbox.
+
+    ``fail_orders`` makes the next N order calls return HTTP 500;
+    ``requests`` records ``(path, headers, body)`` of every call.
+    """
+
+    def __init__(self):
+        """Bind to a free localhost port (call ``start()`` to serve)."""
+        self.fail_orders = 0
+        self.requests = []
+        self._next_order = 1000000000000000
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode()
+                with stub._lock:
+                    stub.requests.append((self.path, dict(self.headers), body))
+
+                if self.path == "/connect/token":
+                    return self._reply(
+                        200, {"access_token": "stub-token", "expires_in": 3600}
+                    )
+                if self.path == "/checkout/v2/orders":
+                    if self.headers.get("Authorization") != "Bearer stub-token":
+                        return self._reply(401, {"message": "Unauthorized"})
+                    with stub._lock:
+                        if stub.fail_orders:
+                            stub.fail_orders -= 1
+                            return self._reply(500, {"message": "Stub failure"})
+                        stub._next_order += 1
+                        order_code = stub._next_order
+                    return self._reply(200, {"orderCode": order_code})
+                return self._reply(404, {"message": "Not found"})
+
+        return Handler
+
+    def calls(self, path):
+        """Return how many requests were made to ``path``."""
+        return sum(1 for p, _, _ in self.requests if p == path)
+
+    def start(self):
+        """Serve requests from a daemon thread."""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Shut the server down and release its port."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
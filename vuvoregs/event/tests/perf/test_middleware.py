@@ -0,0 +1,109 @@
+import logging
+
+from django.contrib.auth.models import Group
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+import pytest
+
+from event.payments.http import timed
+from event.perf import PerfMiddleware, fingerprint, percentile, view_stats
+from event.perf.recorder import start_record, stop_record
+
+
+def _n_plus_one(request):
+    """Run one query per group, the way a loop over a relation would."""
+    for pk in range(6):
+        Group.objects.filter(pk=pk).first()
+    return HttpResponse("ok")
+
+
+def _call(view, path="/loop/"):
+    return PerfMiddleware(view)(RequestFactory().get(path))
+
+
+def test_fingerprint_folds_in_lists():
+    """Should give IN lists of any length the same fingerprint."""
+    short = 'SELECT * FROM "t" WHERE "id" IN (%s, %s)'
+    long = 'SELECT * FROM "t" WHERE "id" IN (%s, %s, %s, %s)'
+    assert fingerprint(short) == fingerprint(long)
+
+
+def test_percentile_nearest_rank():
+    """Should pick the nearest-rank value."""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.django_db
+def test_middleware_records_queries_and_repeats(settings, caplog):
+    """Should count the queries and flag the repeated one as a warning."""
+    settings.PERF_SAMPLE_RATE = 1
+    settings.PERF_REPEATED_QUERY_THRESHOLD = 5
+
+    with caplog.at_level(logging.INFO, logger="event.perf"):
+        _call(_n_plus_one)
+
+    [stats] = view_stats()
+    assert stats.view == "unresolved"
+    assert stats.samples == 1
+    assert stats.max_queries == 6
+    assert stats.repeated_count == 6
+    assert "auth_group" in stats.repeated_sql
+
+    [record] = caplog.records
+    assert record.levelno == logging.WARNING
+    assert record.perf["queries"] == 6
+    assert record.perf["repeated_count"] == 6
+
+
+@pytest.mark.django_db
+def test_middleware_skips_unsampled_requests(settings, caplog):
+    """Should measure nothing when sampling is off."""
+    settings.PERF_SAMPLE_RATE = 0
+
+    with caplog.at_level(logging.INFO, logger="event.perf"):
+        response = _call(_n_plus_one)
+
+    assert response.status_code == 200
+    assert view_stats() == []
+    assert caplog.records == []
+
+
+def test_timed_calls_are_added_to_the_request():
+    """Should add outbound call time to the request being measured."""
+    record, token = start_record()
+    try:
+        with timed("viva.test"):
+            pass
+        with timed("viva.test"):
+            pass
+    finally:
+        stop_record(token)
+
+    assert record.http_calls == 2
+    assert record.http_time > 0
+
+
+@pytest.mark.django_db
+def test_perf_dashboard_is_staff_only(client):
+    """Should send anonymous visitors to the login page."""
+    response = client.get(reverse("dashboard:perf"))
+
+    assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_perf_dashboard_lists_views(admin_client, settings):
+    """Should show the percentiles of the sampled views."""
+    settings.PERF_SAMPLE_RATE = 1
+    admin_client.get(reverse("event:htmx_event_list"))
+
+    response = admin_client.get(reverse("dashboard:perf"))
+
+    assert response.status_code == 200
+    assert [s.view for s in response.context["stats"]] == ["event:htmx_event_list"]
+    assert b"event:htmx_event_list" in response.content
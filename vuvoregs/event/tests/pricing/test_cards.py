@@ -0,0 +1,51 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils.timezone import now
+import pytest
+
+from event.pricing import build_race_cards
+from event.tests.factories.athlete_factory import RaceSpecialPriceFactory
+from event.tests.factories.event_factory import EventFactory
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.time_based_price_factory import TimeBasedPriceFactory
+
+
+@pytest.mark.django_db
+def test_card_from_price_skips_hidden_packages():
+    """Should headline the cheapest visible package, time window included."""
+    race = RaceFactory(base_price_individual=Decimal("20.00"))
+    RacePackageFactory(race=race, price_adjustment=Decimal("8.00"))
+    RacePackageFactory(race=race, price_adjustment=Decimal("3.00"))
+    RacePackageFactory(
+        race=race,
+        price_adjustment=Decimal("0.00"),
+        visible_until=now() - timedelta(days=1),
+    )
+    TimeBasedPriceFactory(race=race, label="Early Bird", price_adjustment=-2)
+
+    [card] = build_race_cards(race.event)
+
+    assert card.from_price == Decimal("21.00")
+    assert card.pricing_label == "Early Bird"
+    assert len(card.packages) == 2
+
+
+@pytest.mark.django_db
+def test_race_cards_query_count_is_constant(client, django_assert_max_num_queries):
+    """Should not run per-race or per-package queries."""
+    event = EventFactory()
+    for _ in range(4):
+        race = RaceFactory(event=event)
+        RacePackageFactory.create_batch(3, race=race)
+        RaceSpecialPriceFactory(race=race)
+        TimeBasedPriceFactory(race=race)
+
+    # event, races, packages, special prices, time windows
+    with django_assert_max_num_queries(5):
+        response = client.get(reverse("event:htmx_race_cards", args=[event.id]))
+
+    assert response.status_code == 200
+    assert response.content.decode().count("From <span") == 4
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+import pytest
+
+from event.models import Race
+from event.pricing import build_price_table, load_price_tables
+from event.tests.factories.athlete_factory import RaceSpecialPriceFactory
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.time_based_price_factory import TimeBasedPriceFactory
+
+
+@pytest.mark.django_db
+def test_price_matrix_lookup():
+    """Should combine base, package, time window and special price."""
+    race = RaceFactory(
+        base_price_individual=Decimal("30.00"),
+        base_price_team=Decimal("20.00"),
+        team_discount_threshold=3,
+    )
+    package = RacePackageFactory(race=race, price_adjustment=Decimal("5.00"))
+    special = RaceSpecialPriceFactory(race=race, discount_amount=Decimal("4.00"))
+    TimeBasedPriceFactory(race=race, price_adjustment=Decimal("-2.00"))
+
+    table = build_price_table(race)
+
+    assert table.price(package.id) == Decimal("33.00")
+    assert table.price(package.id, is_team=True) == Decimal("23.00")
+    assert table.price(package.id, special_price_id=special.id) == Decimal("29.00")
+    later = now() + timedelta(days=5)
+    assert table.price(package.id, when=later) == Decimal("35.00")
+
+
+@pytest.mark.django_db
+def test_race_pricing_methods_share_one_table():
+    """Should not query again once the table is compiled."""
+    race = RaceFactory()
+    RacePackageFactory.create_batch(3, race=race)
+    TimeBasedPriceFactory(race=race)
+    RaceSpecialPriceFactory(race=race)
+    race = Race.objects.get(pk=race.pk)
+    [race] = load_price_tables([race])
+
+    with CaptureQueriesContext(connection) as ctx:
+        race.get_pricing_label()
+        race.get_effective_base_price(is_team=True)
+        for data in race.get_packages_with_prices():
+            data["package"].get_final_price(is_team=False)
+            data["package"].get_active_time_adjustment()
+
+    assert len(ctx.captured_queries) == 0
@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+import pytest
+
+from event.models import Athlete
+from event.pricing import price_athletes
+from event.tests.factories.athlete_factory import (
+    AthleteFactory,
+    RaceSpecialPriceFactory,
+)
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.registration_factory import RegistrationFactory
+from event.tests.factories.time_based_price_factory import TimeBasedPriceFactory
+
+
+@pytest.mark.django_db
+def test_registration_total_query_count(django_assert_max_num_queries):
+    """Should price a 10-person team in a fixed number of queries."""
+    race = RaceFactory(team_discount_threshold=3)
+    package = RacePackageFactory(race=race, price_adjustment=Decimal("5.00"))
+    special = RaceSpecialPriceFactory(race=race, discount_amount=Decimal("4.00"))
+    TimeBasedPriceFactory(race=race, price_adjustment=Decimal("-2.00"))
+    registration = RegistrationFactory(event=race.event)
+    AthleteFactory.create_batch(
+        9, race=race, package=package, registration=registration
+    )
+    AthleteFactory(
+        race=race, package=package, registration=registration, special_price=special
+    )
+    expected = sum(a.get_total_price() for a in registration.athletes.all())
+
+    # athletes, races, packages, special prices, time windows
+    with django_assert_max_num_queries(5):
+        total = registration.calculate_total_amount()
+
+    # 10 × (team 15.00 + package 5.00 − window 2.00) − special 4.00
+    assert total == Decimal("176.00") == expected
+
+
+@pytest.mark.django_db
+def test_team_size_is_counted_per_race():
+    """Should give the team price only in races with enough athletes."""
+    team_race = RaceFactory(team_discount_threshold=2)
+    solo_race = RaceFactory(event=team_race.event, team_discount_threshold=2)
+    athletes = [
+        Athlete(race=team_race, package=RacePackageFactory(race=team_race)),
+        Athlete(race=team_race, package=RacePackageFactory(race=team_race)),
+        Athlete(race=solo_race, package=RacePackageFactory(race=solo_race)),
+    ]
+
+    prices = price_athletes(athletes)
+
+    # Team 15.00 / individual 20.00, plus the package's 5.00
+    assert prices == [Decimal("20.00"), Decimal("20.00"), Decimal("25.00")]
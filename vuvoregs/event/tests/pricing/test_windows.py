@@ -0,0 +1,77 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+import pytest
+
+from event.models import Race
+from event.pricing import get_window_index
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.time_based_price_factory import TimeBasedPriceFactory
+
+
+@pytest.mark.django_db
+def test_window_lookup_picks_earliest_overlapping_window():
+    """Should resolve overlaps like the ordered ``.first()`` query did."""
+    race = RaceFactory()
+    start = now()
+    TimeBasedPriceFactory(
+        race=race,
+        label="Early Bird",
+        start_date=start,
+        end_date=start + timedelta(days=10),
+        price_adjustment=Decimal("-5.00"),
+    )
+    TimeBasedPriceFactory(
+        race=race,
+        label="Late Fee",
+        start_date=start + timedelta(days=5),
+        end_date=start + timedelta(days=20),
+        price_adjustment=Decimal("5.00"),
+    )
+
+    index = get_window_index(race.id)
+
+    def label(offset):
+        window = index.active_at(start + offset)
+        return window.label if window else None
+
+    assert label(timedelta(seconds=-1)) is None
+    assert label(timedelta(0)) == "Early Bird"
+    assert label(timedelta(days=7)) == "Early Bird"
+    assert label(timedelta(days=10)) == "Early Bird"
+    assert label(timedelta(days=15)) == "Late Fee"
+    assert label(timedelta(days=20)) == "Late Fee"
+    assert label(timedelta(days=21)) is None
+
+
+@pytest.mark.django_db
+def test_window_index_is_served_from_cache():
+    """Should not query TimeBasedPrice again for a fresh Race instance."""
+    race = RaceFactory()
+    TimeBasedPriceFactory(race=race, label="Early Bird")
+    assert race.get_pricing_label() == "Early Bird"
+
+    fresh = Race.objects.get(pk=race.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        assert fresh.get_pricing_label() == "Early Bird"
+        assert fresh.get_current_price_adjustment() == Decimal("5.00")
+
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_window_index_invalidated_on_save_and_delete():
+    """Should rebuild after a window is changed or removed."""
+    race = RaceFactory()
+    tbp = TimeBasedPriceFactory(race=race, label="Early Bird")
+    assert get_window_index(race.id).active_at().label == "Early Bird"
+
+    tbp.label = "Super Early"
+    tbp.save()
+    assert get_window_index(race.id).active_at().label == "Super Early"
+
+    tbp.delete()
+    assert get_window_index(race.id).active_at() is None
@@ -0,0 +1,143 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.urls import reverse
+import pytest
+
+from event.models import DailyRegistrationStats
+from event.rollups import add_registration, chart_series, rebuild
+from event.tests.factories import PaymentFactory, RegistrationFactory
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+def _stats(event):
+    return {
+        row.race_id: (
+            row.registrations,
+            row.paid_registrations,
+            row.athletes,
+            row.paid,
+            row.revenue,
+        )
+        for row in DailyRegistrationStats.objects.filter(event=event)
+    }
+
+
+@pytest.fixture
+def registration():
+    """A pending 30.00 registration with two athletes in one race, one in another."""
+    race = RaceFactory()
+    other = RaceFactory(event=race.event)
+    registration = RegistrationFactory(
+        event=race.event, total_amount=Decimal("30.00")
+    )
+    AthleteFactory.create_batch(2, race=race, registration=registration)
+    AthleteFactory(race=other, registration=registration)
+    registration.payment = PaymentFactory()
+    registration.save(update_fields=["payment"])
+    add_registration(registration)
+    return registration
+
+
+@pytest.mark.django_db
+def test_new_registration_is_counted_once(registration):
+    """Should count athletes per race and the registration under one race."""
+    race, other = sorted(set(registration.athletes.values_list("race_id", flat=True)))
+
+    assert _stats(registration.event) == {
+        race: (1, 0, 2, 0, Decimal("0.00")),
+        other: (0, 0, 1, 0, Decimal("0.00")),
+    }
+
+
+@pytest.mark.django_db
+def test_payment_transitions_adjust_paid_counts(registration):
+    """Should count the payment when paid and take it off when it fails."""
+    race, other = sorted(set(registration.athletes.values_list("race_id", flat=True)))
+
+    registration.mark_paid()
+    assert _stats(registration.event) == {
+        race: (1, 1, 2, 2, Decimal("30.00")),
+        other: (0, 0, 1, 1, Decimal("0.00")),
+    }
+
+    registration.mark_failed()
+    assert _stats(registration.event) == {
+        race: (1, 0, 2, 0, Decimal("0.00")),
+        other: (0, 0, 1, 0, Decimal("0.00")),
+    }
+
+
+@pytest.mark.django_db
+def test_deleted_registration_leaves_rollups(registration):
+    """Should take a deleted paid registration off every counter."""
+    registration.mark_paid()
+    event = registration.event
+
+    registration.delete()
+
+    assert set(_stats(event).values()) == {(0, 0, 0, 0, Decimal("0.00"))}
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental_rows(registration):
+    """Should recompute the same rows the events maintained."""
+    registration.mark_paid()
+    maintained = _stats(registration.event)
+
+    DailyRegistrationStats.objects.all().delete()
+    assert rebuild() == 2
+
+    assert _stats(registration.event) == maintained
+
+
+@pytest.mark.django_db
+def test_rebuild_command_limits_to_event(registration):
+    """Should leave the rows of other events alone."""
+    other = AthleteFactory()
+    add_registration(other.registration)
+
+    call_command(
+        "rebuild_registration_stats", "--event", str(registration.event_id)
+    )
+
+    assert DailyRegistrationStats.objects.filter(event=other.race.event).count() == 1
+
+
+def test_chart_series_groups_periods():
+    """Should group days into weeks and months and keep running totals."""
+    rows = [(date(2025, 3, 3), 1), (date(2025, 3, 5), 2), (date(2025, 4, 1), 4)]
+
+    assert chart_series(rows) == (
+        ["2025-03-03", "2025-03-05", "2025-04-01"],
+        [1, 2, 4],
+    )
+    assert chart_series(rows, "weekly") == (["2025-03-03", "2025-03-31"], [3, 4])
+    assert chart_series(rows, "monthly", cumulative=True) == (
+        ["2025-03-01", "2025-04-01"],
+        [3, 7],
+    )
+
+
+@pytest.mark.django_db
+def test_dashboards_read_rollups(admin_client, registration):
+    """Should answer the summary and the chart from the rollup rows."""
+    registration.mark_paid()
+    event = registration.event
+
+    response = admin_client.get(reverse("dashboard:event_dashboard", args=[event.pk]))
+    assert response.context["total_regs"] == 1
+    assert response.context["paid_regs"] == 1
+    assert response.context["total_athletes"] == 3
+
+    response = admin_client.get(
+        reverse("dashboard:event_chart_data", args=[event.pk]),
+        {"interval": "weekly", "cumulative": "true"},
+    )
+    assert response.json()["counts"] == [3]
+
+    response = admin_client.get(reverse("dashboard:home"))
+    assert response.context["total_regs"] == 1
+    assert response.context["today_regs"] == 1
@@ -0,0 +1,143 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+import pytest
+
+from event.models import Athlete
+from event.search import normalize, search_athletes, transliterate
+from event.search.backends import LikeBackend, SqliteFTSBackend
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+def test_normalize_folds_case_and_accents():
+    """Should give the same text for any case and accents."""
+    assert normalize("  Ανδρέας ΠΑΠΑΔΌΠΟΥΛΟΣ ") == "andreas papadopoulos"
+    assert normalize("José") == normalize("JOSE") == "jose"
+
+
+def test_transliterate_follows_elot_743():
+    """Should write Greek digraphs the way Greek passports do."""
+    assert transliterate("ευαγγελια") == "evangelia"
+    assert transliterate("ευθυμιος") == "efthymios"
+    assert transliterate("μπακογιαννη") == "bakogianni"
+    assert transliterate("λαμπρος") == "lampros"
+    assert transliterate("γκικας") == "gkikas"
+
+
+@pytest.mark.django_db
+def test_save_keeps_search_text_current():
+    """Should refresh the text when a name is saved with update_fields."""
+    athlete = AthleteFactory(first_name="Anna", last_name="Smith")
+    assert athlete.search_text == "anna smith john example com"
+
+    athlete.last_name = "Jones"
+    athlete.save(update_fields=["last_name"])
+
+    athlete.refresh_from_db()
+    assert athlete.search_text == "anna jones john example com"
+
+
+@pytest.mark.django_db
+def test_search_matches_across_scripts_and_follows_writes():
+    """Should find Greek names typed in Latin and keep the index in sync."""
+    athlete = AthleteFactory(first_name="Γιώργος", last_name="Παπαδόπουλος")
+    AthleteFactory(first_name="Anna", last_name="Smith")
+
+    for query in ("papad", "ΠΑΠΑΔ", "γιωργ papa", "giorg"):
+        assert list(search_athletes(Athlete.objects.all(), query)) == [athlete]
+    assert not search_athletes(Athlete.objects.all(), "opoulos").exists()
+
+    athlete.last_name = "Nikolaou"
+    athlete.save()
+    assert not search_athletes(Athlete.objects.all(), "papad").exists()
+    assert search_athletes(Athlete.objects.all(), "nikol").get() == athlete
+
+    athlete.delete()
+    assert not search_athletes(Athlete.objects.all(), "nikol").exists()
+
+
+@pytest.fixture(params=[SqliteFTSBackend, LikeBackend], ids=["fts5", "like"])
+def backend(request, monkeypatch):
+    """Run the search through the FTS5 index, then through LIKE conditions."""
+    monkeypatch.setattr(
+        "event.search.query.get_backend", lambda using: request.param()
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("query", "found"),
+    [
+        ("anna", True),
+        ("runner", True),
+        ("exam", True),
+        ("anna.runner@example.com", True),
+        ("Jean-Pier", True),
+        ("pier", True),
+        ("ΑΝΝΑ", True),
+        ("nna", False),
+        ("unner", False),
+        ("anna smith", False),
+    ],
+)
+def test_backends_find_the_same_athletes(backend, query, found):
+    """Should give the same results on every database backend."""
+    athlete = AthleteFactory(
+        first_name="Anna", last_name="Jean-Pierre", email="anna.runner@example.com"
+    )
+    AthleteFactory(first_name="Maria", last_name="Smith", email="m@test.org")
+
+    result = list(search_athletes(Athlete.objects.all(), query))
+
+    assert result == ([athlete] if found else [])
+
+
+@pytest.mark.django_db
+def test_race_name_is_searched_next_to_the_index(backend):
+    """Should match a term in the race name or an indexed word."""
+    marathon = RaceFactory(name="Marathon")
+    athlete = AthleteFactory(first_name="Anna", race=marathon)
+    AthleteFactory(first_name="Anna", race=RaceFactory(name="5K Fun Run"))
+    AthleteFactory(first_name="Maria", race=marathon)
+    fields = ("race__name",)
+
+    assert search_athletes(Athlete.objects.all(), "anna marath", fields).get() == (
+        athlete
+    )
+    assert search_athletes(Athlete.objects.all(), "athon", fields).count() == 2
+
+
+@pytest.mark.django_db
+def test_admin_search_uses_index(admin_client):
+    """Should filter the athlete changelist through the search index."""
+    AthleteFactory(first_name="Ελένη", last_name="Μπακογιάννη")
+    race_name = AthleteFactory(first_name="Anna", last_name="Smith").race.name
+
+    response = admin_client.get(
+        reverse("admin:event_athlete_changelist"), {"q": "bakog"}
+    )
+
+    assert response.status_code == 200
+    assert [a.last_name for a in response.context["cl"].result_list] == [
+        "Μπακογιάννη"
+    ]
+
+    response = admin_client.get(
+        reverse("admin:event_athlete_changelist"), {"q": "smi " + race_name}
+    )
+    assert [a.last_name for a in response.context["cl"].result_list] == ["Smith"]
+
+
+@pytest.mark.django_db
+def test_rebuild_command_fixes_stale_text():
+    """Should recompute the text of rows written without it."""
+    athlete = AthleteFactory(first_name="Anna", last_name="Smith")
+    Athlete.objects.filter(pk=athlete.pk).update(search_text="")
+
+    call_command("rebuild_search_index", stdout=StringIO())
+
+    athlete.refresh_from_db()
+    assert athlete.search_text == "anna smith john example com"
+    assert search_athletes(Athlete.objects.all(), "smi").get() == athlete
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.timezone import now
+import pytest
+
+from event.capacity import reserve_seats
+from event.models import Event
+from event.tests.factories.event_factory import EventFactory
+from event.tests.factories.race_factory import RaceFactory
+from event.tests.factories.registration_factory import RegistrationFactory
+
+
+@pytest.mark.django_db
+def test_for_listing_matches_is_registration_open():
+    """Should compute the same open state as Event.is_registration_open."""
+    open_event = EventFactory()
+    EventFactory(date=now().date() - timedelta(days=1))
+    EventFactory(registration_start_date=now() + timedelta(days=1))
+    EventFactory(is_available=False)
+    full = RaceFactory(event__max_participants=1)
+    reserve_seats(RegistrationFactory(event=full.event), full, 1)
+
+    for event in Event.objects.for_listing():
+        assert event.registration_open == event.is_registration_open()
+    assert Event.objects.for_listing().get(pk=open_event.pk).registration_open
+
+
+@pytest.mark.django_db
+def test_event_cards_render_in_one_query(client, django_assert_num_queries):
+    """Should render every card from a single query, however many events."""
+    for _ in range(5):
+        event = EventFactory(max_participants=50)
+        RaceFactory.create_batch(2, event=event)
+
+    with django_assert_num_queries(1):
+        response = client.get(reverse("event:htmx_event_list"))
+
+    assert response.status_code == 200
+    assert response.content.decode().count("2 races") == 5
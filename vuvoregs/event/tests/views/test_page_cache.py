@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import translation
+import pytest
+
+from event.tests.factories.athlete_factory import AthleteFactory
+from event.tests.factories.event_factory import EventFactory
+from event.tests.factories.package_factory import RacePackageFactory
+from event.tests.factories.race_factory import RaceFactory
+
+
+@pytest.fixture(params=["locmem", "file"])
+def page_cache(request, settings, tmp_path):
+    """Run the test against the local-memory and the file-based backend."""
+    if request.param == "file":
+        backend = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path / "cache"),
+        }
+    else:
+        backend = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    settings.CACHES = {"default": backend}
+    yield cache
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_race_cards_hit_skips_database(client, page_cache, django_assert_num_queries):
+    """Should serve a repeated race cards request without queries."""
+    race = RaceFactory()
+    RacePackageFactory(race=race)
+    url = reverse("event:htmx_race_cards", args=[race.event_id])
+    first = client.get(url)
+
+    with django_assert_num_queries(0):
+        second = client.get(url)
+
+    assert second.content == first.content
+
+
+@pytest.mark.django_db
+def test_package_change_invalidates_race_cards(client, page_cache):
+    """Should re-render the race cards after a package price changes."""
+    race = RaceFactory(base_price_individual=Decimal("20.00"))
+    package = RacePackageFactory(race=race, price_adjustment=Decimal("0.00"))
+    url = reverse("event:htmx_race_cards", args=[race.event_id])
+    assert "€20.00" in client.get(url).content.decode()
+
+    package.price_adjustment = Decimal("5.00")
+    package.save()
+
+    assert "€25.00" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_payment_refreshes_event_card_count(client, page_cache):
+    """Should keep the registered count on the event cards accurate."""
+    race = RaceFactory()
+    athlete = AthleteFactory(race=race)
+    url = reverse("event:htmx_event_list")
+    assert "0 registered" in client.get(url).content.decode()
+
+    athlete.registration.mark_paid()
+
+    assert "1 registered" in client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_cache_is_per_language(client, page_cache):
+    """Should not serve one language's cards to the other."""
+    EventFactory(name_en="Night Run", name_el="Νυχτερινό Τρέξιμο")
+
+    with translation.override("en"):
+        english = client.get(reverse("event:htmx_event_list")).content.decode()
+    with translation.override("el"):
+        greek = client.get(reverse("event:htmx_event_list")).content.decode()
+
+    assert "Night Run" in english
+    assert "Νυχτερινό Τρέξιμο" in greek
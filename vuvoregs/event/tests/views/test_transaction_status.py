@@ -0,0 +1,77 @@
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+import pytest
+
+from event.payments.status_events import (
+    CHECK_INTERVAL,
+    notify_status,
+    wait_for_status_change,
+)
+from event.payments.webhooks import PAYMENT_SUCCEEDED, ingest
+from event.tests.factories import PaymentFactory, RegistrationFactory
+
+
+@pytest.fixture
+def payment():
+    """A waiting payment linked to a registration."""
+    registration = RegistrationFactory()
+    registration.payment = PaymentFactory(transaction_id="TX-WAIT")
+    registration.save(update_fields=["payment"])
+    return registration.payment
+
+
+@pytest.mark.django_db
+def test_confirmed_payment_answers_at_once(client, payment, django_assert_num_queries):
+    """Should not park a settled transaction and look it up in one query."""
+    payment.status = "confirmed"
+    payment.save(update_fields=["status"])
+    url = reverse("wait_transaction_status", args=["TX-WAIT"])
+
+    with django_assert_num_queries(1):
+        response = client.get(url)
+
+    assert response.json() == {
+        "status": "confirmed",
+        "redirect_url": reverse("payment_success", args=[payment.registration.id]),
+    }
+
+
+@pytest.mark.django_db
+def test_waiting_payment_times_out_with_heartbeat(client, payment):
+    """Should answer "waiting" once the heartbeat timeout passes."""
+    url = reverse("wait_transaction_status", args=["TX-WAIT"])
+
+    response = client.get(url, {"timeout": "0.1"})
+
+    assert response.json() == {"status": "waiting"}
+
+
+@pytest.mark.django_db
+def test_webhook_wakes_waiters(payment, django_capture_on_commit_callbacks):
+    """Should publish a new status version once the webhook is applied."""
+    seen = async_to_sync(wait_for_status_change)("TX-WAIT", None, 0)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ingest({
+            "EventTypeId": PAYMENT_SUCCEEDED,
+            "EventData": {"TransactionId": "TX-WAIT", "OrderCode": payment.order_code},
+        })
+
+    assert seen is False
+    assert async_to_sync(wait_for_status_change)("TX-WAIT", None, 0) is True
+
+
+def test_notify_wakes_parked_request_early():
+    """Should wake an in-process waiter without waiting for a cache check."""
+    timer = threading.Timer(0.1, notify_status, args=["TX-EARLY"])
+    timer.start()
+
+    start = time.monotonic()
+    changed = async_to_sync(wait_for_status_change)("TX-EARLY", None, 5)
+
+    timer.join()
+    assert changed is True
+    assert time.monotonic() - start < CHECK_INTERVAL
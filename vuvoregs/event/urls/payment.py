@@ -3,7 +3,7 @@
 Includes:
 - Registration payment creation and success/failure views
 - Viva Wallet success/failure callbacks
-- AJAX status checks
+- AJAX status checks (plain and long-poll)
 - Webhook endpoint for payment provider events
 """
 
@@ -17,6 +17,7 @@ from event.views import (
     viva_payment_failure,
     viva_payment_success,
     viva_success_redirect_handler,
+    wait_transaction_status,
 )
 
 urlpatterns = [
@@ -60,4 +61,10 @@ urlpatterns = [
         check_transaction_status,
         name="check_transaction_status",
     ),
+    # Long-poll: parked until the webhook settles the transaction
+    path(
+        "payment/wait-status/<str:transaction_id>/",
+        wait_transaction_status,
+        name="wait_transaction_status",
+    ),
 ]
@@ -4,11 +4,14 @@ Includes routes for:
 - Multi-athlete race registration
 - T&Cs confirmation step
 - Payment creation endpoint
+- "Preparing checkout" page and its status endpoint
 """
 
 from django.urls import path
 
 from event.views import (
+    checkout_pending,
+    checkout_status,
     confirm_registration,
     create_payment,
     registration,
@@ -30,4 +33,14 @@ urlpatterns = [
         create_payment,
         name="create_payment",
     ),
+    path(
+        "registration/checkout/<int:registration_id>/",
+        checkout_pending,
+        name="checkout_pending",
+    ),
+    path(
+        "registration/checkout/<int:registration_id>/status/",
+        checkout_status,
+        name="checkout_status",
+    ),
 ]
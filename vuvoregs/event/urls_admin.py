@@ -1,13 +1,17 @@
 """URL configuration for the admin views of the 'event' app.
 
 This module defines URL patterns for administrative tasks such as importing bibs
-and exporting athlete data. These views are used to manage event-related data
-through the admin interface.
+and team registrations and exporting athlete data. These views are used to
+manage event-related data through the admin interface.
 """
 
 from django.urls import path
 
-from event.admin.admin_views import export_athletes_view, import_bibs_view
+from event.admin.admin_views import (
+    export_athletes_view,
+    import_bibs_view,
+    team_import_view,
+)
 
 app_name = "event_admin"
 
@@ -18,4 +22,5 @@ urlpatterns = [
     path(
         "export-athletes/", export_athletes_view, name="export-athletes"
     ),  # URL for exporting athlete data  # noqa: E501
+    path("import-team/", team_import_view, name="import-team"),
 ]
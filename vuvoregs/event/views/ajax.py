@@ -6,8 +6,9 @@ Includes:
 - Manual fallback payment status refresh
 """
 
+import logging
+
 from cities_light.models import City, Region
-from django.conf import settings
 from django.contrib import messages
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
@@ -19,6 +20,8 @@ from event.models import (
     Registration,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @require_GET
 def package_options(request, package_id):
@@ -113,8 +116,9 @@ def check_payment_status(request, registration_id):
         messages.error(request, "No payment found for this registration.")
         return redirect("payment_failure", registration_id=registration.id)
 
-    if settings.DEBUG:
-        print("🔄 Manually fetching payment status for registration", registration.id)
+    logger.debug(
+        "Manually fetching payment status for registration %s", registration.id
+    )
 
     registration.payment.fetch()
     return redirect("payment_success", registration_id=registration.id)
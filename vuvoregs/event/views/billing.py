@@ -7,17 +7,23 @@ Responsibilities:
 - Tracking webhook and billing state
 """
 
+import logging
+
 from cities_light.models import City, Country, Region
-from django.conf import settings
 from django.contrib import messages
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from requests.exceptions import HTTPError
 
-from event.models import Payment, Registration
+from event.capacity import CapacityExceeded, extend_hold
+from event.models import CheckoutTask, Payment, Registration
+from event.payments.checkout_queue import async_checkout_enabled, enqueue_checkout
+from event.payments.smart_checkout import PAYMENT_TIMEOUT
 from payments import RedirectNeeded
 
+logger = logging.getLogger(__name__)
+
 
 def payment_success(request, registration_id):
     """Display a success page after a successful payment.
@@ -59,13 +65,15 @@ def create_payment(request, registration_id):
 
     Steps:
     - Validate agreement to terms
+    - Keep the seat hold alive for the checkout's payment timeout
     - Avoid duplicate payment creation
     - Collect billing address (with cities-light)
     - Create and store payment
-    - Redirect to provider
+    - Redirect to provider (or, with ``ASYNC_CHECKOUT``, queue the order and
+      show the "preparing checkout" page)
 
     Redirects:
-        - On success → Viva Wallet
+        - On success → Viva Wallet (or checkout_pending)
         - On error → confirm_registration
     """
     registration = get_object_or_404(Registration, pk=registration_id)
@@ -86,8 +94,21 @@ def create_payment(request, registration_id):
     registration.agreed_to_terms = registration.event.terms
     registration.save(update_fields=["agrees_to_terms", "agreed_to_terms"])
 
+    # 🎟 Keep the seats held for as long as the checkout may take (retries too)
+    try:
+        extend_hold(registration, PAYMENT_TIMEOUT)
+    except CapacityExceeded:
+        messages.error(
+            request,
+            "Sorry, the places held for this registration are no longer available.",
+        )
+        return redirect("event:race_list", event_id=registration.event_id)
+
     # 🚫 Prevent creating a second payment
     if registration.payment:
+        if async_checkout_enabled():
+            enqueue_checkout(registration.payment)
+            return redirect("checkout_pending", registration_id=registration.id)
         try:
             form = registration.payment.get_form()
         except RedirectNeeded as redirect_to:
@@ -125,6 +146,11 @@ def create_payment(request, registration_id):
     registration.payment = payment
     registration.save(update_fields=["payment"])
 
+    # ⏳ Let the checkout worker talk to Viva Wallet
+    if async_checkout_enabled():
+        enqueue_checkout(payment)
+        return redirect("checkout_pending", registration_id=registration.id)
+
     # 🚀 Get the checkout form and redirect to Viva Wallet
     try:
         form = payment.get_form()  # noqa: F841
@@ -133,8 +159,9 @@ def create_payment(request, registration_id):
 
     # ⚠️ Handle known errors
     except HTTPError as e:
-        if settings.DEBUG:
-            print("❌ Viva Wallet API error:", e)
+        logger.warning(
+            "Viva Wallet API error for registration %s: %s", registration.id, e
+        )
         messages.error(
             request,
             "There was a problem connecting to Viva Wallet. "
@@ -142,9 +169,10 @@ def create_payment(request, registration_id):
         )
         return redirect("confirm_registration", registration_id=registration.id)
 
-    except Exception as e:
-        if settings.DEBUG:
-            print("❌ Unexpected error:", e)
+    except Exception:
+        logger.exception(
+            "Unexpected error creating payment for registration %s", registration.id
+        )
         messages.error(
             request,
             "An unexpected error occurred. Please try again.",
@@ -152,3 +180,61 @@ def create_payment(request, registration_id):
         return redirect("confirm_registration", registration_id=registration.id)
 
     return HttpResponse("Unexpected outcome", status=500)
+
+
+def _checkout_task(registration):
+    payment = registration.payment
+    return getattr(payment, "checkout_task", None) if payment else None
+
+
+def checkout_pending(request, registration_id):
+    """Show a "preparing checkout" page while the worker creates the order.
+
+    Redirects:
+        - Order ready → Viva Wallet
+        - Order failed or never queued → confirm_registration
+    """
+    registration = get_object_or_404(
+        Registration.objects.select_related("payment__checkout_task"),
+        pk=registration_id,
+    )
+    task = _checkout_task(registration)
+
+    if task is None or task.status == CheckoutTask.FAILED:
+        messages.error(
+            request,
+            "There was a problem connecting to Viva Wallet. "
+            "Please try again or contact support.",
+        )
+        return redirect("confirm_registration", registration_id=registration.id)
+
+    if task.status == CheckoutTask.READY:
+        return redirect(task.redirect_url)
+
+    return render(
+        request,
+        "registration/checkout_pending.html",
+        {"registration": registration},
+    )
+
+
+@require_GET
+def checkout_status(request, registration_id):
+    """AJAX endpoint polled by the "preparing checkout" page.
+
+    Returns:
+        - "ready" + redirect URL once the order exists
+        - "pending" while the order is queued or being created
+        - "failed" (the page then reloads to show the error)
+    """
+    registration = get_object_or_404(
+        Registration.objects.select_related("payment__checkout_task"),
+        pk=registration_id,
+    )
+    task = _checkout_task(registration)
+
+    if task is None or task.status == CheckoutTask.FAILED:
+        return JsonResponse({"status": "failed"})
+    if task.status == CheckoutTask.READY:
+        return JsonResponse({"status": "ready", "redirect_url": task.redirect_url})
+    return JsonResponse({"status": "pending"})
@@ -2,8 +2,11 @@
 
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
-from event.models import Event, Race
+from event.caching import cache_public_fragment, event_page_version, page_cache_timeout
+from event.models import Event
+from event.pricing import build_race_cards
 
 
 def event_list(request):
@@ -13,9 +16,10 @@ def event_list(request):
         registration/event_list.html
 
     Context:
-        events (QuerySet): All upcoming events ordered by date.
+        events (QuerySet): All upcoming events ordered by date, annotated
+            for the event cards (see ``EventManager.for_listing``).
     """
-    events = Event.objects.order_by("date")
+    events = Event.objects.for_listing().order_by("date")
     return render(request, "registration/event_list.html", {"events": events})
 
 
@@ -27,29 +31,32 @@ def race_list(request, event_id):
 
     Context:
         event (Event): Selected event instance.
-        races (QuerySet): All Race objects linked to the event, with packages.
+        cards (list[RaceCard]): One card per race, with precomputed prices.
+            Built lazily: only when the cached price table has expired.
+        page_version (int): Cache version of the event's race pages.
+        page_cache_timeout (int): TTL of the cached fragments.
     """
     event = get_object_or_404(Event, pk=event_id)
 
-    races = (
-        Race.objects.filter(event=event)
-        .select_related("race_type")
-        .prefetch_related("packages", "special_prices")
-    )
-
     return render(
         request,
         "registration/race_list.html",
         {
             "event": event,
-            "races": races,
+            "cards": SimpleLazyObject(lambda: build_race_cards(event)),
+            "page_version": event_page_version(event.pk),
+            "page_cache_timeout": page_cache_timeout(),
         },
     )
 
 
+@cache_public_fragment
 def event_list_partial(request):
-    """HTMX view to return the event cards only (used for dynamic refresh)."""
-    events = Event.objects.order_by("date")
+    """HTMX view to return the event cards only (used for dynamic refresh).
+
+    Renders the whole page of cards from one query.
+    """
+    events = Event.objects.for_listing().order_by("date")
     return render(request, "registration/partials/event_cards.html", {"events": events})
 
 
@@ -72,7 +79,11 @@ def countdown_timer_partial(request, event_id):
     )
 
 
+@cache_public_fragment
 def race_cards_partial(request, event_id):
     event = get_object_or_404(Event, pk=event_id)
-    races = event.races.all()
-    return render(request, "registration/partials/race_cards.html", {"races": races})
+    return render(
+        request,
+        "registration/partials/race_cards.html",
+        {"cards": build_race_cards(event)},
+    )
@@ -3,19 +3,29 @@
 Handles:
 - Redirection flow after checkout
 - Webhook processing (payment success/failure)
-- Transaction polling via AJAX
+- Transaction status checks via AJAX (plain and long-poll)
 """
 
 import json
 import logging
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.db.models.functions import Upper
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET
 
-from event.models import Payment
+from event.models import Payment, WebhookEvent
+from event.payments.status_events import (
+    long_poll_timeout,
+    status_version,
+    wait_for_status_change,
+)
+from event.payments.transitions import FAILED, PAID, apply_transition
+from event.payments.webhooks import ingest
 from payments import PaymentStatus
 
 
@@ -35,12 +45,18 @@ def viva_payment_success(request, transaction_id):
     """Final success handler after a confirmed payment.
 
     - Marks payment and registration as confirmed if not already
+      (confirming held seats and counting the athletes as paid)
     - If payment is not found yet (due to webhook delay), show 'pending' state
     - Redirects to regular success view
     """
     transaction_id = transaction_id.strip()
 
-    payment = Payment.objects.filter(transaction_id__iexact=transaction_id).first()
+    # Matches payment_transaction_upper_idx, unlike transaction_id__iexact
+    payment = (
+        Payment.objects.alias(transaction_upper=Upper("transaction_id"))
+        .filter(transaction_upper=transaction_id.upper())
+        .first()
+    )
 
     if not payment:
         return render(
@@ -51,15 +67,7 @@ def viva_payment_success(request, transaction_id):
         )
 
     registration = getattr(payment, "registration", None)
-
-    if payment.status != PaymentStatus.CONFIRMED:
-        payment.status = PaymentStatus.CONFIRMED
-        payment.save(update_fields=["status"])
-
-        if registration:
-            registration.payment_status = "paid"
-            registration.status = "completed"
-            registration.save(update_fields=["payment_status", "status"])
+    apply_transition(PAID, payment_id=payment.pk)
 
     return redirect("payment_success", registration_id=registration.id)
 
@@ -68,6 +76,7 @@ def viva_payment_failure(request, transaction_id):
     """Handler for failed/cancelled Viva Wallet payments.
 
     - Marks payment + registration as failed if not already
+      (releasing held seats)
     - Redirects to payment_failure view
     """
     payment = get_object_or_404(Payment, transaction_id=transaction_id)
@@ -79,13 +88,7 @@ def viva_payment_failure(request, transaction_id):
             status=500,
         )
 
-    if payment.status != PaymentStatus.ERROR:
-        payment.status = PaymentStatus.ERROR
-        payment.save(update_fields=["status"])
-
-        registration.payment_status = "failed"
-        registration.status = "failed"
-        registration.save(update_fields=["payment_status", "status"])
+    apply_transition(FAILED, payment_id=payment.pk)
 
     return redirect("payment_failure", registration_id=registration.id)
 
@@ -98,6 +101,8 @@ def payment_webhook(request):
     """Viva Wallet webhook listener.
 
     Handles payment success (1796) and failure (1798) notifications.
+    Each notification is logged once in ``WebhookEvent``; retries of an
+    applied notification are acknowledged without reprocessing.
 
     Payload structure:
         {
@@ -111,80 +116,90 @@ def payment_webhook(request):
     Returns:
         JsonResponse
     """
-    logger.debug("Received request body: %s", request.body)
     if request.method == "GET":
         return JsonResponse({"Key": settings.VIVA_WEBHOOK_VERIFICATION_KEY})
     try:
         payload = json.loads(request.body)
-        event_type_id = payload.get("EventTypeId")
-        transaction_data = payload.get("EventData", {})
-        transaction_id = transaction_data.get("TransactionId")
-        order_code = transaction_data.get("OrderCode")
-        if settings.DEBUG:
-            print("📬 Webhook received:", event_type_id, transaction_id)
-
-        payment = Payment.objects.filter(order_code=str(order_code)).first()
-        if not payment:
+        _, outcome = ingest(payload)
+
+        if outcome is None:
+            return JsonResponse({"status": "duplicate"})
+        if outcome == WebhookEvent.UNMATCHED:
             return JsonResponse(
                 {"status": "error", "message": "Payment not found"},
                 status=404,
             )
-
-        registration = getattr(payment, "registration", None)
-
-        # Save transaction ID if not already present
-
-        payment.transaction_id = transaction_id
-        payment.save(update_fields=["transaction_id"])
-
-        if event_type_id == 1796:  # Payment successful
-            payment.status = PaymentStatus.CONFIRMED
-            payment.save(update_fields=["status"])
-
-            if registration:
-                registration.status = "completed"
-                registration.payment_status = "paid"
-                registration.save(update_fields=["status", "payment_status"])
-
-        elif event_type_id == 1798:  # Payment failed
-            payment.status = PaymentStatus.ERROR
-            payment.save(update_fields=["status"])
-
-            if registration:
-                registration.status = "failed"
-                registration.payment_status = "failed"
-                registration.save(update_fields=["status", "payment_status"])
-        logger.debug("Parsed JSON payload: %s", payload)
         return JsonResponse({"status": "success"})
 
     except Exception as e:
-        logger.error("Error parsing JSON: %s", str(e))
+        logger.error("Error processing webhook: %s", str(e))
         return JsonResponse(
             {"status": "error", "message": str(e)},
             status=500,
         )
 
 
+def _transaction_status(transaction_id) -> dict:
+    """Return the status payload of a transaction, in one query."""
+    payment = (
+        Payment.objects.filter(transaction_id=transaction_id)
+        .values("status", "registration__id")
+        .first()
+    )
+    if not payment:
+        return {"status": "not_found"}
+
+    if payment["status"] == PaymentStatus.CONFIRMED:
+        return {
+            "status": "confirmed",
+            "redirect_url": reverse(
+                "payment_success", args=[payment["registration__id"]]
+            ),
+        }
+
+    return {"status": "waiting"}
+
+
 @require_GET
 def check_transaction_status(request, transaction_id):
     """AJAX endpoint to check status of a given Viva Wallet transaction.
 
-    Used when a webhook might not have yet updated the UI.
+    Used when a webhook might not have yet updated the UI, and as the
+    fallback of ``wait_transaction_status``.
 
     Returns:
         - "confirmed" + redirect URL if paid
         - "waiting" if still pending
         - "not_found" if unknown transaction
     """
-    payment = Payment.objects.filter(transaction_id=transaction_id).first()
+    return JsonResponse(_transaction_status(transaction_id))
 
-    if not payment:
-        return JsonResponse({"status": "not_found"})
 
-    if payment.status == PaymentStatus.CONFIRMED:
-        return JsonResponse({
-            "status": "confirmed",
-            "redirect_url": f"/payment/{payment.registration.id}/success/",
-        })
+@require_GET
+async def wait_transaction_status(request, transaction_id):
+    """Long-poll variant of ``check_transaction_status``.
 
-    return JsonResponse({"status": "waiting"})
+    Answers at once if the transaction is confirmed; otherwise parks the
+    request until the webhook settles it or the heartbeat timeout
+    (``PAYMENT_STATUS_LONG_POLL_TIMEOUT``, or a shorter ``?timeout=``)
+    passes, then answers like ``check_transaction_status``. The page simply
+    asks again after a "waiting" answer.
+
+    Serve the project through ASGI: under WSGI every parked request holds a
+    worker thread.
+    """
+    timeout = long_poll_timeout()
+    try:
+        timeout = min(float(request.GET.get("timeout", timeout)), timeout)
+    except ValueError:
+        pass
+
+    # Read the version first, so a change committed meanwhile is not missed
+    seen = await status_version(transaction_id)
+    status = await sync_to_async(_transaction_status)(transaction_id)
+    if status["status"] == "confirmed":
+        return JsonResponse(status)
+
+    if await wait_for_status_change(transaction_id, seen, timeout):
+        status = await sync_to_async(_transaction_status)(transaction_id)
+    return JsonResponse(status)
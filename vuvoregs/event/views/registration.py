@@ -5,8 +5,11 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.http import require_http_methods
 
-from event.forms import BillingForm, athlete_formset_factory
+from event.capacity import CapacityExceeded, reserve_seats
+from event.forms import BillingForm, RaceFormContext, athlete_formset_factory
 from event.models import Race, Registration
+from event.pricing import load_price_tables, price_athletes
+from event.rollups import add_registration
 from django.utils.translation import gettext_lazy as _
 
 
@@ -21,11 +24,8 @@ def registration(request, race_id):
 
     AthleteFormSet = athlete_formset_factory(race)
 
-    formset_kwargs = {
-        "form_kwargs": {"race": race},
-        "prefix": "athlete",
-        "race": race,
-    }
+    # Loaded once and shared by every athlete form
+    formset_kwargs = {"prefix": "athlete", "context": RaceFormContext.load(race)}
 
     if request.method == "POST":
         formset = AthleteFormSet(data=request.POST, **formset_kwargs)
@@ -42,12 +42,22 @@ def registration(request, race_id):
                         athlete.race = race
                         athlete.save()
 
+                    # 🎟 Hold the seats until payment (rolls back if full)
+                    reserve_seats(registration, race, len(athletes))
                     registration.update_total_amount()
+                    add_registration(registration)
 
                     return redirect(
                         "confirm_registration", registration_id=registration.id
                     )
 
+            except CapacityExceeded:
+                messages.error(
+                    request,
+                    _("Sorry, there are not enough places left for this race."),
+                )
+                return redirect(request.path)
+
             except Exception as e:
                 messages.error(
                     request,
@@ -88,12 +98,22 @@ def confirm_registration(request, registration_id):
 
     Context:
         registration (Registration)
-        athletes (QuerySet[Athlete])
+        athletes (list[Athlete], each with its ``total_price``)
         billing_form (BillingForm)
         event (Event)
     """
     registration = get_object_or_404(Registration, pk=registration_id)
-    athletes = registration.athletes.select_related("package", "race")
+    athletes = list(
+        registration.athletes.select_related(
+            "package", "race", "special_price", "pickup_point"
+        )
+    )
+    # Share one race instance (and its price table) across all athletes
+    races = {race.pk: race for race in load_price_tables({a.race for a in athletes})}
+    for athlete in athletes:
+        athlete.race = races[athlete.race_id]
+    for athlete, price in zip(athletes, price_athletes(athletes), strict=True):
+        athlete.total_price = price
     event = registration.event
     any_minor = any(a.is_minor() for a in athletes)
     terms = getattr(event, "terms", None)
@@ -115,10 +135,6 @@ def confirm_registration(request, registration_id):
     form = BillingForm(
         initial={"billing_email": athletes[0].email if athletes else ""},
     )
-    print("🧍 Athlete selected options:")
-    for a in registration.athletes.all():
-        print(a.selected_options)
-        print("pickup:", a.pickup_point)
     return render(
         request,
         "registration/confirm.html",
@@ -70,6 +70,7 @@ INSTALLED_APPS = [
 SITE_ID = 1
 
 MIDDLEWARE = [
+    "event.perf.PerfMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "allauth.account.middleware.AccountMiddleware",
@@ -116,6 +117,20 @@ DATABASES = {
 }
 
 
+# CACHE
+# ------------------------------------------------------------------------------
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Pricing window versions live here, so multi-process deployments must point
+# CACHE_URL at a shared backend (e.g. rediscache://, filecache:///var/tmp/vuvo).
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+}
+# Seconds public event/race fragments may be served from the cache. Model
+# changes invalidate them immediately; the TTL only bounds time-driven
+# changes such as a registration window opening.
+PUBLIC_PAGE_CACHE_TIMEOUT = env.int("PUBLIC_PAGE_CACHE_TIMEOUT", default=60)
+
+
 # PASSWORD VALIDATION
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -229,12 +244,24 @@ PAYMENT_VARIANTS = {
             "client_secret": env("VIVA_CLIENT_SECRET"),
             "source_code": env("VIVA_SOURCE_CODE"),
             "sandbox": True,
+            # Optional endpoint overrides (e.g. a local stub server)
+            "accounts_url": env("VIVA_ACCOUNTS_URL", default=None),
+            "api_url": env("VIVA_API_URL", default=None),
+            "checkout_url": env("VIVA_CHECKOUT_URL", default=None),
         },
     ),
     "dummy": ("payments.dummy.DummyProvider", {}),
 }
 PAYMENT_MODEL = "event.Payment"
+# Seconds a new registration holds its seats before payment must start.
+SEAT_HOLD_TIMEOUT = env.int("SEAT_HOLD_TIMEOUT", default=900)
+# Create Viva orders in the background (requires `manage.py run_checkout_worker`)
+ASYNC_CHECKOUT = env.bool("ASYNC_CHECKOUT", default=False)
 VIVA_WEBHOOK_VERIFICATION_KEY = env("VIVA_VERIFICATION_KEY")
+# Longest time, in seconds, the payment pending page's status request is parked
+PAYMENT_STATUS_LONG_POLL_TIMEOUT = env.int(
+    "PAYMENT_STATUS_LONG_POLL_TIMEOUT", default=25
+)
 
 # LOGGING
 # ------------------------------------------------------------------------------
@@ -258,3 +285,15 @@ LOGGING = {
         },
     },
 }
+
+# REQUEST INSTRUMENTATION
+# ------------------------------------------------------------------------------
+# Share of requests measured by event.perf.PerfMiddleware (0 disables it); the
+# samples are kept in the cache, so point CACHE_URL at a shared backend.
+PERF_SAMPLE_RATE = env.float("PERF_SAMPLE_RATE", default=0.1)
+# Measured requests slower than this (ms), or repeating one query this many
+# times, are logged as warnings on "event.perf".
+PERF_SLOW_REQUEST_MS = env.int("PERF_SLOW_REQUEST_MS", default=1000)
+PERF_REPEATED_QUERY_THRESHOLD = env.int("PERF_REPEATED_QUERY_THRESHOLD", default=5)
+# Recent samples kept per view for the dashboard's percentiles.
+PERF_MAX_SAMPLES = env.int("PERF_MAX_SAMPLES", default=500)